@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+FaultSim NumPy 배치 엔진 (DIMM, 이벤트 구동 모드)
+EventSimulation::runOne 과 같은 결함 모델/ECC 판정을 수많은 시행에 대해 배열 연산으로 한 번에 수행합니다.
+faultsim 과 같은 형식의 printStats 로그(stdout)와 WEEKS 히스토그램(--outfile)을 출력하므로
+parse_error_stats.py / merge_shards.py / weeks_histogram.py 로 그대로 읽을 수 있습니다.
+
+예: python3 batch_engine.py configs/DDR5/DIMM_ChipKill_DDR5_16GB.ini --outfile results/dimm_chipkill_16gb_results.bin \
+        > results/dimm_chipkill_16gb_log.txt
+"""
+
+import sys
+import argparse
+import numpy as np
+
+from parse_error_stats import read_config, DIMM_ECC_NAMES
+from merge_shards import format_stats_line, format_stats_record
+from weeks_histogram import write_histogram, write_columns_csv, histogram_columns
+
+# main.cpp genModuleDIMM 의 FIT 표 (DRAM_1BIT, 1WORD, 1COL, 1ROW, 1BANK, NBANK, NRANK 순서)
+FM_UNIFORM_BIT = 0
+FM_JAGUAR = 1
+FIT_TABLES = {
+    FM_UNIFORM_BIT: {'transient': [33.05, 0, 0, 0, 0, 0, 0],
+                     'permanent': [33.05, 0, 0, 0, 0, 0, 0]},
+    FM_JAGUAR: {'transient': [50.28, 0.0, 17.4715, 1.83706, 19.5283, 0.1816, 0.19514],
+                'permanent': [76.68, 0.0, 5.81738, 14.3127, 7.92444, 0.365924, 0.989311]},
+}
+CLASS_NAMES = ['1BIT', '1WORD', '1COL', '1ROW', '1BANK', 'NBANK', 'NRANK']
+
+# 결함 클래스별 genRandomRange 인자 (rank, bank, row, col, bit): 1 이면 임의 값으로 고정, 0 이면 와일드카드
+CLASS_FIELDS = np.array([(1, 1, 1, 1, 1), (1, 1, 1, 1, 0), (1, 1, 0, 1, 0), (1, 1, 1, 0, 0),
+                         (1, 1, 0, 0, 0), (1, 0, 0, 0, 0), (0, 0, 0, 0, 0)], dtype=bool)
+
+# DRAMDomain::init 의 FIT 스케일링 기준 칩 (DDR5 32Gb: rank, bank, row, col, bit)
+BASELINE_GEOMETRY = (1, 32, 131072, 2048, 4)
+
+# ChipKillRepair: 8비트 심볼 단위로 비교하도록 주소 하위 3비트를 와일드카드로 확장
+SYMBOL_MASK = (1 << 3) - 1
+# BCHRepair: 정정 비트 수 -> 함께 묶는 주소 하위 비트 수 (SECDED 8B, 3EC4ED 32B, 6EC7ED 64B)
+BCH_GROUP_SHIFT = {1: 2, 3: 4, 6: 5}
+# repairmode -> (방식, 정정 개수, 검출 개수) (main.cpp genModuleDIMM)
+REPAIR_SCHEMES = {0: (None, 0, 0), 1: ('chipkill', 1, 2), 2: ('chipkill', 2, 4),
+                  3: ('bch', 1, 2), 4: ('bch', 3, 4), 5: ('bch', 6, 7)}
+
+def load_settings(config_path):
+    """
+    설정 파일에서 배치 엔진에 필요한 값 읽기 (ConfigParser.cpp 와 같은 키/기본값)
+    """
+    config = read_config(config_path)
+    sim, org, fault = config['Sim'], config['Org'], config['Fault']
+    return {
+        'sim_mode': sim.getint('sim_mode'),
+        'scrub_s': sim.getint('scrub_s'),
+        'max_s': sim.getint('max_s'),
+        'n_sims': sim.getint('n_sims'),
+        'continue_running': sim.getboolean('continue_running'),
+        'output_bucket_s': sim.getint('output_bucket_s'),
+        'output_format': sim.getint('output_format', fallback=0),
+        'is_boost': sim.getfloat('is_boost', fallback=1.0),
+        'seed': sim.getint('seed', fallback=0),
+        'shard': sim.getint('shard', fallback=0),
+        'organization': org.getint('organization'),
+        'chips_per_rank': org.getint('chips_per_rank'),
+        'geometry': (org.getint('ranks'), org.getint('banks'), org.getint('rows'),
+                     org.getint('cols'), org.getint('chip_bus_bits')),
+        'faultmode': fault.getint('faultmode'),
+        'enable_transient': fault.getint('enable_transient'),
+        'enable_permanent': fault.getint('enable_permanent'),
+        'fit_factor': fault.getfloat('fit_factor'),
+        'repairmode': config.getint('ECC', 'repairmode'),
+        'compare_repairmodes': config.get('ECC', 'compare_repairmodes', fallback=''),
+    }
+
+def check_settings(settings):
+    """
+    배치 엔진이 재현하는 범위(DIMM, 이벤트 구동, 가중치 없는 샘플링)인지 확인
+    """
+    if settings['organization'] != 0:
+        raise ValueError("the batch engine only simulates DIMM organizations (organization = 0)")
+    if settings['repairmode'] not in REPAIR_SCHEMES:
+        raise ValueError(f"unsupported DIMM repairmode {settings['repairmode']}")
+    scheme, n_correct, _ = REPAIR_SCHEMES[settings['repairmode']]
+    if scheme == 'chipkill' and settings['chips_per_rank'] != 18 * n_correct:
+        raise ValueError(f"ChipKill with {n_correct} symbol correction needs {18 * n_correct} chips per rank")
+    if settings['is_boost'] != 1.0:
+        raise ValueError("importance sampling (is_boost) is only available in the faultsim binary")
+    if settings['compare_repairmodes']:
+        raise ValueError("compare_repairmodes is only available in the faultsim binary")
+    if settings['faultmode'] not in FIT_TABLES:
+        raise ValueError(f"unsupported faultmode {settings['faultmode']}")
+
+def scaling_factors(settings):
+    """
+    DRAMDomain::init 과 같은 클래스별 FIT 스케일링 (고정되는 주소 필드의 크기 비율 곱)
+    """
+    ratio = np.array(settings['geometry'], dtype=float) / np.array(BASELINE_GEOMETRY, dtype=float)
+    return np.array([np.prod(ratio[fields]) for fields in CLASS_FIELDS])
+
+def hours_per_fault(settings):
+    """
+    DRAMDomain::hrs_per_fault 와 같은 14개 값 (0..6 일시적, 7..13 영구, FIT 0 이면 inf)
+    """
+    table = FIT_TABLES[settings['faultmode']]
+    transient = np.array(table['transient'], dtype=float) * (1 if settings['enable_transient'] else 0)
+    permanent = np.array(table['permanent'], dtype=float) * (1 if settings['enable_permanent'] else 0)
+    scale = scaling_factors(settings)
+    with np.errstate(divide='ignore'):
+        return 1000000000.0 / (np.concatenate([transient, permanent]) * settings['fit_factor'] * np.tile(scale, 2))
+
+def address_layout(settings):
+    """
+    genRandomRange 의 주소 비트 배치: 하위 비트부터 bit, col, row, bank, rank
+    반환값: (필드 크기, 필드 시작 비트) — rank, bank, row, col, bit 순서
+    """
+    sizes = np.array(settings['geometry'], dtype=np.uint64)
+    widths = [int(size).bit_length() - 1 for size in settings['geometry']]
+    shifts = np.array([sum(widths[idx + 1:]) for idx in range(len(widths))], dtype=np.uint64)
+    return sizes, shifts
+
+def draw_faults(rng, n_trials, settings, rates):
+    """
+    n_trials 번 시행의 결함을 한 번에 생성
+    칩/결함 종류별 지수 도착 과정(평균 간격 hrs_per_fault)을 합친 포아송 과정으로 뽑는다:
+    시행별 결함 수 ~ Poisson(칩 수 * 총 발생률), 각 결함의 칩/종류는 발생률 비례, 시각은 [0, max_s] 균등
+    반환값: 결함별 배열 딕셔너리와 시행별 결함 수
+    """
+    chips = settings['chips_per_rank']
+    total_rate = rates.sum()
+    counts = rng.poisson(chips * total_rate, n_trials)
+    n_faults = int(counts.sum())
+
+    errtype = rng.choice(len(rates), size=n_faults, p=rates / total_rate) if n_faults else np.zeros(0, dtype=np.int64)
+    fixed = CLASS_FIELDS[errtype % len(CLASS_NAMES)]
+    sizes, shifts = address_layout(settings)
+
+    addr = np.zeros(n_faults, dtype=np.uint64)
+    mask = np.zeros(n_faults, dtype=np.uint64)
+    for field in range(len(sizes)):
+        value = rng.integers(0, sizes[field], n_faults, dtype=np.uint64)
+        addr |= np.where(fixed[:, field], value, np.uint64(0)) << shifts[field]
+        mask |= np.where(fixed[:, field], np.uint64(0), sizes[field] - np.uint64(1)) << shifts[field]
+
+    faults = {
+        'trial': np.repeat(np.arange(n_trials), counts),
+        'chip': rng.integers(0, chips, n_faults),
+        'time': rng.uniform(0, settings['max_s'], n_faults),
+        'transient': errtype < len(CLASS_NAMES),
+        'addr': addr,
+        'mask': mask,
+    }
+    return faults, counts
+
+def pad_by_trial(faults, counts):
+    """
+    결함이 있는 시행만 골라 (시행, 처리 순서) 2차원 배열로 정렬
+    EventSimulation 의 CompareFR 우선순위 큐는 timestamp 가 큰 결함부터 꺼내므로 같은 순서(시각 내림차순)로 둔다
+    """
+    order = np.lexsort((-faults['time'], faults['trial']))
+    per_trial = counts[counts > 0]
+    n_rows, n_cols = len(per_trial), int(per_trial.max()) if len(per_trial) else 0
+    row = np.repeat(np.arange(n_rows), per_trial)
+    col = np.arange(len(order)) - np.repeat(np.cumsum(per_trial) - per_trial, per_trial)
+
+    padded = {}
+    for key, fill in (('chip', 0), ('time', 0.0), ('transient', False), ('addr', 0), ('mask', 0)):
+        values = faults[key][order]
+        padded[key] = np.full((n_rows, n_cols), fill, dtype=values.dtype)
+        padded[key][row, col] = values
+    padded['n_faults'] = per_trial
+    return padded
+
+def chip_hits(query_addr, query_mask, addr, mask, chipbits, present):
+    """
+    각 질의 범위와 겹치는 결함이 있는 칩을 비트마스크로 반환 (FaultRange::intersects 를 모든 쌍에 적용)
+    """
+    conflict = (query_addr[:, :, None] ^ addr[:, None, :]) & ~(query_mask[:, :, None] | mask[:, None, :])
+    hit = (conflict == 0) & present[:, None, :]
+    return np.bitwise_or.reduce(np.where(hit, chipbits[:, None, :], np.uint64(0)), axis=2)
+
+def count_intersections(scheme, n_correct, addr, mask, chipbits, present):
+    """
+    ChipKillRepair / BCHRepair 의 n_intersections 를 모든 결함에 대해 계산
+    ChipKill: 8비트 심볼로 넓힌 범위와 겹치는 칩 수
+    BCH: 코드워드 안의 위치(하위 비트)마다 겹치는 칩 수를 센 합
+    """
+    if scheme == 'chipkill':
+        return np.bitwise_count(chip_hits(addr, mask | np.uint64(SYMBOL_MASK), addr, mask, chipbits, present)).astype(np.int64)
+
+    shift = np.uint64(BCH_GROUP_SHIFT[n_correct])
+    base_addr = (addr >> shift) << shift
+    base_mask = (mask >> shift) << shift
+    n_intersections = np.zeros(addr.shape, dtype=np.int64)
+    for location in range(1 << int(shift)):
+        n_intersections += np.bitwise_count(chip_hits(base_addr | np.uint64(location), base_mask,
+                                                      addr, mask, chipbits, present))
+    return n_intersections
+
+def scrub_survivors(removable):
+    """
+    DRAMDomain::scrub 의 목록 순회를 그대로 재현 (erase 뒤 it++ 로 다음 원소를 건너뛰고,
+    끝에서 erase 하면 std::list 의 ++end() 가 처음으로 돌아가 다시 훑는다)
+    반환값: 남는 원소의 위치 리스트
+    """
+    remaining = [(idx, flag) for idx, flag in enumerate(removable)]
+    pos = 0
+    while pos != len(remaining):
+        if remaining[pos][1]:
+            del remaining[pos]
+            if pos == len(remaining):
+                pos = 0
+                continue
+        pos += 1
+    return [idx for idx, _ in remaining]
+
+def scrub(padded, rows, k, alive, removable):
+    """
+    일시적 결함 제거: 칩 하나에 제거 대상이 하나뿐이면 그대로 지우고, 둘 이상이면 목록 순회를 재현
+    """
+    chip = padded['chip'][rows, :k + 1]
+    same_chip = removable[:, :, None] & removable[:, None, :] & (chip[:, :, None] == chip[:, None, :])
+    simple = removable & (same_chip.sum(axis=2) <= 1)
+    alive[rows, :k + 1] &= ~simple
+
+    for sub in np.flatnonzero((removable & ~simple).any(axis=1)):
+        row = rows[sub]
+        for c in np.unique(chip[sub][removable[sub] & ~simple[sub]]):
+            members = np.flatnonzero((chip[sub] == c) & alive[row, :k + 1])
+            keep = set(scrub_survivors(removable[sub, members]))
+            for pos, idx in enumerate(members):
+                alive[row, idx] = pos in keep
+
+def simulate_batch(rng, n_trials, settings, rates, n_bins):
+    """
+    시행 n_trials 번을 한 번에 시뮬레이션
+    반환값: MODULE0 / 칩별 카운터와 (3, n_bins) 히스토그램 (FAULT, UNCORRECTABLE, UNDETECTABLE)
+    """
+    scheme, n_correct, n_detect = REPAIR_SCHEMES[settings['repairmode']]
+    chips = settings['chips_per_rank']
+    faults, counts = draw_faults(rng, n_trials, settings, rates)
+    hist = np.zeros((3, n_bins), dtype=np.uint64)
+
+    # 결함이 하나라도 생성된 시행/칩은 raw 고장 (칩 도메인은 ECC 가 없으므로 uncorr/undet 도 같다)
+    chip_failed = np.bincount(np.unique(faults['trial'] * chips + faults['chip']) % chips, minlength=chips)
+
+    padded = pad_by_trial(faults, counts)
+    n_rows, n_cols = padded['addr'].shape
+    chipbits = np.uint64(1) << padded['chip'].astype(np.uint64)
+    alive = np.ones((n_rows, n_cols), dtype=bool)
+    removable_flag = np.ones((n_rows, n_cols), dtype=bool)
+    uncorr_sim = np.zeros(n_rows, dtype=bool)
+    undet_sim = np.zeros(n_rows, dtype=bool)
+    done = np.zeros(n_rows, dtype=bool)
+    scrub_id = np.floor(padded['time'] / settings['scrub_s'])
+
+    # k 번째로 꺼낸 결함을 넣고 ECC 판정 → 실패 기록 → scrub 구간이 바뀌었으면 scrub (EventSimulation::runOne 의 루프)
+    for k in range(n_cols):
+        rows = np.flatnonzero((padded['n_faults'] > k) & ~done)
+        if len(rows) == 0:
+            break
+        present = alive[rows, :k + 1]
+
+        if scheme is None:
+            # 수리 방식이 없으면 생성된 결함 수가 그대로 uncorr/undet
+            uncorr = np.ones(len(rows), dtype=bool)
+            undet = uncorr
+        else:
+            addr, mask = padded['addr'][rows, :k + 1], padded['mask'][rows, :k + 1]
+            n_int = count_intersections(scheme, n_correct, addr, mask, chipbits[rows, :k + 1], present)
+            failing = present & (n_int > n_correct)
+            uncorr = failing.any(axis=1)
+            if scheme == 'chipkill':
+                undet = (present & (n_int > n_detect)).any(axis=1)
+                keep = ((n_int <= n_correct) & (mask > np.uint64(n_correct))) | (n_int >= n_correct)
+                removable_flag[rows, :k + 1] &= ~(present & keep)
+            else:
+                # BCHRepair 는 정정 범위를 넘는 첫 결함(칩 순서, 목록 순서)에서 바로 반환하므로 검출 불가 판정에 닿지 않는다
+                undet = np.zeros(len(rows), dtype=bool)
+                order_key = np.where(failing, padded['chip'][rows, :k + 1] * n_cols + np.arange(k + 1), np.iinfo(np.int64).max)
+                first = np.argmin(order_key, axis=1)
+                removable_flag[rows[uncorr], first[uncorr]] = False
+
+        failed = uncorr | undet
+        bins = (padded['time'][rows, k] // settings['output_bucket_s']).astype(np.int64)
+        in_range = bins < n_bins
+        for column, flags in enumerate((failed, uncorr, undet)):
+            hist[column] += np.bincount(bins[flags & in_range], minlength=n_bins).astype(np.uint64)
+        uncorr_sim[rows] |= uncorr
+        undet_sim[rows] |= undet
+        if not settings['continue_running']:
+            done[rows[failed]] = True
+            rows = rows[~failed]
+
+        previous = scrub_id[rows, k - 1] if k > 0 else 0
+        scrub_rows = rows[scrub_id[rows, k] != previous]
+        if scheme is None:
+            # 수리 방식이 없으면 fill_repl 이 실패를 반환하여 시행이 끝난다
+            done[scrub_rows] = True
+        elif len(scrub_rows):
+            removable = (alive[scrub_rows, :k + 1] & padded['transient'][scrub_rows, :k + 1]
+                         & removable_flag[scrub_rows, :k + 1])
+            scrub(padded, scrub_rows, k, alive, removable)
+
+    return {
+        'sims': n_trials,
+        'failed_sims': int(np.count_nonzero(counts)),
+        'uncorr_sims': int(np.count_nonzero(uncorr_sim)),
+        'undet_sims': int(np.count_nonzero(undet_sim)),
+        'chip_failed': chip_failed,
+        'hist': hist,
+    }
+
+def simulate(settings, n_sims, rng, batch_size):
+    """
+    n_sims 번 시행을 batch_size 씩 나누어 실행하고 카운터/히스토그램을 합산
+    """
+    rates = settings['max_s'] / (hours_per_fault(settings) * (60 * 60))
+    n_bins = settings['max_s'] // settings['output_bucket_s']
+    total = {'sims': 0, 'failed_sims': 0, 'uncorr_sims': 0, 'undet_sims': 0,
+             'chip_failed': np.zeros(settings['chips_per_rank'], dtype=np.int64),
+             'hist': np.zeros((3, n_bins), dtype=np.uint64)}
+
+    for start in range(0, n_sims, batch_size):
+        batch = simulate_batch(rng, min(batch_size, n_sims - start), settings, rates, n_bins)
+        for key in total:
+            total[key] += batch[key]
+    return total
+
+def format_stats_block(settings, total):
+    """
+    Simulation::printStats 와 같은 형식의 통계 블록 (칩 도메인, MODULE0 순서)
+    """
+    max_s = settings['max_s']
+    zeros = "".join("0 " for _ in CLASS_NAMES)
+    lines = ["\n"]
+    for chip, failed in enumerate(total['chip_failed']):
+        failed = int(failed)
+        lines.append(format_stats_line(f"MODULE0.DRAM{chip}", total['sims'], failed, failed, failed, max_s))
+        lines.append(f" Transient: {zeros}TSV 0 Permanent: {zeros}TSV 0\n")
+    lines.append(format_stats_line("MODULE0", total['sims'], total['failed_sims'],
+                                   total['uncorr_sims'], total['undet_sims'], max_s))
+    lines.append("\n")
+    return "".join(lines)
+
+def write_stats_file(stats_path, settings, total):
+    """
+    format_stats_block 과 같은 통계를 faultsim --statsfile 과 같은 NDJSON 으로 저장
+    """
+    zeros = [0] * len(CLASS_NAMES)
+    with open(stats_path, 'w', encoding='utf-8') as f:
+        for chip, failed in enumerate(total['chip_failed']):
+            failed = int(failed)
+            chip_total = {'sims': total['sims'], 'failed_sims': failed, 'uncorr_sims': failed, 'undet_sims': failed,
+                          'transient': zeros, 'transient_tsv': 0, 'permanent': zeros, 'permanent_tsv': 0}
+            f.write(format_stats_record(f"MODULE0.DRAM{chip}", chip_total, settings['max_s']))
+        f.write(format_stats_record("MODULE0", total, settings['max_s']))
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate DIMM trials in vectorized NumPy batches (event-driven model)")
+    parser.add_argument('configfile', help="FaultSim .ini config (organization = 0)")
+    parser.add_argument('--outfile', required=True, help="failure-time histogram output file")
+    parser.add_argument('--outformat', choices=['csv', 'bin'], default=None,
+                        help="histogram format (default: config [Sim] output_format)")
+    parser.add_argument('--statsfile', default=None,
+                        help="also write the statistics with exact counts as NDJSON (one record per domain)")
+    parser.add_argument('--n-sims', type=int, default=None, help="number of trials (default: config [Sim] n_sims)")
+    parser.add_argument('--seed', type=int, default=None, help="random seed (default: config [Sim] seed, 0 = random)")
+    parser.add_argument('--batch-size', type=int, default=200000, help="trials simulated per NumPy batch")
+    args = parser.parse_args()
+
+    settings = load_settings(args.configfile)
+    try:
+        check_settings(settings)
+    except ValueError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    if args.seed is not None:
+        settings['seed'] = args.seed
+    n_sims = args.n_sims if args.n_sims is not None else settings['n_sims']
+
+    rng = np.random.default_rng([settings['seed'], settings['shard']] if settings['seed'] else None)
+
+    print("# --------------------------------------------------------------------------------")
+    print("# FAULTSIM batch engine (NumPy, event-driven DIMM model)")
+    print("# --------------------------------------------------------------------------------\n")
+    print(f"The selected config file is: {args.configfile}")
+    print(f"The random seed is: {settings['seed']} shard: {settings['shard']}")
+    print(f"ECC: {DIMM_ECC_NAMES[settings['repairmode']]}")
+    if settings['sim_mode'] != 2:
+        print("Note: the batch engine reproduces the event-driven simulation (sim_mode 2)")
+    for name, scale in zip(CLASS_NAMES, scaling_factors(settings)):
+        print(f"DRAM Class {name} Scaling Factor: {scale:g}")
+
+    total = simulate(settings, n_sims, rng, max(1, args.batch_size))
+    sys.stdout.write(format_stats_block(settings, total))
+    if args.statsfile:
+        write_stats_file(args.statsfile, settings, total)
+
+    header = {'n_bins': total['hist'].shape[1], 'n_sims': total['sims'],
+              'bucket_s': settings['output_bucket_s'], 'max_s': settings['max_s']}
+    binary = args.outformat == 'bin' if args.outformat else settings['output_format'] == 1
+    if binary:
+        write_histogram(args.outfile, total['hist'], header['n_sims'], header['bucket_s'], header['max_s'])
+    else:
+        write_columns_csv(args.outfile, header, histogram_columns(header, total['hist']))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+FaultSim 프로세스 내 실행 모듈
+libfaultsim.so (make lib) 를 ctypes 로 불러 faultsim 을 띄우지 않고 시뮬레이션을 실행하고,
+도메인 통계/결함 클래스 카운터는 parse_stats_block 과 같은 딕셔너리로,
+WEEKS 히스토그램은 weeks_histogram.read_histogram 과 같은 (헤더, numpy 배열) 로 돌려줍니다.
+로그 파일과 히스토그램 파일을 쓰지 않으므로 한 인터프리터에서 많은 설정을 연달아 돌릴 수 있습니다.
+
+예: python3 faultsim_lib.py configs/dimm_secded_8gb.ini --set Sim.n_sims=100000 --set Sim.seed=4
+"""
+
+import os
+import sys
+import ctypes
+import argparse
+import numpy as np
+
+from parse_error_stats import summarize_module, module_ecc_types, classify_config, format_csv_row, CSV_HEADER
+
+LIBRARY_NAME = "libfaultsim.so"
+# FaultDomain::printStats 의 FIT 환산 (1시간 = 3.6e12 ns)
+HOUR_NS = 60.0 * 60 * 1000000000
+# faultsim_domain_class_counts 가 채우는 클래스 수 (DRAM_MAX 개 + TSV)
+MAX_CLASS_COUNTS = 64
+
+_library = None
+
+def load_library(lib_path=None):
+    """
+    libfaultsim.so 를 한 번만 불러 함수 시그니처를 설정 (기본 위치: 이 파일과 같은 디렉토리)
+    """
+    global _library
+    if _library is not None and lib_path is None:
+        return _library
+
+    if lib_path is None:
+        lib_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), LIBRARY_NAME)
+    lib = ctypes.CDLL(lib_path)
+
+    handle = ctypes.c_void_p
+    u64 = ctypes.c_uint64
+    u64_array = np.ctypeslib.ndpointer(dtype=np.uint64, flags='C_CONTIGUOUS')
+    signatures = {
+        'faultsim_create': (handle, [ctypes.c_char_p, ctypes.c_char_p]),
+        'faultsim_error': (ctypes.c_char_p, []),
+        'faultsim_simulate': (u64, [handle]),
+        'faultsim_destroy': (None, [handle]),
+        'faultsim_run_info': (None, [handle, u64_array]),
+        'faultsim_domain_count': (u64, [handle]),
+        'faultsim_domain_name': (ctypes.c_char_p, [handle, u64]),
+        'faultsim_domain_stats': (None, [handle, u64, u64_array]),
+        'faultsim_domain_class_counts': (ctypes.c_int, [handle, u64, u64_array, u64_array]),
+        'faultsim_module_count': (u64, [handle]),
+        'faultsim_module_name': (ctypes.c_char_p, [handle, u64]),
+        'faultsim_bin_count': (u64, [handle]),
+        'faultsim_histogram': (None, [handle, u64, u64_array, u64_array, u64_array]),
+    }
+    for name, (restype, argtypes) in signatures.items():
+        func = getattr(lib, name)
+        func.restype = restype
+        func.argtypes = argtypes
+
+    _library = lib
+    return lib
+
+def format_overrides(overrides):
+    """
+    {'Sim.n_sims': 1000, ...} 를 faultsim_create 가 받는 "Section.key=value" 줄들로 변환
+    """
+    if not overrides:
+        return None
+    return "\n".join(f"{key}={value}" for key, value in overrides.items()).encode()
+
+def domain_stats(lib, run, idx, max_s):
+    """
+    도메인 하나의 통계를 parse_stats_block 과 같은 형식(printStats 와 같은 비율/FIT 계산)으로 읽기
+    """
+    counts = np.zeros(4, dtype=np.uint64)
+    lib.faultsim_domain_stats(run, idx, counts)
+    sims, failed_sims, uncorr_sims, undet_sims = (int(x) for x in counts)
+
+    stats = {'name': lib.faultsim_domain_name(run, idx).decode(),
+             'sims': sims, 'failed_sims': failed_sims}
+    for key, count in (('raw', failed_sims), ('uncorr', uncorr_sims), ('undet', undet_sims)):
+        rate = count / sims if sims else float('nan')
+        stats['rate_' + key] = rate
+        stats['FIT_' + key] = rate * HOUR_NS / max_s
+    stats['uncorr_sims'] = uncorr_sims
+    stats['undet_sims'] = undet_sims
+
+    transient = np.zeros(MAX_CLASS_COUNTS, dtype=np.uint64)
+    permanent = np.zeros(MAX_CLASS_COUNTS, dtype=np.uint64)
+    n_classes = lib.faultsim_domain_class_counts(run, idx, transient, permanent)
+    if n_classes:
+        stats['transient'] = [int(x) for x in transient[:n_classes - 1]]
+        stats['transient_tsv'] = int(transient[n_classes - 1])
+        stats['permanent'] = [int(x) for x in permanent[:n_classes - 1]]
+        stats['permanent_tsv'] = int(permanent[n_classes - 1])
+    return stats
+
+def run(config_path, overrides=None, lib_path=None, verbose=False):
+    """
+    설정 파일 하나를 프로세스 안에서 실행
+    overrides: {'Section.key': value} 로 설정 파일 값을 덮어쓰기 (예: {'Sim.n_sims': 10000, 'Sim.seed': 4})
+    verbose: False 이면 설정의 [Sim] verbose 를 0 으로 덮어써 칩별 FIT 환산 등 출력 없이 실행
+             (overrides 에 Sim.verbose 가 있으면 그 값을 따른다)
+    반환값: {'sims', 'max_s', 'bucket_s',
+             'block': 도메인별 통계 리스트 (parse_stats_block 형식, summarize_module 에 그대로 사용),
+             'histograms': 모듈 이름 -> (헤더 딕셔너리, (3, n_bins) uint64 배열)}
+    """
+    lib = load_library(lib_path)
+    if not verbose:
+        overrides = {'Sim.verbose': 0, **(overrides or {})}
+    handle = lib.faultsim_create(os.fsencode(config_path), format_overrides(overrides))
+    if not handle:
+        raise ValueError(f"{config_path}: {lib.faultsim_error().decode()}")
+
+    try:
+        lib.faultsim_simulate(handle)
+
+        info = np.zeros(3, dtype=np.uint64)
+        lib.faultsim_run_info(handle, info)
+        sims, max_s, bucket_s = (int(x) for x in info)
+
+        block = [domain_stats(lib, handle, idx, max_s) for idx in range(lib.faultsim_domain_count(handle))]
+
+        # 각 모듈의 히스토그램은 --outformat bin 파일과 같은 헤더/배열 형식
+        n_bins = lib.faultsim_bin_count(handle)
+        histograms = {}
+        for module in range(lib.faultsim_module_count(handle)):
+            counts = np.zeros((3, n_bins), dtype=np.uint64)
+            lib.faultsim_histogram(handle, module, counts[0], counts[1], counts[2])
+            header = {'version': 1, 'n_bins': n_bins, 'n_sims': sims,
+                      'bucket_s': bucket_s, 'max_s': max_s, 'n_columns': 3}
+            histograms[lib.faultsim_module_name(handle, module).decode()] = (header, counts)
+    finally:
+        lib.faultsim_destroy(handle)
+
+    return {'sims': sims, 'max_s': max_s, 'bucket_s': bucket_s, 'block': block, 'histograms': histograms}
+
+def summarize_run(config_path, result):
+    """
+    run 결과를 run_sweep.collect_results 와 같은 CSV 행 분량의 결과 목록으로 변환
+    (분류는 설정 파일 기준, compare_repairmodes 설정은 ECC 종류마다 한 행)
+    """
+    info = classify_config(config_path) or {'config': config_path, 'ecc_type': os.path.basename(config_path), 'capacity': '-'}
+    rows = []
+    for name, ecc_type in module_ecc_types(result['block']):
+        row = dict(info)
+        if ecc_type is not None:
+            row['ecc_type'] = ecc_type
+        row.update(summarize_module(result['block'], name))
+        rows.append(row)
+    return rows
+
+def parse_override(text):
+    """
+    --set 인자 "Section.key=value" 분리
+    """
+    key, sep, value = text.partition('=')
+    if not sep or '.' not in key:
+        raise argparse.ArgumentTypeError(f"expected Section.key=value, got {text!r}")
+    return key.strip(), value.strip()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run FaultSim configs in-process through libfaultsim.so")
+    parser.add_argument('configs', nargs='+', help="FaultSim .ini config files")
+    parser.add_argument('--set', dest='overrides', action='append', type=parse_override, default=[],
+                        metavar='SECTION.KEY=VALUE', help="override a config value, e.g. Sim.n_sims=10000 (repeatable)")
+    parser.add_argument('--lib', default=None, help="path to libfaultsim.so (default: next to this script)")
+    parser.add_argument('--verbose', action='store_true',
+                        help="keep the config's [Sim] verbose output (per-chip FIT scaling, progress characters)")
+    args = parser.parse_args()
+
+    overrides = dict(args.overrides)
+    sys.stdout.write(CSV_HEADER)
+    for config_path in args.configs:
+        for row in summarize_run(config_path, run(config_path, overrides, args.lib, args.verbose)):
+            sys.stdout.write(format_csv_row(row))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+FaultSim 플릿 규모 신뢰성 외삽
+모듈 하나(MODULE0)를 시뮬레이션한 WEEKS 히스토그램을 모듈 간 독립 가정으로 합성해
+N 모듈 노드의 기간별 UE/DUE/SDC 와, M 노드 플릿의 연간 예상 UE/DUE(인터럽트)/SDC 수를 신뢰구간과 함께 계산합니다.
+continue_running = 0 이면 히스토그램은 모듈의 첫 고장 시각 분포(노드 확률, 고장 모듈 교체를 가정한 갱신 방정식),
+continue_running = 1 이면 모듈이 계속 쓰이는 동안의 고장 사건 수(노드/플릿 기대 사건 수)로 해석합니다.
+CE 는 히스토그램에 없으므로 같은 실행의 로그(<name>_log.txt)의 통계에서 읽습니다.
+N 모듈을 직접 시뮬레이션하지 않으므로 N 에 상관없이 모듈 하나의 실행 결과만 있으면 됩니다.
+
+예: python3 fleet_reliability.py results/dimm_chipkill_16gb_results.txt --modules 16 --nodes 1000
+"""
+
+import os
+import re
+import sys
+import argparse
+from statistics import NormalDist
+import numpy as np
+
+from parse_error_stats import read_stats_block, read_config_line, resolve_config_path, read_config
+from weeks_histogram import is_binary_histogram, read_histogram
+
+# run_sweep / compare_repairmodes 의 히스토그램 이름: <name>_results.txt(.bin), <name>_results_MODULE0-<tag>.txt
+HIST_PATH_PATTERN = re.compile(r'_results(?:_(?P<module>MODULE[^/\\]*?))?\.(?:txt|bin)$')
+DAY_S = 24 * 3600
+YEAR_S = 365 * DAY_S
+# CRIT: 복구 실패 전체 (FAULT), UE: UNCORRECTABLE, SDC: UNDETECTABLE, DUE: 검출된 UE (UNCORRECTABLE - UNDETECTABLE)
+FAILURE_TYPES = ['CRIT', 'UE', 'DUE', 'SDC']
+YEARLY_TYPES = ['UE', 'DUE', 'SDC']
+
+def log_path_for_histogram(hist_path):
+    """
+    히스토그램에 대응하는 로그 경로와 모듈 이름 (x_results.txt -> x_log.txt, MODULE0;
+    x_results_MODULE0-SECDED.txt -> x_log.txt, MODULE0-SECDED). 규칙에 맞지 않으면 (None, 'MODULE0')
+    """
+    match = HIST_PATH_PATTERN.search(hist_path)
+    if not match:
+        return None, 'MODULE0'
+    return hist_path[:match.start()] + '_log.txt', match.group('module') or 'MODULE0'
+
+def read_text_histogram(hist_path):
+    """
+    텍스트 히스토그램(Simulation::writeHistogramCSV) 읽기
+    WEEKS 열은 구간 길이와 상관없이 구간 번호 * 12 이므로 읽지 않는다 (구간 길이는 설정에서)
+    반환값: (3, n_bins) uint64 배열 — FAULT/UNCORRECTABLE/UNDETECTABLE 구간별 개수
+    """
+    counts = []
+    with open(hist_path, 'r', encoding='utf-8') as f:
+        f.readline()
+        for line in f:
+            cols = line.strip().split(',')
+            if len(cols) < 13:
+                continue
+            counts.append((int(cols[1]), int(cols[5]), int(cols[9])))
+    return np.array(counts, dtype=np.uint64).reshape(-1, 3).T
+
+def read_run_config(log_path):
+    """
+    로그 머리말의 설정 파일에서 히스토그램 해석에 필요한 [Sim] 값 (설정을 찾지 못하면 None)
+    """
+    config_line = read_config_line(log_path)
+    config_path = resolve_config_path(config_line, log_path) if config_line else None
+    if config_path is None:
+        return None
+    sim = read_config(config_path)['Sim']
+    return {'max_s': int(float(sim['max_s'])), 'bucket_s': int(float(sim['output_bucket_s'])),
+            'continue_running': sim.get('continue_running', '0').strip() not in ('0', 'false', 'False')}
+
+def load_run(hist_path, log_path=None, module=None, n_sims=None, bucket_s=None, continue_running=False):
+    """
+    모듈 하나의 실행 결과 읽기: 히스토그램 구간별 개수, 구간 길이, 시행 수, continue_running 여부와 (로그가 있으면) 모듈 통계
+    bucket_s, continue_running 인자는 로그의 설정을 찾지 못했을 때만 쓰인다
+    is_boost 실행의 히스토그램은 가중치가 없으므로 ValueError
+    """
+    default_log, default_module = log_path_for_histogram(hist_path)
+    log_path = log_path or default_log
+    module = module or default_module
+    if log_path and not os.path.exists(log_path):
+        log_path = None
+
+    stats = None
+    config = None
+    if log_path:
+        stats = next((entry for entry in read_stats_block(log_path) if entry['name'] == module), None)
+        config = read_run_config(log_path)
+
+    if stats and 'importance' in stats:
+        raise ValueError(f"{hist_path}: histograms of is_boost runs are not weighted by the likelihood ratio")
+    if config:
+        continue_running = config['continue_running']
+
+    if is_binary_histogram(hist_path):
+        header, counts = read_histogram(hist_path)
+        n_sims = n_sims or header['n_sims']
+        bucket_s, max_s = header['bucket_s'], header['max_s']
+    else:
+        counts = read_text_histogram(hist_path)
+        if config:
+            bucket_s, max_s = config['bucket_s'], config['max_s']
+        elif bucket_s:
+            max_s = bucket_s * counts.shape[1]
+        else:
+            raise ValueError(f"{hist_path}: bucket length unknown (the WEEKS column is always bucket * 12; "
+                             "no log found, pass --bucket-s)")
+        if not n_sims and stats:
+            n_sims = stats['sims']
+
+    if not n_sims:
+        raise ValueError(f"{hist_path}: number of trials unknown (no log found, pass --sims)")
+
+    return {'hist': hist_path, 'log': log_path, 'module': module, 'n_sims': n_sims,
+            'bucket_s': bucket_s, 'max_s': max_s, 'continue_running': continue_running,
+            'counts': np.asarray(counts, dtype=np.float64), 'stats': stats}
+
+def failure_counts(counts):
+    """
+    FAULT/UNCORRECTABLE/UNDETECTABLE 구간별 개수를 FAILURE_TYPES 별 구간별 개수로
+    (복구 실패마다 FAULT 는 항상, UNCORRECTABLE/UNDETECTABLE 은 해당할 때 하나씩 올라간다)
+    """
+    fault, uncorr, undet = counts
+    return {'CRIT': fault, 'UE': uncorr, 'DUE': np.maximum(uncorr - undet, 0.0), 'SDC': undet}
+
+def z_value(confidence):
+    """
+    양측 신뢰수준의 정규분포 분위수
+    """
+    return NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+
+def wilson_interval(k, n, confidence):
+    """
+    이항 비율 k/n 의 Wilson 점수 구간 (Simulation::binomialInterval 의 CI_WILSON 과 같은 식)
+    k 는 배열도 가능
+    """
+    z = z_value(confidence)
+    p = np.asarray(k, dtype=np.float64) / n
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return np.clip(center - half, 0.0, 1.0), np.clip(center + half, 0.0, 1.0)
+
+def poisson_interval(k, confidence):
+    """
+    사건 수 k 의 Poisson 점수 구간 (k = 0 이어도 위쪽 끝이 0 이 아님)
+    한 결함이 여러 번 실패하면 사건이 독립이 아니므로 실제 구간은 이보다 넓다
+    """
+    z = z_value(confidence)
+    k = np.asarray(k, dtype=np.float64)
+    half = z * np.sqrt(k + z * z / 4)
+    return np.maximum(k + z * z / 2 - half, 0.0), k + z * z / 2 + half
+
+def node_probability(p_module, n_modules):
+    """
+    독립인 모듈 n_modules 개 중 적어도 하나가 고장날 확률 1 - (1 - p)^N
+    (p 에 대해 단조 증가이므로 p 의 신뢰구간 끝점을 넣으면 그대로 노드 확률의 신뢰구간)
+    """
+    return -np.expm1(n_modules * np.log1p(-np.minimum(p_module, 1.0)))
+
+def renewal_function(f_first, f_type):
+    """
+    고장난 모듈을 그 구간 끝에 새 모듈로 바꾸는 소켓 하나의 구간 k 까지 예상 고장 수 (이산 갱신 방정식)
+    m[k] = F_type[k] + sum_{i<k} f_first[i] * m[k-1-i]
+    f_first: 구간별 첫 고장(종류 무관) 확률, f_type: 그중 세는 종류(UE, DUE 또는 SDC)의 구간별 확률
+    """
+    cumulative = np.cumsum(f_type)
+    m = np.zeros(len(f_first))
+    for k in range(len(f_first)):
+        m[k] = cumulative[k] + (np.dot(f_first[:k], m[k - 1::-1]) if k else 0.0)
+    return m
+
+def first_failure_rows(per_bucket, n_sims, n_modules, confidence):
+    """
+    continue_running = 0: 구간 끝까지 노드의 모듈 중 적어도 하나의 첫 고장이 각 종류일 확률과 Wilson 구간
+    """
+    rows = {}
+    for name, counts in per_bucket.items():
+        cumulative = np.cumsum(counts)
+        lo, hi = wilson_interval(cumulative, n_sims, confidence)
+        rows[f'P({name})'] = node_probability(cumulative / n_sims, n_modules)
+        rows[f'P({name})-LO'] = node_probability(lo, n_modules)
+        rows[f'P({name})-HI'] = node_probability(hi, n_modules)
+    return rows
+
+def first_failure_yearly(per_bucket, n_sims, confidence):
+    """
+    continue_running = 0: 고장 모듈을 교체하는 소켓 하나의 종류별 기간 전체 예상 고장 수 (갱신 방정식)
+    신뢰구간은 기간 전체 비율의 Wilson 구간으로 비례 조정 (사건이 없으면 위쪽 끝만 갱신 없이)
+    """
+    expected = {}
+    for name in YEARLY_TYPES:
+        total = per_bucket[name].sum()
+        point = renewal_function(per_bucket['CRIT'] / n_sims, per_bucket[name] / n_sims)[-1]
+        lo, hi = wilson_interval(total, n_sims, confidence)
+        expected[name] = (point, point * lo * n_sims / total, point * hi * n_sims / total) if total else (0.0, 0.0, float(hi))
+    return expected
+
+def event_rows(per_bucket, n_sims, n_modules, confidence):
+    """
+    continue_running = 1: 구간 끝까지 노드 하나(모듈 N 개)의 종류별 예상 고장 사건 수와 Poisson 구간
+    """
+    rows = {}
+    for name, counts in per_bucket.items():
+        cumulative = np.cumsum(counts)
+        lo, hi = poisson_interval(cumulative, confidence)
+        rows[f'E({name})'] = n_modules * cumulative / n_sims
+        rows[f'E({name})-LO'] = n_modules * lo / n_sims
+        rows[f'E({name})-HI'] = n_modules * hi / n_sims
+    return rows
+
+def event_yearly(per_bucket, n_sims, confidence):
+    """
+    continue_running = 1: 모듈 하나의 종류별 기간 전체 예상 고장 사건 수 (히스토그램 개수 그대로)와 Poisson 구간
+    """
+    expected = {}
+    for name in YEARLY_TYPES:
+        total = per_bucket[name].sum()
+        lo, hi = poisson_interval(total, confidence)
+        expected[name] = (total / n_sims, float(lo) / n_sims, float(hi) / n_sims)
+    return expected
+
+def fleet_report(run, n_modules, n_nodes, confidence):
+    """
+    모듈 하나의 히스토그램을 노드/플릿으로 합성
+    반환값: {'rows': 구간별 노드 값과 신뢰구간 (report_columns 순서), 'summary': 기간 전체 요약과 연간 플릿 고장 수}
+    """
+    n_sims = run['n_sims']
+    per_bucket = failure_counts(run['counts'])
+
+    n_bins = run['counts'].shape[1]
+    end_s = np.minimum(np.arange(1, n_bins + 1) * run['bucket_s'], run['max_s'])
+    rows = {'END_S': end_s}
+    if run['continue_running']:
+        rows.update(event_rows(per_bucket, n_sims, n_modules, confidence))
+        expected = event_yearly(per_bucket, n_sims, confidence)
+    else:
+        rows.update(first_failure_rows(per_bucket, n_sims, n_modules, confidence))
+        expected = first_failure_yearly(per_bucket, n_sims, confidence)
+
+    years = end_s[-1] / YEAR_S
+    n_total = n_modules * n_nodes
+    summary = {'sims': n_sims, 'years': years, 'modules': n_modules, 'nodes': n_nodes, 'confidence': confidence,
+               'continue_running': run['continue_running']}
+    for name, (point, lo, hi) in expected.items():
+        summary[f'{name}_per_year'] = n_total * point / years
+        summary[f'{name}_per_year_lo'] = n_total * lo / years
+        summary[f'{name}_per_year_hi'] = n_total * hi / years
+
+    # CE: 기간 안에 결함은 있었지만 복구 실패는 없었던 시행 (로그의 통계, 기간 전체만)
+    stats = run['stats']
+    if stats and 'uncorr_sims' in stats:
+        ce = stats['failed_sims'] - stats['uncorr_sims']
+        lo, hi = wilson_interval(ce, stats['sims'], confidence)
+        summary['P(CE)'] = float(node_probability(ce / stats['sims'], n_modules))
+        summary['P(CE)-LO'] = float(node_probability(lo, n_modules))
+        summary['P(CE)-HI'] = float(node_probability(hi, n_modules))
+        summary['CE_modules_per_year'] = n_total * ce / stats['sims'] / years
+
+    return {'rows': rows, 'summary': summary}
+
+def report_columns(report):
+    """
+    구간별 표/CSV 의 열 이름 (continue_running 이면 E(...), 아니면 P(...))
+    """
+    quantity = 'E' if report['summary']['continue_running'] else 'P'
+    return ['END_S'] + [f'{quantity}({name}){suffix}' for name in FAILURE_TYPES for suffix in ('', '-LO', '-HI')]
+
+def format_report(run, report):
+    """
+    노드 값 표(구간별)와 플릿 연간 요약
+    """
+    summary = report['summary']
+    rows = report['rows']
+    quantity = 'E' if summary['continue_running'] else 'P'
+    if summary['continue_running']:
+        meaning = "expected failure events per node (continue_running, Poisson bounds)"
+    else:
+        meaning = "P(some module's first failure is of this type), failed modules replaced in fleet rates"
+    lines = [f"{run['hist']} ({run['module']}, {summary['sims']} trials, {summary['years']:.4g} years)",
+             f"node = {summary['modules']} modules, fleet = {summary['nodes']} nodes, "
+             f"{100 * summary['confidence']:g}% bounds, modules independent",
+             meaning,
+             f"{'DAYS':>10} " + " ".join(f"{f'{quantity}(node {name}) [lo, hi]':>32}" for name in FAILURE_TYPES)]
+    for idx in range(len(rows['END_S'])):
+        lines.append(f"{rows['END_S'][idx] / DAY_S:>10.4g} " + " ".join(
+            f"{rows[f'{quantity}({name})'][idx]:>10.4e} [{rows[f'{quantity}({name})-LO'][idx]:.3e}, "
+            f"{rows[f'{quantity}({name})-HI'][idx]:.3e}]" for name in FAILURE_TYPES))
+
+    lines.append("")
+    for name, label in (('UE', 'UE'), ('DUE', 'DUE (interrupts)'), ('SDC', 'SDC')):
+        per_year = summary[f'{name}_per_year']
+        lines.append(f"fleet {label:<17} per year: {per_year:.4g} [{summary[f'{name}_per_year_lo']:.4g}, "
+                     f"{summary[f'{name}_per_year_hi']:.4g}], per node-year {per_year / summary['nodes']:.4g}")
+    if 'P(CE)' in summary:
+        lines.append(f"P(node CE only, {summary['years']:.4g} years): {summary['P(CE)']:.4e} "
+                     f"[{summary['P(CE)-LO']:.3e}, {summary['P(CE)-HI']:.3e}], "
+                     f"fleet modules with CE per year {summary['CE_modules_per_year']:.4g}")
+    return "\n".join(lines) + "\n"
+
+def write_report_csv(csv_path, report):
+    """
+    구간별 노드 값과 신뢰구간을 CSV 로 저장 (END_S: 구간 끝 시각, 초)
+    """
+    rows = report['rows']
+    columns = report_columns(report)
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write(",".join(columns) + "\n")
+        for idx in range(len(rows['END_S'])):
+            f.write(",".join(f"{rows[name][idx]:.6g}" for name in columns) + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Extrapolate single-module FaultSim failure-time histograms "
+                                                 "to N-module nodes and fleets")
+    parser.add_argument('histogram', help="WEEKS histogram of a run (text or --outformat bin)")
+    parser.add_argument('--modules', type=int, default=16, help="modules per node")
+    parser.add_argument('--nodes', type=int, default=1, help="nodes in the fleet")
+    parser.add_argument('--confidence', type=float, default=0.95, help="confidence level of the bounds")
+    parser.add_argument('--log', default=None, help="log of the run (default: <name>_log.txt next to the histogram)")
+    parser.add_argument('--module', default=None, help="module name in the log (default: from the histogram name)")
+    parser.add_argument('--sims', type=int, default=None, help="number of trials, if no log is available")
+    parser.add_argument('--bucket-s', type=int, default=None,
+                        help="seconds per bucket of a text histogram, if no log/config is available")
+    parser.add_argument('--continue-running', action='store_true',
+                        help="treat the histogram as a continue_running run, if no log/config is available")
+    parser.add_argument('--csv', default=None, help="also write the per-bucket node values to this CSV file")
+    args = parser.parse_args()
+
+    try:
+        run = load_run(args.histogram, args.log, args.module, args.sims, args.bucket_s, args.continue_running)
+    except (OSError, ValueError) as e:
+        print(f"히스토그램을 사용할 수 없습니다: {e}", file=sys.stderr)
+        return 1
+    if run['log'] is None:
+        print("로그를 찾지 못해 CE 와 is_boost 확인을 건너뜁니다.", file=sys.stderr)
+
+    report = fleet_report(run, args.modules, args.nodes, args.confidence)
+    sys.stdout.write(format_report(run, report))
+    if args.csv:
+        write_report_csv(args.csv, report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+FaultSim 샤드 분할/병합 모듈
+하나의 설정 파일을 n_sims/K 씩 K개의 하위 설정으로 나누고, 각 샤드의 로그(printStats)와
+WEEKS 히스토그램(opfile)을 한 번의 긴 실행과 같은 형식으로 합칩니다.
+"""
+
+import os
+import json
+
+from parse_error_stats import (read_stats_block, stats_path_for_log, iter_log_lines, read_config,
+                               importance_estimate)
+
+def is_binary_histogram(hist_path):
+    """
+    weeks_histogram.is_binary_histogram (텍스트 히스토그램만 다룰 때는 numpy 가 필요 없도록 늦게 import)
+    """
+    from weeks_histogram import is_binary_histogram as is_binary
+    return is_binary(hist_path)
+
+def write_shard_configs(config_path, n_shards, shard_dir, name, seed):
+    """
+    설정 파일을 n_shards 개의 하위 설정으로 분할 (n_sims 합계는 원본과 동일)
+    모든 샤드는 같은 seed 와 서로 다른 shard 번호를 받아 독립적이고 재현 가능한 난수열을 사용
+    반환값: 하위 설정 파일 경로 리스트
+    """
+    config = read_config(config_path)
+    n_sims = config.getint('Sim', 'n_sims')
+    config.set('Sim', 'seed', str(seed))
+    n_shards = max(1, min(n_shards, n_sims))
+
+    os.makedirs(shard_dir, exist_ok=True)
+    shard_paths = []
+    for shard in range(n_shards):
+        # 나머지는 앞쪽 샤드에 하나씩 배분
+        shard_sims = n_sims // n_shards + (1 if shard < n_sims % n_shards else 0)
+        config.set('Sim', 'n_sims', str(shard_sims))
+        config.set('Sim', 'shard', str(shard))
+
+        shard_path = os.path.join(shard_dir, f"{name}_shard{shard}.ini")
+        with open(shard_path, 'w', encoding='utf-8') as f:
+            config.write(f)
+        shard_paths.append(shard_path)
+
+    return shard_paths
+
+def format_double(value):
+    """
+    C++ ostream 기본 출력(유효숫자 6자리)과 같은 형식
+    """
+    return f"{value:g}"
+
+def format_stats_line(name, sims, failed, uncorr, undet, max_s):
+    """
+    FaultDomain::printStats 와 같은 계산 순서/형식으로 통계 줄 생성
+    """
+    hour_ns = float(60 * 60 * 1000000000)
+    rate_raw = failed / sims if sims else float('nan')
+    rate_uncorr = uncorr / sims if sims else float('nan')
+    rate_undet = undet / sims if sims else float('nan')
+
+    return (f"[{name}] sims {sims} failed_sims {failed}"
+            f" rate_raw {format_double(rate_raw)} FIT_raw {format_double(rate_raw * hour_ns / max_s)}"
+            f" rate_uncorr {format_double(rate_uncorr)} FIT_uncorr {format_double(rate_uncorr * hour_ns / max_s)}"
+            f" rate_undet {format_double(rate_undet)} FIT_undet {format_double(rate_undet * hour_ns / max_s)}"
+            f" uncorr_sims {uncorr} undet_sims {undet}\n")
+
+def format_stats_record(name, total, max_s):
+    """
+    FaultDomain::writeStats 와 같은 필드 순서의 NDJSON 통계 레코드 한 줄 생성
+    total: sims, failed_sims, uncorr_sims, undet_sims (칩 도메인은 transient/permanent 클래스별 개수 포함)
+    """
+    record = {'name': name, 'max_s': max_s, 'sims': total['sims'], 'failed_sims': total['failed_sims'],
+              'ce_sims': total['failed_sims'] - total['uncorr_sims'],
+              'uncorr_sims': total['uncorr_sims'], 'undet_sims': total['undet_sims']}
+    for key in ('transient', 'transient_tsv', 'permanent', 'permanent_tsv'):
+        if key in total:
+            record[key] = total[key]
+    return json.dumps(record) + "\n"
+
+def format_importance_line(name, importance, max_s):
+    """
+    Simulation::printImportanceStats 와 같은 계산 순서/형식으로 가중 통계 줄 생성
+    """
+    hour_ns = float(60 * 60 * 1000000000)
+    sims = importance['sims']
+    line = (f"[{name}] is_boost {format_double(importance['is_boost'])} sims {sims}"
+            f" weight_mean {format_double(importance['sum_w'] / sims if sims else 0)}")
+    for key in ('raw', 'uncorr', 'undet'):
+        mean, var = importance_estimate(importance[f'sum_wy_{key}'], importance[f'sum_wy2_{key}'], sims)
+        line += (f" rate_{key} {format_double(mean)} rate_{key}_var {format_double(var)}"
+                 f" FIT_{key} {format_double(mean * hour_ns / max_s)}")
+
+    line += f" sum_w {importance['sum_w']:.17g} sum_w2 {importance['sum_w2']:.17g}"
+    for key in ('raw', 'uncorr', 'undet'):
+        line += f" sum_wy_{key} {importance[f'sum_wy_{key}']:.17g} sum_wy2_{key} {importance[f'sum_wy2_{key}']:.17g}"
+    return line + "\n"
+
+def read_preamble(log_path):
+    """
+    시뮬레이션 시작 전까지의 출력(배너, 설정, FIT 스케일링)을 읽기
+    """
+    preamble = []
+    with open(log_path, 'rb') as f:
+        for raw in iter_log_lines(f):
+            line = raw.decode('utf-8', errors='replace') + "\n"
+            if line.startswith('# =====') or line.startswith('['):
+                break
+            preamble.append(line)
+
+    while preamble and not preamble[-1].strip():
+        preamble.pop()
+    return preamble
+
+def merge_logs(log_paths, merged_log_path, config_path):
+    """
+    샤드 로그들의 printStats 결과를 합산하여 한 번의 긴 실행과 같은 로그와 NDJSON 통계 파일을 작성
+    (샤드의 통계는 NDJSON 통계 파일이 있으면 그것을 읽는다)
+    반환값: 합산된 도메인 통계 딕셔너리 (이름 -> 카운터)
+    """
+    max_s = read_config(config_path).getint('Sim', 'max_s')
+    merged = {}
+    order = []
+
+    for log_path in log_paths:
+        domains = read_stats_block(log_path)
+        if not domains or 'uncorr_sims' not in domains[0]:
+            raise ValueError(f"no printStats output with exact counts in {log_path}")
+
+        for stats in domains:
+            name = stats['name']
+            if name not in merged:
+                order.append(name)
+                merged[name] = {'sims': 0, 'failed_sims': 0, 'uncorr_sims': 0, 'undet_sims': 0}
+            total = merged[name]
+            for key in ('sims', 'failed_sims', 'uncorr_sims', 'undet_sims'):
+                total[key] += stats[key]
+            if 'importance' in stats:
+                # 가중치 합은 전체 정밀도로 출력되므로 샤드별 합을 더하면 된다
+                importance = stats['importance']
+                if 'importance' not in total:
+                    total['importance'] = {key: 0 for key in importance if key == 'sims' or key.startswith('sum_')}
+                    total['importance']['is_boost'] = importance['is_boost']
+                elif total['importance']['is_boost'] != importance['is_boost']:
+                    raise ValueError(f"shards were run with different is_boost values: {log_path}")
+                for key in total['importance']:
+                    if key != 'is_boost':
+                        total['importance'][key] += importance[key]
+            for key in ('transient', 'permanent'):
+                if key in stats:
+                    if key in total:
+                        total[key] = [a + b for a, b in zip(total[key], stats[key])]
+                        total[key + '_tsv'] += stats[key + '_tsv']
+                    else:
+                        total[key] = list(stats[key])
+                        total[key + '_tsv'] = stats[key + '_tsv']
+
+    with open(merged_log_path, 'w', encoding='utf-8') as f:
+        for line in read_preamble(log_paths[0]):
+            # 샤드 설정 대신 원본 설정 파일을 기록
+            if line.startswith('The selected config file is:'):
+                line = f"The selected config file is: {config_path}\n"
+            f.write(line)
+
+        f.write("\n\n")
+        for name in order:
+            total = merged[name]
+            f.write(format_stats_line(name, total['sims'], total['failed_sims'],
+                                      total['uncorr_sims'], total['undet_sims'], max_s))
+            if 'transient' in total:
+                f.write(" Transient: " + "".join(f"{x} " for x in total['transient']) + f"TSV {total['transient_tsv']}"
+                        + " Permanent: " + "".join(f"{x} " for x in total['permanent']) + f"TSV {total['permanent_tsv']}\n")
+        for name in order:
+            if 'importance' in merged[name]:
+                f.write(format_importance_line(name, merged[name]['importance'], max_s))
+        f.write("\n")
+
+    with open(stats_path_for_log(merged_log_path), 'w', encoding='utf-8') as f:
+        for name in order:
+            f.write(format_stats_record(name, merged[name], max_s))
+        for name in order:
+            if 'importance' in merged[name]:
+                f.write(json.dumps({'name': name, 'importance': merged[name]['importance']}) + "\n")
+
+    return merged
+
+def domain_histogram_path(hist_path, domain_name):
+    """
+    최상위 도메인이 여럿인 실행(compare_repairmodes)에서 도메인별 히스토그램 경로
+    (Simulation::domainOutputFile 과 같은 규칙, 예: x_results.txt -> x_results_MODULE0-SECDED.txt)
+    """
+    stem, ext = os.path.splitext(hist_path)
+    return f"{stem}_{domain_name}{ext}"
+
+def merge_histograms(hist_paths, merged_hist_path, n_sims):
+    """
+    샤드별 WEEKS 히스토그램의 구간별 개수를 더하고 누적/확률 열을 다시 계산
+    (Simulation::simulate 의 opfile 출력과 같은 계산 순서와 자릿수)
+    바이너리 히스토그램(--outformat bin)은 구간별 개수만 더해서 같은 형식으로 저장
+    """
+    if is_binary_histogram(hist_paths[0]):
+        merge_binary_histograms(hist_paths, merged_hist_path, n_sims)
+        return
+
+    header = None
+    weeks = []
+    fault = []
+    uncorr = []
+    undet = []
+
+    for hist_path in hist_paths:
+        with open(hist_path, 'r', encoding='utf-8') as f:
+            shard_header = f.readline()
+            if header is None:
+                header = shard_header
+            for idx, line in enumerate(f):
+                cols = line.strip().split(',')
+                if len(cols) < 13:
+                    continue
+                if idx >= len(weeks):
+                    weeks.append(cols[0])
+                    fault.append(0)
+                    uncorr.append(0)
+                    undet.append(0)
+                fault[idx] += int(cols[1])
+                uncorr[idx] += int(cols[5])
+                undet[idx] += int(cols[9])
+
+    p_fail_cumulative = 0.0
+    p_uncorrected_cumulative = 0.0
+    p_undetected_cumulative = 0.0
+    fail_cumulative = 0
+    uncorrectable_cumulative = 0
+    undetectable_cumulative = 0
+
+    with open(merged_hist_path, 'w', encoding='utf-8') as f:
+        f.write(header)
+        for idx in range(len(weeks)):
+            p_fail = fault[idx] / n_sims
+            p_uncorrected = uncorr[idx] / n_sims
+            p_undetected = undet[idx] / n_sims
+            p_fail_cumulative += p_fail
+            fail_cumulative += fault[idx]
+            p_uncorrected_cumulative += p_uncorrected
+            uncorrectable_cumulative += uncorr[idx]
+            p_undetected_cumulative += p_undetected
+            undetectable_cumulative += undet[idx]
+
+            f.write(f"{weeks[idx]},{fault[idx]},{fail_cumulative},{p_fail:.6f},{p_fail_cumulative:.6f},"
+                    f"{uncorr[idx]},{uncorrectable_cumulative},{p_uncorrected:.6f},{p_uncorrected_cumulative:.6f},"
+                    f"{undet[idx]},{undetectable_cumulative},{p_undetected:.6f},{p_undetected_cumulative:.6f}\n")
+
+def merge_binary_histograms(hist_paths, merged_hist_path, n_sims):
+    """
+    샤드별 바이너리 히스토그램의 구간별 개수를 더해서 저장 (누적/확률 열은 읽는 쪽에서 계산)
+    """
+    from weeks_histogram import read_histogram, write_histogram
+
+    total = None
+    for hist_path in hist_paths:
+        header, counts = read_histogram(hist_path)
+        if total is None:
+            bucket_s, max_s = header['bucket_s'], header['max_s']
+            total = counts.copy()
+        else:
+            total += counts
+
+    write_histogram(merged_hist_path, total, n_sims, bucket_s, max_s)
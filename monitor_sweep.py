@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+FaultSim 실행 진행 상황 모니터
+run_sweep.py (또는 faultsim --progress N --progressfile <파일>) 가 남기는 *_status.json 파일을
+결과 디렉토리에서 찾아 작업마다 진행률, 처리 속도, 남은 시간, 누적 실패 수를 주기적으로 보여줍니다.
+
+예: python3 monitor_sweep.py ./results --interval 5
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+from parse_error_stats import STATUS_FILE_SUFFIX
+
+def find_status_files(results_dir):
+    """
+    결과 디렉토리(하위 디렉토리 포함, 샤드 포함)의 진행 상황 파일 목록
+    """
+    status_files = []
+    for root, _, files in os.walk(results_dir):
+        for file in files:
+            if file.endswith(STATUS_FILE_SUFFIX):
+                status_files.append(os.path.join(root, file))
+    return sorted(status_files)
+
+def read_status(status_path):
+    """
+    진행 상황 파일 하나 읽기 (Simulation::reportProgress 가 통째로 바꿔 쓰므로 항상 완전한 레코드)
+    실행 중으로 기록됐지만 프로세스가 없으면 state 를 'stopped' 로 바꾼다
+    """
+    try:
+        with open(status_path, encoding='utf-8') as f:
+            status = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if status['state'] == 'running' and not process_alive(status['pid']):
+        status['state'] = 'stopped'
+    status['job'] = os.path.basename(status_path)[:-len(STATUS_FILE_SUFFIX)]
+    return status
+
+def process_alive(pid):
+    """
+    같은 호스트에서 pid 프로세스가 살아 있는지 확인
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def format_eta(seconds):
+    """
+    남은 시간 표시 (h:mm:ss)
+    """
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+def format_table(statuses):
+    """
+    작업별 진행 상황 표와 합계 줄
+    합계의 속도는 실행 중인 작업의 합, 남은 시간은 가장 늦게 끝날 작업 기준
+    """
+    lines = [f"{'JOB':<36} {'STATE':<8} {'SIMS':>21} {'%':>6} {'SIMS/S':>10} {'ETA':>10} "
+             f"{'FAILED':>10} {'UNCORR':>8} {'UNDET':>8}"]
+    total = {'sims': 0, 'n_sims': 0, 'sims_per_s': 0, 'eta_s': 0, 'failed_sims': 0, 'uncorr_sims': 0, 'undet_sims': 0}
+    for status in statuses:
+        running = status['state'] == 'running'
+        percent = 100.0 * status['sims'] / status['n_sims'] if status['n_sims'] else 100.0
+        lines.append(f"{status['job']:<36} {status['state']:<8} {status['sims']:>10}/{status['n_sims']:<10} "
+                     f"{percent:>6.1f} {status['sims_per_s'] if running else 0:>10} "
+                     f"{format_eta(status['eta_s']) if running else '-':>10} "
+                     f"{status['failed_sims']:>10} {status['uncorr_sims']:>8} {status['undet_sims']:>8}")
+        for key in ('sims', 'n_sims', 'failed_sims', 'uncorr_sims', 'undet_sims'):
+            total[key] += status[key]
+        if running:
+            total['sims_per_s'] += status['sims_per_s']
+            total['eta_s'] = max(total['eta_s'], status['eta_s'])
+
+    n_running = sum(1 for status in statuses if status['state'] == 'running')
+    percent = 100.0 * total['sims'] / total['n_sims'] if total['n_sims'] else 100.0
+    lines.append(f"{f'TOTAL ({n_running}/{len(statuses)} running)':<45} {total['sims']:>10}/{total['n_sims']:<10} "
+                 f"{percent:>6.1f} {total['sims_per_s']:>10} {format_eta(total['eta_s']):>10} "
+                 f"{total['failed_sims']:>10} {total['uncorr_sims']:>8} {total['undet_sims']:>8}")
+    return "\n".join(lines) + "\n"
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the progress of running FaultSim jobs from their status files")
+    parser.add_argument('results_dir', nargs='?', default='./results', help="directory searched for *_status.json")
+    parser.add_argument('--interval', type=float, default=5, help="seconds between refreshes")
+    parser.add_argument('--once', action='store_true', help="print the table once and exit")
+    args = parser.parse_args()
+
+    while True:
+        statuses = [status for status in map(read_status, find_status_files(args.results_dir)) if status]
+        if sys.stdout.isatty() and not args.once:
+            # 터미널에서는 화면을 지우고 같은 자리에 다시 그린다
+            sys.stdout.write("\033[H\033[J")
+        sys.stdout.write(time.strftime("%Y-%m-%d %H:%M:%S ") + args.results_dir + "\n")
+        sys.stdout.write(format_table(statuses) if statuses else "진행 상황 파일이 없습니다.\n")
+        sys.stdout.flush()
+
+        if args.once or (statuses and all(status['state'] != 'running' for status in statuses)):
+            return 0
+        time.sleep(args.interval)
+
+if __name__ == "__main__":
+    sys.exit(main())
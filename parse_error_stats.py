@@ -1,65 +1,696 @@
 #!/usr/bin/env python3
 """
-FaultSim 로그 파일 파싱 스크립트
-각 ECC 종류와 용량별 CE, UE, SDC, 총 Error 수를 추출합니다.
+FaultSim 로그 파일 파싱 모듈
+results 디렉토리를 한 번 훑어 각 로그를 실행에 사용한 설정 파일(ECC 종류, 용량, DDR 세대, 기간)로
+분류하고, CE, UE, SDC, 총 Error 수를 추출합니다.
+
+예: python3 parse_error_stats.py ./results
+    (다른 스크립트에서는 load_results(results_dir) 로 DataFrame 을 받아 사용)
 """
 
 import os
 import re
-import glob
+import sys
+import json
+import hashlib
+import sqlite3
+import argparse
+import configparser
+from concurrent.futures import ProcessPoolExecutor
+
+# 결과 CSV 헤더 (run_sweep.py 에서도 같은 형식으로 한 줄씩 추가)
+CSV_HEADER = "ECC Type,Capacity,CE,UE,SDC,UE+SDC,Critical Error Rate,Total\n"
+
+# printStats 통계 줄: [NAME] sims ... FIT_undet ... (uncorr_sims/undet_sims 는 정확한 정수 개수)
+STATS_LINE_PATTERN = re.compile(
+    r'^\[(?P<name>[^\]]+)\]\s+sims\s+(?P<sims>\d+)\s+failed_sims\s+(?P<failed_sims>\d+)'
+    r'\s+rate_raw\s+(?P<rate_raw>\S+)\s+FIT_raw\s+(?P<FIT_raw>\S+)'
+    r'\s+rate_uncorr\s+(?P<rate_uncorr>\S+)\s+FIT_uncorr\s+(?P<FIT_uncorr>\S+)'
+    r'\s+rate_undet\s+(?P<rate_undet>\S+)\s+FIT_undet\s+(?P<FIT_undet>\S+)'
+    r'(?:\s+uncorr_sims\s+(?P<uncorr_sims>\d+)\s+undet_sims\s+(?P<undet_sims>\d+))?\s*$')
+
+# 중요도 샘플링(is_boost) 실행에서 Simulation::printImportanceStats 가 출력하는 가중 통계 줄
+# 예: [MODULE0] is_boost 20 sims 200000 weight_mean 0.99 rate_raw ... rate_uncorr ... rate_uncorr_var ... sum_w ... sum_wy_uncorr ...
+IMPORTANCE_LINE_PATTERN = re.compile(r'^\[(?P<name>[^\]]+)\]\s+(?P<fields>is_boost\s+.*\S)\s*$')
+
+# DRAMDomain::printStats 의 결함 클래스별 카운터 줄
+CLASS_LINE_PATTERN = re.compile(
+    r'^\s*Transient:\s+(?P<transient>[\d\s]+)TSV\s+(?P<transient_tsv>\d+)\s+'
+    r'Permanent:\s+(?P<permanent>[\d\s]+)TSV\s+(?P<permanent_tsv>\d+)\s*$')
+
+# faultsim --statsfile 의 NDJSON 통계 파일 (run_sweep.py 는 <name>_log.txt 옆에 <name>_stats.ndjson 으로 저장)
+STATS_FILE_SUFFIX = "_stats.ndjson"
+# faultsim --progressfile 의 진행 상황 파일 (run_sweep.py 는 <name>_log.txt 옆에 <name>_status.json 으로 저장)
+STATUS_FILE_SUFFIX = "_status.json"
+# faultsim --profile 의 구간별 프로파일 (run_sweep.py --profile 은 <name>_log.txt 옆에 <name>_profile.json 으로 저장)
+PROFILE_FILE_SUFFIX = "_profile.json"
+# FaultDomain::printStats 의 FIT 환산 (1시간 = 3.6e12 ns)
+HOUR_NS = 60.0 * 60 * 1000000000
+
+# 통계 블록은 로그 끝에 있으므로 뒤에서부터 이 크기만큼 읽기 시작해 필요한 만큼 늘린다
+TAIL_WINDOW = 1 << 20
+MAX_TAIL_WINDOW = 64 << 20
+# 이보다 긴 줄(verbose 진행 표시 등)은 통계 줄이 아니므로 읽지 않고 건너뛴다
+MAX_LINE_BYTES = 1 << 16
+# main.cpp 가 출력하는 설정 파일 줄 (로그 머리말에서 이 줄 수 안에 있다)
+CONFIG_LINE_PREFIX = "The selected config file is:"
+CONFIG_LINE_SEARCH = 64
+
+# [ECC] repairmode -> ECC 이름 (main.cpp 의 genModuleDIMM / genModule3D)
+DIMM_ECC_NAMES = {0: 'No ECC', 1: 'ChipKill', 2: 'ChipKill2', 3: 'SECDED', 4: '3EC4ED', 5: '6EC7ED'}
+# 설정 파일 이름의 용량 표기 (DIMM_ChipKill_16gb.ini, DIMM_SECDED_DDR5_32GB.ini)
+CAPACITY_NAME_PATTERN = re.compile(r'_(\d+)gb(?:_|\.ini$)', re.IGNORECASE)
+# compare_repairmodes 실행의 모듈 이름 MODULE0-<tag> -> repairmode (main.cpp 의 REPAIRMODE_TAGS)
+REPAIRMODE_TAGS = {'NONE': 0, 'CK1': 1, 'CK2': 2, 'SECDED': 3, '3EC4ED': 4, '6EC7ED': 5}
+CUBE_ECC_NAMES = {1: 'ChipKill', 2: 'RAID', 3: 'SECDED', 4: '3EC4ED', 5: '6EC7ED'}
+# [Org] organization (faultsim.hh 의 MO_DIMM / MO_3D)
+ORGANIZATION_NAMES = {0: 'DIMM', 1: '3D'}
+
+# 파싱 결과 캐시 (results 디렉토리 안의 SQLite 파일)
+STATS_CACHE_NAME = "faultsim_stats_cache.sqlite"
+# 저장 형식이 바뀌면 올려서 이전 캐시를 버린다
+STATS_CACHE_VERSION = 2
+# 내용 지문에 사용하는 파일 앞/뒤 구간 크기 (설정 줄과 통계 블록이 들어 있는 부분)
+FINGERPRINT_BYTES = 1 << 20
+
+def iter_log_lines(f, chunk_size=TAIL_WINDOW):
+    """
+    바이너리 파일 객체에서 줄 단위로 읽기 (메모리 사용량은 chunk_size 로 고정)
+    MAX_LINE_BYTES 보다 긴 줄은 건너뛴다
+    """
+    pending = b''
+    skipping = False
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        start = 0
+        while True:
+            newline = chunk.find(b'\n', start)
+            if newline < 0:
+                if not skipping:
+                    pending += chunk[start:]
+                    if len(pending) > MAX_LINE_BYTES:
+                        pending = b''
+                        skipping = True
+                break
+            if skipping:
+                skipping = False
+            else:
+                yield pending + chunk[start:newline]
+            pending = b''
+            start = newline + 1
+    if pending and not skipping:
+        yield pending
+
+def collect_stats_block(lines):
+    """
+    줄들 중 마지막으로 연속된 printStats 블록(도메인 통계 + 결함 클래스 줄)을 파싱
+    반환값: 도메인별 통계 딕셔너리 리스트 (출력 순서 유지)
+    """
+    block = []
+    in_block = False
+    for raw in lines:
+        line = raw.decode('utf-8', errors='replace') if isinstance(raw, bytes) else raw
+        match = STATS_LINE_PATTERN.match(line)
+        if match:
+            if not in_block:
+                block = []
+                in_block = True
+            stats = {'name': match.group('name'),
+                     'sims': int(match.group('sims')),
+                     'failed_sims': int(match.group('failed_sims'))}
+            for key in ('rate_raw', 'FIT_raw', 'rate_uncorr', 'FIT_uncorr', 'rate_undet', 'FIT_undet'):
+                stats[key] = float(match.group(key))
+            if match.group('uncorr_sims') is not None:
+                stats['uncorr_sims'] = int(match.group('uncorr_sims'))
+                stats['undet_sims'] = int(match.group('undet_sims'))
+            block.append(stats)
+            continue
+
+        match = IMPORTANCE_LINE_PATTERN.match(line)
+        if match and in_block:
+            tokens = match.group('fields').split()
+            importance = {key: float(value) for key, value in zip(tokens[::2], tokens[1::2])}
+            importance['sims'] = int(importance['sims'])
+            for stats in block:
+                if stats['name'] == match.group('name'):
+                    stats['importance'] = importance
+            continue
+
+        match = CLASS_LINE_PATTERN.match(line)
+        if match and in_block:
+            block[-1]['transient'] = [int(x) for x in match.group('transient').split()]
+            block[-1]['transient_tsv'] = int(match.group('transient_tsv'))
+            block[-1]['permanent'] = [int(x) for x in match.group('permanent').split()]
+            block[-1]['permanent_tsv'] = int(match.group('permanent_tsv'))
+            continue
+
+        # verbose = 2 에서 printStats 가 출력하는 FR 줄은 블록의 일부
+        if in_block and not line.startswith('FR '):
+            in_block = False
+
+    return block
+
+def parse_stats_block(log_file_path):
+    """
+    로그 파일 끝의 printStats 블록에서 모든 도메인(MODULE0, MODULE0.DRAMn, ...)의 통계를 읽기
+    파일 끝부분만 읽고, 블록 시작을 찾지 못하면 파일 전체를 한 번 스트리밍으로 훑는다
+    (어느 경우든 메모리 사용량은 로그 크기와 무관)
+    """
+    with open(log_file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+
+        window = TAIL_WINDOW
+        while True:
+            window = min(window, size)
+            f.seek(size - window)
+            data = f.read(window)
+            # Simulation::printStats 는 빈 줄 다음에 통계 블록을 출력
+            start = data.rfind(b'\n\n[')
+            if start >= 0:
+                block = collect_stats_block(data[start + 2:].split(b'\n'))
+                if block:
+                    return block
+            if window >= size or window >= MAX_TAIL_WINDOW:
+                break
+            window *= 2
+
+        f.seek(0)
+        return collect_stats_block(iter_log_lines(f))
+
+def stats_path_for_log(log_file_path):
+    """
+    로그에 대응하는 NDJSON 통계 파일 경로 (x_log.txt -> x_stats.ndjson, 그 밖에는 x.txt -> x_stats.ndjson)
+    """
+    if log_file_path.endswith('_log.txt'):
+        return log_file_path[:-len('_log.txt')] + STATS_FILE_SUFFIX
+    return os.path.splitext(log_file_path)[0] + STATS_FILE_SUFFIX
+
+def status_path_for_log(log_file_path):
+    """
+    로그에 대응하는 진행 상황 파일 경로 (stats_path_for_log 와 같은 규칙)
+    """
+    return stats_path_for_log(log_file_path)[:-len(STATS_FILE_SUFFIX)] + STATUS_FILE_SUFFIX
+
+def profile_path_for_log(log_file_path):
+    """
+    로그에 대응하는 프로파일 파일 경로 (stats_path_for_log 와 같은 규칙)
+    """
+    return stats_path_for_log(log_file_path)[:-len(STATS_FILE_SUFFIX)] + PROFILE_FILE_SUFFIX
+
+def read_stats_ndjson(stats_path):
+    """
+    Simulation::writeStats 의 NDJSON 통계 파일을 parse_stats_block 과 같은 형식으로 읽기
+    개수는 정확한 정수이고, 비율/FIT 는 printStats 와 같은 식으로 개수에서 계산
+    """
+    block = []
+    with open(stats_path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if 'importance' in record:
+                for stats in block:
+                    if stats['name'] == record['name']:
+                        stats['importance'] = record['importance']
+                continue
+
+            sims = record['sims']
+            stats = {'name': record['name'], 'sims': sims, 'failed_sims': record['failed_sims']}
+            for key, count in (('raw', record['failed_sims']), ('uncorr', record['uncorr_sims']),
+                               ('undet', record['undet_sims'])):
+                rate = count / sims if sims else float('nan')
+                stats['rate_' + key] = rate
+                stats['FIT_' + key] = rate * HOUR_NS / record['max_s']
+            for key in ('uncorr_sims', 'undet_sims', 'transient', 'transient_tsv', 'permanent', 'permanent_tsv'):
+                if key in record:
+                    stats[key] = record[key]
+            block.append(stats)
+    return block
+
+def read_stats_block(log_file_path):
+    """
+    로그의 통계: NDJSON 통계 파일이 있으면 그것을(정확한 개수, 정규식 파싱 없음), 없으면 로그의 printStats 블록을 읽기
+    """
+    stats_path = stats_path_for_log(log_file_path)
+    if os.path.exists(stats_path):
+        return read_stats_ndjson(stats_path)
+    return parse_stats_block(log_file_path)
+
+def log_fingerprint(log_file_path, size):
+    """
+    로그 파일 내용 지문: 크기 + 앞/뒤 FINGERPRINT_BYTES 의 해시
+    (파싱 결과는 머리말과 끝의 통계 블록에만 의존하므로 수 GB 파일 전체를 읽지 않는다)
+    """
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(log_file_path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+        if size > FINGERPRINT_BYTES:
+            f.seek(max(FINGERPRINT_BYTES, size - FINGERPRINT_BYTES))
+            digest.update(f.read(FINGERPRINT_BYTES))
+    return digest.hexdigest()
+
+def read_config_line(log_file_path):
+    """
+    로그 머리말의 "The selected config file is: <경로>" 줄에서 설정 파일 경로를 읽기
+    """
+    with open(log_file_path, 'rb') as f:
+        for idx, raw in enumerate(iter_log_lines(f, MAX_LINE_BYTES)):
+            line = raw.decode('utf-8', errors='replace')
+            if line.startswith(CONFIG_LINE_PREFIX):
+                return line[len(CONFIG_LINE_PREFIX):].strip()
+            if idx >= CONFIG_LINE_SEARCH:
+                break
+    return None
+
+def parse_log_entry(log_file_path):
+    """
+    로그 하나에서 설정 파일 경로와 printStats 블록을 읽기 (워커 프로세스에서 실행)
+    """
+    return {'config': read_config_line(log_file_path),
+            'block': read_stats_block(log_file_path)}
+
+def open_stats_cache(cache_path):
+    """
+    파싱 결과 캐시 열기 (없으면 생성, 형식이 다른 이전 캐시는 비운다)
+    """
+    conn = sqlite3.connect(cache_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != STATS_CACHE_VERSION:
+        conn.execute("DROP TABLE IF EXISTS log_stats")
+        conn.execute(f"PRAGMA user_version = {STATS_CACHE_VERSION}")
+    conn.execute("CREATE TABLE IF NOT EXISTS log_stats ("
+                 "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+                 "fingerprint TEXT, entry TEXT)")
+    return conn
+
+def lookup_stats_cache(conn, log_file_path):
+    """
+    캐시에서 로그 항목(parse_log_entry 결과) 찾기
+    경로/크기/수정 시각이 같으면 저장된 결과를 그대로 쓰고, 달라졌으면 내용 지문을 비교한다
+    반환값: (항목 또는 None, store_stats_cache 에 넘길 키)
+    """
+    path = os.path.abspath(log_file_path)
+    st = os.stat(path)
+    row = conn.execute("SELECT size, mtime_ns, fingerprint, entry FROM log_stats WHERE path = ?",
+                       (path,)).fetchone()
+
+    if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+        return json.loads(row[3]), None
+
+    key = (path, st.st_size, st.st_mtime_ns, log_fingerprint(path, st.st_size))
+    if row is not None and row[2] == key[3]:
+        entry = json.loads(row[3])
+        store_stats_cache(conn, key, entry)
+        return entry, None
+    return None, key
+
+def store_stats_cache(conn, key, entry):
+    """
+    새로 파싱한 로그 항목을 캐시에 저장
+    아직 끝나지 않은 실행(통계 블록 없음)은 저장하지 않는다
+    """
+    if entry['block']:
+        conn.execute("INSERT OR REPLACE INTO log_stats VALUES (?, ?, ?, ?, ?)",
+                     key + (json.dumps(entry),))
+        conn.commit()
+
+def cached_log_entry(conn, log_file_path):
+    """
+    parse_log_entry 의 캐시 버전 (실제로 바뀐 로그만 다시 파싱)
+    """
+    entry, key = lookup_stats_cache(conn, log_file_path)
+    if entry is None:
+        entry = parse_log_entry(log_file_path)
+        store_stats_cache(conn, key, entry)
+    return entry
+
+def prune_stats_cache(conn, log_files):
+    """
+    더 이상 존재하지 않는 로그의 캐시 항목 삭제
+    """
+    keep = set(os.path.abspath(path) for path in log_files)
+    for (path,) in conn.execute("SELECT path FROM log_stats").fetchall():
+        if path not in keep and not os.path.exists(path):
+            conn.execute("DELETE FROM log_stats WHERE path = ?", (path,))
+    conn.commit()
+
+def module_ecc_types(block):
+    """
+    printStats 블록의 최상위 모듈 이름과 ECC 이름 목록
+    보통은 [('MODULE0', None)] (ECC 는 설정 파일의 repairmode), compare_repairmodes 실행은
+    같은 결함 트레이스로 평가한 모듈마다 ('MODULE0-SECDED', 'SECDED') 처럼 한 항목씩
+    """
+    modules = []
+    for stats in block:
+        name = stats['name']
+        if name == 'MODULE0':
+            modules.append((name, None))
+        elif name.startswith('MODULE0-') and '.' not in name:
+            tag = name[len('MODULE0-'):]
+            repairmode = REPAIRMODE_TAGS.get(tag)
+            modules.append((name, DIMM_ECC_NAMES[repairmode] if repairmode is not None else tag))
+    return modules
+
+def summarize_module(block, name='MODULE0'):
+    """
+    printStats 블록의 모듈 통계(기본 MODULE0)에서 CE, UE, SDC, 총 Error 수를 계산
+    """
+    # MODULE0 전체 통계 라인 찾기
+    # 예: [MODULE0] sims 1000000 failed_sims 112090 rate_raw 0.11209 FIT_raw 1827.95 rate_uncorr 0.000747 FIT_uncorr 12.182 rate_undet 1.6e-05 FIT_undet 0.260926
+    module = None
+    for stats in block:
+        if stats['name'] == name:
+            module = stats
 
-def parse_log_file(log_file_path):
+    if module is None:
+        return None
+
+    if 'importance' in module:
+        return summarize_importance(module['importance'])
+
+    sims = module['sims']
+    failed_sims = module['failed_sims']
+    rate_uncorr = module['rate_uncorr']
+    rate_undet = module['rate_undet']
+
+    # 계산
+    # Total = failed_sims
+    # uncorr_sims: uncorrectable error 시행 수 (전체 UE)
+    # undet_sims: undetected error 시행 수 (SDC, UE의 부분집합)
+    # 
+    # 서로 배타적인 분류:
+    # CE (Correctable Errors) = failed_sims - (전체 UE)
+    # DUE (Detected Uncorrectable Error) = (전체 UE) - SDC
+    # SDC (Silent Data Corruption) = undetected errors
+    total = failed_sims
+    if 'uncorr_sims' in module:
+        total_ue = module['uncorr_sims']
+        sdc = module['undet_sims']
+    else:
+        # 정확한 개수가 없는 이전 형식의 로그: 유효숫자 6자리 비율에서 가장 가까운 정수로 복원
+        total_ue = round(sims * rate_uncorr)
+        sdc = round(sims * rate_undet)
+    due = total_ue - sdc  # Detected Uncorrectable Error
+    ce = total - total_ue
+    ue_sdc = due + sdc  # UE + SDC (critical errors causing system failure)
+    critical_error_rate = ue_sdc / sims if sims > 0 else 0  # Probability of critical error
+
+    return {
+        'sims': sims,
+        'ce': ce,
+        'ue': due,  # DUE (감지된 수정 불가 에러)
+        'sdc': sdc,
+        'ue_sdc': ue_sdc,
+        'critical_error_rate': critical_error_rate,
+        'critical_error_rate_var': importance_estimate(ue_sdc, ue_sdc, sims)[1],
+        'total': total,
+        'weighted': False
+    }
+
+def importance_estimate(sum_wy, sum_wy2, sims):
+    """
+    가중 지시변수 합으로부터 확률 추정값과 그 추정값의 분산 (Simulation.cpp 의 importanceEstimate)
+    가중치가 모두 1 이면 일반 이항 추정 p, p(1-p)/(n-1) 과 같다
+    """
+    mean = sum_wy / sims if sims else 0.0
+    var = (sum_wy2 / sims - mean * mean) / (sims - 1) if sims > 1 else 0.0
+    return mean, max(var, 0.0)
+
+def summarize_importance(importance):
+    """
+    중요도 샘플링 실행의 가중(우도비) 통계에서 CE, UE, SDC, 총 Error 수를 계산
+    개수는 sims 번 시행에서의 기댓값(실수)이며, 비율은 우도비 가중 불편 추정값
+    """
+    sims = importance['sims']
+    rate_raw = importance_estimate(importance['sum_wy_raw'], importance['sum_wy2_raw'], sims)[0]
+    rate_uncorr, var_uncorr = importance_estimate(importance['sum_wy_uncorr'], importance['sum_wy2_uncorr'], sims)
+    rate_undet = importance_estimate(importance['sum_wy_undet'], importance['sum_wy2_undet'], sims)[0]
+
+    return {
+        'sims': sims,
+        'ce': sims * (rate_raw - rate_uncorr),
+        'ue': sims * (rate_uncorr - rate_undet),
+        'sdc': sims * rate_undet,
+        'ue_sdc': sims * rate_uncorr,
+        'critical_error_rate': rate_uncorr,
+        'critical_error_rate_var': var_uncorr,
+        'total': sims * rate_raw,
+        'weighted': True
+    }
+
+def parse_log_file(log_file_path, cache=None):
     """
     로그 파일의 마지막 부분에서 failed_sims, sims, rate_uncorr, rate_undet를 파싱하여
     CE, UE, SDC, 총 Error 수를 계산
+    cache 가 주어지면 (open_stats_cache) 바뀌지 않은 로그는 다시 파싱하지 않는다
     """
     try:
-        with open(log_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # MODULE0 전체 통계 라인 찾기
-        # 예: [MODULE0] sims 1000000 failed_sims 112090 rate_raw 0.11209 FIT_raw 1827.95 rate_uncorr 0.000747 FIT_uncorr 12.182 rate_undet 1.6e-05 FIT_undet 0.260926
-        module_pattern = r'\[MODULE0\]\s+sims\s+(\d+)\s+failed_sims\s+(\d+)\s+rate_raw\s+[\d\.e\-+]+\s+FIT_raw\s+[\d\.e\-+]+\s+rate_uncorr\s+([\d\.e\-+]+)\s+FIT_uncorr\s+[\d\.e\-+]+\s+rate_undet\s+([\d\.e\-+]+)'
-        match = re.search(module_pattern, content)
-        
-        if not match:
-            return None
-            
-        sims = int(match.group(1))
-        failed_sims = int(match.group(2))
-        rate_uncorr = float(match.group(3))
-        rate_undet = float(match.group(4))
-        
-        # 계산
-        # Total = failed_sims
-        # rate_uncorr: uncorrectable error rate (전체 UE)
-        # rate_undet: undetected error rate (SDC, UE의 부분집합)
-        # 
-        # 서로 배타적인 분류:
-        # CE (Correctable Errors) = failed_sims - (전체 UE)
-        # DUE (Detected Uncorrectable Error) = (전체 UE) - SDC
-        # SDC (Silent Data Corruption) = undetected errors
-        total = failed_sims
-        total_ue = int(sims * rate_uncorr)
-        sdc = int(sims * rate_undet)
-        due = total_ue - sdc  # Detected Uncorrectable Error
-        ce = total - total_ue
-        ue_sdc = due + sdc  # UE + SDC (critical errors causing system failure)
-        critical_error_rate = ue_sdc / sims if sims > 0 else 0  # Probability of critical error
-        
-        return {
-            'ce': ce,
-            'ue': due,  # DUE (감지된 수정 불가 에러)
-            'sdc': sdc,
-            'ue_sdc': ue_sdc,
-            'critical_error_rate': critical_error_rate,
-            'total': total
-        }
-        
+        if cache is not None:
+            block = cached_log_entry(cache, log_file_path)['block']
+        else:
+            block = read_stats_block(log_file_path)
+        return summarize_module(block)
+
+    except Exception as e:
+        print(f"Error parsing {log_file_path}: {e}")
+        return None
+
+def parse_log_modules(log_file_path, cache=None):
+    """
+    parse_log_file 의 모듈별 버전: [(ECC 이름 또는 None, 통계), ...]
+    compare_repairmodes 로그는 평가한 ECC 종류마다 한 항목 (module_ecc_types 참고)
+    """
+    try:
+        if cache is not None:
+            block = cached_log_entry(cache, log_file_path)['block']
+        else:
+            block = read_stats_block(log_file_path)
+        return [(ecc_type, summarize_module(block, name)) for name, ecc_type in module_ecc_types(block)]
+
     except Exception as e:
         print(f"Error parsing {log_file_path}: {e}")
+        return []
+
+def read_config(config_path):
+    """
+    .ini 설정 파일을 키 대소문자를 유지한 채로 읽기
+    """
+    config = configparser.ConfigParser()
+    config.optionxform = str
+    config.read(config_path)
+    return config
+
+def resolve_config_path(config_path, log_file_path):
+    """
+    로그에 기록된 설정 경로는 faultsim 을 실행한 디렉토리 기준이므로
+    현재 디렉토리, 로그 디렉토리와 그 상위, 이 스크립트 디렉토리 순서로 찾아본다
+    """
+    if os.path.isabs(config_path):
+        return config_path if os.path.isfile(config_path) else None
+
+    log_dir = os.path.dirname(os.path.abspath(log_file_path))
+    for base in (os.getcwd(), log_dir, os.path.dirname(log_dir),
+                 os.path.dirname(os.path.abspath(__file__))):
+        candidate = os.path.normpath(os.path.join(base, config_path))
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+def format_capacity(capacity_gb):
+    """
+    GB 단위 용량을 CSV/그래프에서 쓰는 문자열로 변환 (예: 16.0 -> '16GB')
+    """
+    return f"{capacity_gb:g}GB"
+
+def format_duration(max_s):
+    """
+    [Sim] max_s 를 결과 묶음 이름에 쓰는 기간 문자열로 변환 (예: 220752000 -> '7Years')
+    """
+    year_s = 365 * 24 * 3600
+    if max_s % year_s == 0:
+        return f"{max_s // year_s}Years"
+    if max_s % 3600 == 0:
+        return f"{max_s // 3600}Hours"
+    return f"{max_s}s"
+
+def ddr_generation_from_path(config_path):
+    """
+    설정 파일 경로에서 DDR 세대 추출 (configs/DDR5/... -> 'DDR5', configs/NoDDR5/... -> 'non-DDR5')
+    """
+    match = re.search(r'(no)?(ddr\d+)', config_path.lower())
+    if not match:
+        return 'unknown'
+    generation = match.group(2).upper()
+    return f"non-{generation}" if match.group(1) else generation
+
+def capacity_from_path(config_path):
+    """
+    설정 파일 이름의 용량 표기를 GB 로 읽기 (DIMM_ChipKill_16gb.ini -> 16.0, 표기가 없으면 None)
+    """
+    match = CAPACITY_NAME_PATTERN.search(os.path.basename(config_path))
+    return float(match.group(1)) if match else None
+
+def classify_config(config_path):
+    """
+    설정 파일에서 ECC 종류, 용량, DDR 세대, 시뮬레이션 기간을 읽어 분류 정보를 만든다
+    용량은 기존 결과 CSV 와 같도록 파일 이름의 표기를 먼저 쓰고, 표기가 없을 때만 [Org] 구성에서 계산한다
+    """
+    config = read_config(config_path)
+    if not config.has_section('Org') or not config.has_section('Sim'):
         return None
 
+    organization = config.getint('Org', 'organization')
+    repairmode = config.getint('ECC', 'repairmode', fallback=0)
+    ecc_names = DIMM_ECC_NAMES if organization == 0 else CUBE_ECC_NAMES
+
+    # DIMM 은 9개 칩 중 1개가 ECC 칩 (x4 18칩 = 데이터 16칩)
+    chips = config.getint('Org', 'chips_per_rank')
+    data_chips = chips - chips // 9 if organization == 0 else chips
+    chip_bits = (config.getint('Org', 'ranks') * config.getint('Org', 'banks') *
+                 config.getint('Org', 'rows') * config.getint('Org', 'cols') *
+                 config.getint('Org', 'chip_bus_bits'))
+    geometry_gb = chip_bits * data_chips / 8 / (1 << 30)
+    capacity_gb = capacity_from_path(config_path)
+    if capacity_gb is None:
+        capacity_gb = geometry_gb
+    elif capacity_gb != geometry_gb:
+        print(f"경고: {config_path}: 파일 이름의 용량 {format_capacity(capacity_gb)} 이 "
+              f"[Org] 구성의 {format_capacity(geometry_gb)} 과 다릅니다 (파일 이름 기준으로 분류)", file=sys.stderr)
+
+    ddr_generation = ddr_generation_from_path(config_path)
+    max_s = config.getint('Sim', 'max_s')
+    duration = format_duration(max_s)
+
+    return {
+        'config': config_path,
+        'organization': ORGANIZATION_NAMES.get(organization, str(organization)),
+        'ecc_type': ecc_names.get(repairmode, f"repairmode{repairmode}"),
+        'capacity': format_capacity(capacity_gb),
+        'capacity_gb': capacity_gb,
+        'ddr_generation': ddr_generation,
+        'duration': duration,
+        'duration_s': max_s,
+        'n_sims': config.getint('Sim', 'n_sims'),
+        'family': f"{ddr_generation}_{duration}",
+    }
+
+def classify_log(log_file_path, config_line):
+    """
+    로그를 실행에 사용한 설정 파일로 분류
+    설정 파일을 찾을 수 없으면 파일명(dimm_<ecc>_<용량>_log.txt)으로 대신 분류
+    """
+    if config_line:
+        config_path = resolve_config_path(config_line, log_file_path)
+        if config_path is not None:
+            info = classify_config(config_path)
+            if info is not None:
+                return info
+
+    ecc_type, capacity = extract_config_info_from_filename(os.path.basename(log_file_path))
+    if not ecc_type:
+        return None
+    capacity_gb = float(capacity.replace('GB', ''))
+    return {
+        'config': config_line,
+        'organization': 'DIMM',
+        'ecc_type': ecc_type,
+        'capacity': capacity,
+        'capacity_gb': capacity_gb,
+        'ddr_generation': 'unknown',
+        'duration': 'unknown',
+        'duration_s': None,
+        'n_sims': None,
+        'family': 'unknown',
+    }
+
+def find_log_files(results_dir):
+    """
+    results 디렉토리를 한 번 훑어 모든 *_log.txt 찾기 (하위 디렉토리 포함, 샤드 중간 결과는 제외)
+    """
+    log_files = []
+    for dirpath, dirnames, filenames in os.walk(results_dir):
+        dirnames[:] = sorted(d for d in dirnames if d != 'shards')
+        for filename in sorted(filenames):
+            if filename.endswith('_log.txt'):
+                log_files.append(os.path.join(dirpath, filename))
+    return log_files
+
+def collect_results(results_dir, jobs=None, verbose=False):
+    """
+    results 디렉토리의 모든 로그를 분류하고 파싱
+    캐시에 없는 로그는 워커 프로세스들이 나누어 파싱한다
+    반환값: 로그(compare_repairmodes 로그는 ECC 종류)별 결과 딕셔너리 리스트 (분류 정보 + CE/UE/SDC/Total)
+    """
+    log_files = find_log_files(results_dir)
+    if not log_files:
+        return []
+
+    # 이전 실행에서 파싱한 결과 캐시 (새로 생기거나 바뀐 로그만 다시 파싱)
+    cache = open_stats_cache(os.path.join(results_dir, STATS_CACHE_NAME))
+    prune_stats_cache(cache, log_files)
+
+    entries = {}
+    misses = []
+    for log_file in log_files:
+        entry, key = lookup_stats_cache(cache, log_file)
+        if entry is None:
+            misses.append((log_file, key))
+        else:
+            entries[log_file] = entry
+
+    if misses:
+        if verbose:
+            print(f"{len(misses)}개 로그 파싱 중 (캐시 {len(entries)}개 재사용)...")
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parsed = pool.map(parse_log_entry, [log_file for log_file, _ in misses])
+            for (log_file, key), entry in zip(misses, parsed):
+                store_stats_cache(cache, key, entry)
+                entries[log_file] = entry
+    cache.close()
+
+    results = []
+    for log_file in log_files:
+        filename = os.path.relpath(log_file, results_dir)
+        entry = entries[log_file]
+
+        info = classify_log(log_file, entry['config'])
+        if info is None:
+            if verbose:
+                print(f"  - 설정 파일과 파일명 형식을 모두 인식할 수 없습니다: {filename}")
+            continue
+
+        modules = module_ecc_types(entry['block'])
+        if not modules:
+            if verbose:
+                print(f"  - MODULE0 통계를 찾을 수 없습니다: {filename}")
+            continue
+
+        # compare_repairmodes 로그는 ECC 종류마다 한 행
+        for name, ecc_type in modules:
+            stats = summarize_module(entry['block'], name)
+            result = {'log': filename}
+            result.update(info)
+            if ecc_type is not None:
+                result['ecc_type'] = ecc_type
+            result.update(stats)
+            results.append(result)
+            if verbose:
+                print(f"  - {filename}: {info['family']}, {result['ecc_type']}, {info['capacity']}")
+
+    return results
+
+def load_results(results_dir, jobs=None):
+    """
+    collect_results 결과를 한 행이 로그 하나(compare_repairmodes 로그는 ECC 종류 하나)인 DataFrame 으로 반환
+    열: log, config, organization, ecc_type, capacity, capacity_gb, ddr_generation, duration,
+        duration_s, n_sims, family, sims, ce, ue, sdc, ue_sdc, critical_error_rate, total
+    """
+    # pandas 는 DataFrame 이 필요할 때만 사용 (run_sweep.py 등은 pandas 없이 이 모듈을 import)
+    import pandas as pd
+    return pd.DataFrame(collect_results(results_dir, jobs))
+
 def extract_config_info_from_filename(filename):
     """
     파일명에서 ECC 타입과 용량 정보를 추출
@@ -84,54 +715,24 @@ def extract_config_info_from_filename(filename):
     
     return ecc_type, capacity
 
-def main():
+def format_count(value):
     """
-    메인 함수: results 디렉토리의 모든 로그 파일을 파싱하고 결과 출력
+    개수 열 형식: 정수는 그대로, 중요도 샘플링의 기댓값(실수)은 유효숫자 6자리
+    """
+    return str(value) if isinstance(value, int) else f"{value:.6g}"
+
+def format_csv_row(result):
+    """
+    결과 딕셔너리 하나를 CSV 한 줄로 변환
+    """
+    ce, ue, sdc, ue_sdc, total = (format_count(result[key]) for key in ('ce', 'ue', 'sdc', 'ue_sdc', 'total'))
+    return (f"{result['ecc_type']},{result['capacity']},{ce},{ue},{sdc},"
+            f"{ue_sdc},{result['critical_error_rate']:.10f},{total}\n")
+
+def print_summary(results):
+    """
+    결과 묶음 하나(같은 DDR 세대/기간)의 표와 ECC 타입별 요약 출력
     """
-    results_dir = "/home/hamoci/Study/FaultSim-A-Memory-Reliability-Simulator/results"
-    
-    # 모든 로그 파일 찾기
-    log_files = glob.glob(os.path.join(results_dir, "*_log.txt"))
-    
-    if not log_files:
-        print("로그 파일을 찾을 수 없습니다.")
-        return
-    
-    # 결과 저장할 리스트
-    results = []
-    
-    print("로그 파일 파싱 중...")
-    for log_file in sorted(log_files):
-        filename = os.path.basename(log_file)
-        print(f"처리 중: {filename}")
-        
-        # 파일명에서 정보 추출
-        ecc_type, capacity = extract_config_info_from_filename(filename)
-        
-        if not ecc_type or not capacity:
-            print(f"  - 파일명 형식을 인식할 수 없습니다: {filename}")
-            continue
-            
-        # 로그 파일 파싱
-        stats = parse_log_file(log_file)
-        
-        if stats is None:
-            print(f"  - MODULE0 통계를 찾을 수 없습니다: {filename}")
-            continue
-            
-        results.append({
-            'ecc_type': ecc_type,
-            'capacity': capacity,
-            'ce': stats['ce'],
-            'ue': stats['ue'], 
-            'sdc': stats['sdc'],
-            'ue_sdc': stats['ue_sdc'],
-            'critical_error_rate': stats['critical_error_rate'],
-            'total': stats['total']
-        })
-        
-        print(f"  - 파싱 완료: {ecc_type}, {capacity}")
-    
     # 결과 출력
     print("\n" + "="*100)
     print("FaultSim 에러 통계 결과")
@@ -156,8 +757,8 @@ def main():
     
     for result in results:
         print(f"{result['ecc_type']:<12} {result['capacity']:<8} "
-              f"{result['ce']:<8} {result['ue']:<8} {result['sdc']:<8} "
-              f"{result['ue_sdc']:<8} {result['critical_error_rate']:<12.6e} {result['total']:<10}")
+              f"{format_count(result['ce']):<8} {format_count(result['ue']):<8} {format_count(result['sdc']):<8} "
+              f"{format_count(result['ue_sdc']):<8} {result['critical_error_rate']:<12.6e} {format_count(result['total']):<10}")
     
     # ECC 타입별 평균 비율 계산 및 출력
     print("\n" + "="*80)
@@ -206,30 +807,66 @@ def main():
                 if base_total is None:
                     base_total = total
                     base_capacity = capacity_gb
-                    print(f"  {capacity_str:>8}: {total:>8} errors (baseline)")
+                    print(f"  {capacity_str:>8}: {format_count(total):>8} errors (baseline)")
                 else:
                     increase_ratio = total / base_total
                     capacity_ratio = capacity_gb / base_capacity
-                    print(f"  {capacity_str:>8}: {total:>8} errors (×{increase_ratio:.2f}, 용량 ×{capacity_ratio:.2f})")
-    
-    print("\n파싱 완료! 총 {} 개의 로그 파일을 처리했습니다.".format(len(results)))
-    
-    # CSV 파일로도 저장
-    csv_filename = "faultsim_error_statistics.csv"
+                    print(f"  {capacity_str:>8}: {format_count(total):>8} errors (×{increase_ratio:.2f}, 용량 ×{capacity_ratio:.2f})")
+
+def write_csv(results, csv_filename):
+    """
+    결과 묶음 하나를 faultsim_error_statistics*.csv 형식으로 저장
+    """
     try:
         with open(csv_filename, 'w', encoding='utf-8') as f:
             # 헤더 작성
-            f.write("ECC Type,Capacity,CE,UE,SDC,UE+SDC,Critical Error Rate,Total\n")
+            f.write(CSV_HEADER)
             
             # 데이터 작성
             for result in results:
-                f.write(f"{result['ecc_type']},{result['capacity']},{result['ce']},{result['ue']},{result['sdc']},"
-                       f"{result['ue_sdc']},{result['critical_error_rate']:.10f},{result['total']}\n")
+                f.write(format_csv_row(result))
         
         print(f"\nCSV 파일로도 저장했습니다: {csv_filename}")
         
     except Exception as e:
         print(f"CSV 파일 저장 중 오류 발생: {e}")
 
+def main():
+    """
+    메인 함수: results 디렉토리의 모든 로그 파일을 파싱하고 결과 출력
+    """
+    parser = argparse.ArgumentParser(description="Parse FaultSim logs into per-family error statistics")
+    parser.add_argument('results_dir', nargs='?', default='./results', help="directory searched recursively for *_log.txt")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="number of parser processes (default: CPU count)")
+    parser.add_argument('--csv', default='faultsim_error_statistics.csv',
+                        help="output CSV; with several families the family name is appended to the file name")
+    args = parser.parse_args()
+
+    print("로그 파일 파싱 중...")
+    results = collect_results(args.results_dir, args.jobs, verbose=True)
+
+    if not results:
+        print("로그 파일을 찾을 수 없습니다.")
+        return 1
+
+    # DDR 세대/기간이 같은 결과끼리 묶어서 출력 (서로 다른 묶음은 같은 용량/ECC 가 겹친다)
+    families = {}
+    for result in results:
+        families.setdefault(result['family'], []).append(result)
+
+    for family, family_results in sorted(families.items()):
+        print("\n" + "#"*100)
+        print(f"# {family}")
+        print_summary(family_results)
+
+        csv_filename = args.csv
+        if len(families) > 1:
+            stem, ext = os.path.splitext(args.csv)
+            csv_filename = f"{stem}_{family.lower()}{ext}"
+        write_csv(family_results, csv_filename)
+
+    print("\n파싱 완료! 총 {} 개의 결과를 처리했습니다.".format(len(results)))
+    return 0
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+FaultSim 프로파일 리포트
+faultsim --profile (또는 run_sweep.py --profile) 이 남긴 *_profile.json 파일을 모아
+설정별로 시행당 시간, 구간(reset/generate/queue/repair/scrub/fill_repl/single_fault)별 비중,
+시행당 intersects 호출 수와 결함 수, 범위 병합(coalesce_ranges)으로 빠진 fault range 수,
+시행 중 동시에 살아 있던 fault range 수의 분포를 보여줍니다.
+샤드(<name>_shardN_profile.json)는 합쳐서 한 설정으로 봅니다.
+
+예: python3 profile_report.py ./results --csv profile.csv
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+
+from parse_error_stats import PROFILE_FILE_SUFFIX
+
+SHARD_PATTERN = re.compile(r'_shard\d+$')
+# Profile.hh 의 구간 순서
+PHASES = ['reset', 'generate', 'queue', 'repair', 'scrub', 'fill_repl', 'single_fault']
+SUMMED_KEYS = ['sims', 'wall_s', 'intersects', 'ranges_absorbed', 'peak_ranges_sum']
+
+def find_profile_files(results_dir):
+    """
+    결과 디렉토리(하위 디렉토리 포함, 샤드 포함)의 프로파일 파일 목록
+    """
+    profile_files = []
+    for root, _, files in os.walk(results_dir):
+        for file in files:
+            if file.endswith(PROFILE_FILE_SUFFIX):
+                profile_files.append(os.path.join(root, file))
+    return sorted(profile_files)
+
+def read_profile(profile_path):
+    """
+    프로파일 파일 하나 읽기 (writeProfile 이 쓰는 한 줄 JSON)
+    """
+    try:
+        with open(profile_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"프로파일을 읽을 수 없습니다: {profile_path} ({e})", file=sys.stderr)
+        return None
+
+def merge_profiles(profiles):
+    """
+    같은 설정의 샤드 프로파일을 합산 (peak_ranges_max 는 최대값, 나머지 카운터와 시간은 합)
+    """
+    merged = {'config': profiles[0]['config'], 'sim_mode': profiles[0]['sim_mode'], 'shards': len(profiles)}
+    for key in SUMMED_KEYS:
+        merged[key] = sum(profile.get(key, 0) for profile in profiles)
+    merged['phases'] = {phase: {'s': sum(profile['phases'][phase]['s'] for profile in profiles),
+                                'calls': sum(profile['phases'][phase]['calls'] for profile in profiles)}
+                        for phase in PHASES}
+    for key in ('faults_transient', 'faults_permanent', 'peak_ranges_hist'):
+        merged[key] = [sum(values) for values in zip(*(profile[key] for profile in profiles))]
+    merged['peak_ranges_max'] = max(profile['peak_ranges_max'] for profile in profiles)
+    return merged
+
+def collect_profiles(results_dir):
+    """
+    프로파일 파일을 작업 이름(샤드 번호 제외)별로 묶어 합산한 목록
+    """
+    groups = {}
+    for profile_path in find_profile_files(results_dir):
+        profile = read_profile(profile_path)
+        if profile is None:
+            continue
+        name = SHARD_PATTERN.sub('', os.path.basename(profile_path)[:-len(PROFILE_FILE_SUFFIX)])
+        groups.setdefault(name, []).append(profile)
+    return [(name, merge_profiles(profiles)) for name, profiles in sorted(groups.items())]
+
+def summarize_profile(name, profile):
+    """
+    합산된 프로파일 하나를 리포트 행으로 변환
+    구간 비중은 시뮬레이션 루프 전체 시간 대비 %, 나머지(other)는 측정 구간 밖의 시간 (분기 판정, 통계 집계 등)
+    """
+    sims = profile['sims']
+    wall_s = profile['wall_s']
+    row = {'job': name, 'config': profile['config'], 'sim_mode': profile['sim_mode'], 'shards': profile['shards'],
+           'sims': sims, 'wall_s': wall_s, 'us_per_sim': 1e6 * wall_s / sims if sims else 0.0}
+
+    phase_total = 0.0
+    for phase in PHASES:
+        seconds = profile['phases'][phase]['s']
+        phase_total += seconds
+        row[phase + '_pct'] = 100.0 * seconds / wall_s if wall_s else 0.0
+    row['other_pct'] = max(0.0, 100.0 - 100.0 * phase_total / wall_s) if wall_s else 0.0
+
+    row['intersects_per_sim'] = profile['intersects'] / sims if sims else 0.0
+    row['absorbed_per_sim'] = profile['ranges_absorbed'] / sims if sims else 0.0
+    row['faults_per_sim'] = (sum(profile['faults_transient']) + sum(profile['faults_permanent'])) / sims if sims else 0.0
+    row['peak_ranges_mean'] = profile['peak_ranges_sum'] / sims if sims else 0.0
+    row['peak_ranges_max'] = profile['peak_ranges_max']
+    return row
+
+def peak_bucket_label(bucket):
+    """
+    peak_ranges_hist 버킷 이름 (0, 1, 2-3, 4-7, ...)
+    """
+    if bucket <= 1:
+        return str(bucket)
+    return f"{1 << (bucket - 1)}-{(1 << bucket) - 1}"
+
+def format_table(rows):
+    """
+    설정별 리포트 표 (시간이 많이 드는 설정부터)
+    """
+    lines = [f"{'JOB':<32} {'SIMS':>10} {'WALL_S':>9} {'US/SIM':>9} "
+             + " ".join(f"{phase[:9].upper():>9}" for phase in PHASES + ['other'])
+             + f" {'ISECT/SIM':>10} {'FLT/SIM':>8} {'ABS/SIM':>8} {'PEAK':>6} {'MAX':>5}"]
+    for row in sorted(rows, key=lambda row: row['wall_s'], reverse=True):
+        lines.append(f"{row['job']:<32} {row['sims']:>10} {row['wall_s']:>9.3f} {row['us_per_sim']:>9.2f} "
+                     + " ".join(f"{row[phase + '_pct']:>8.1f}%" for phase in PHASES + ['other'])
+                     + f" {row['intersects_per_sim']:>10.1f} {row['faults_per_sim']:>8.3f} {row['absorbed_per_sim']:>8.3f}"
+                     f" {row['peak_ranges_mean']:>6.2f} {row['peak_ranges_max']:>5}")
+    return "\n".join(lines) + "\n"
+
+def format_peak_histograms(merged):
+    """
+    설정별 시행당 최대 live fault range 수 분포 (0 이 아닌 버킷만)
+    """
+    lines = []
+    for name, profile in merged:
+        buckets = [f"{peak_bucket_label(bucket)}:{count}" for bucket, count in enumerate(profile['peak_ranges_hist']) if count]
+        lines.append(f"{name:<32} " + " ".join(buckets))
+    return "\n".join(lines) + "\n"
+
+def write_csv(csv_path, rows):
+    """
+    리포트 행을 CSV 로 저장
+    """
+    columns = list(rows[0].keys())
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write(",".join(columns) + "\n")
+        for row in rows:
+            f.write(",".join(f"{row[column]:.6g}" if isinstance(row[column], float) else str(row[column])
+                             for column in columns) + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Break down FaultSim run time per config from *_profile.json files")
+    parser.add_argument('results_dir', nargs='?', default='./results', help="directory searched for *_profile.json")
+    parser.add_argument('--csv', default=None, help="also write the per-config breakdown to this CSV file")
+    parser.add_argument('--peaks', action='store_true',
+                        help="also print the distribution of per-trial peak live fault ranges")
+    args = parser.parse_args()
+
+    merged = collect_profiles(args.results_dir)
+    if not merged:
+        print(f"프로파일 파일이 없습니다: {args.results_dir}")
+        return 1
+
+    rows = [summarize_profile(name, profile) for name, profile in merged]
+    sys.stdout.write(format_table(rows))
+    if args.peaks:
+        sys.stdout.write("\n" + format_peak_histograms(merged))
+    if args.csv:
+        write_csv(args.csv, rows)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
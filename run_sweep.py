@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+FaultSim 스윕 실행 스크립트
+run_sim.sh / run_sim_DDR5.sh 를 대체: 설정 파일(.ini) 글롭을 받아 코어 수만큼의
+워커로 faultsim 을 나누어 실행하고, 작업이 끝날 때마다 결과를 CSV 에 추가합니다.
+
+예: python3 run_sweep.py "configs/DDR5/*.ini" --results-dir ./results
+    python3 run_sweep.py configs/NoDDR5/_100M_24Hours/DIMM_ChipKill.ini --shards 16
+    (--shards: 설정 하나의 n_sims 를 K개로 나누어 병렬 실행한 뒤 결과를 하나로 병합)
+"""
+
+import os
+import re
+import sys
+import glob
+import time
+import random
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from parse_error_stats import (CSV_HEADER, STATS_CACHE_NAME, parse_log_modules, open_stats_cache,
+                               classify_config, format_csv_row, read_config, stats_path_for_log,
+                               status_path_for_log, profile_path_for_log)
+from merge_shards import write_shard_configs, merge_logs, merge_histograms, domain_histogram_path
+
+def job_name_from_config(config_path):
+    """
+    설정 파일명에서 결과 파일 접두어를 만든다 (run_sim_DDR5.sh 와 같은 규칙)
+    예: DIMM_SECDED_DDR5_8GB.ini -> dimm_secded_8gb
+    """
+    stem = os.path.splitext(os.path.basename(config_path))[0].lower()
+    return re.sub(r'_ddr\d+', '', stem)
+
+def job_dirs(configs, results_dir):
+    """
+    설정마다 결과를 쓸 디렉토리
+    결과 이름이 겹치는 설정(예: configs/NoDDR5/1M_7Years/DIMM_ChipKill.ini 와 _1M_24Hours/DIMM_ChipKill.ini)은
+    동시에 같은 로그/히스토그램을 덮어쓰지 않도록 results_dir 아래 설정 디렉토리 이름(구분될 때까지 상위로)에 둔다
+    """
+    by_name = {}
+    for config in configs:
+        by_name.setdefault(job_name_from_config(config), []).append(config)
+
+    dirs = {}
+    for name, same in by_name.items():
+        if len(same) == 1:
+            dirs[same[0]] = results_dir
+            continue
+        parts = [os.path.normpath(os.path.dirname(os.path.abspath(config))).split(os.sep) for config in same]
+        depth = 1
+        while len({tuple(part[-depth:]) for part in parts}) < len(same):
+            depth += 1
+        for config, part in zip(same, parts):
+            dirs[config] = os.path.join(results_dir, *part[-depth:])
+    return dirs
+
+def plan_jobs(config_path, results_dir, n_shards, seed, hist_ext):
+    """
+    설정 하나를 실행 단위로 나눈다
+    n_shards > 1 이면 results_dir/shards 아래에 하위 설정을 만들고 샤드별 로그/히스토그램 경로를 배정
+    반환값: (결과 이름, [(설정, 로그, 히스토그램), ...])
+    """
+    name = job_name_from_config(config_path)
+    if n_shards <= 1:
+        return name, [(config_path,
+                       os.path.join(results_dir, f"{name}_log.txt"),
+                       os.path.join(results_dir, f"{name}_results{hist_ext}"))]
+
+    # 시드가 없으면 샤드끼리 시각 기반 시드가 겹치지 않도록 하나를 정해서 기록
+    if seed is None:
+        seed = read_config(config_path).getint('Sim', 'seed', fallback=0)
+    shard_dir = os.path.join(results_dir, "shards")
+    if seed == 0:
+        # 체크포인트가 남은 이전 샤드 실행이 있으면 그때의 seed 를 이어서 사용
+        previous = os.path.join(shard_dir, f"{name}_shard0.ini")
+        if os.path.exists(previous) and glob.glob(os.path.join(shard_dir, f"{name}_shard*_results*.ckpt")):
+            seed = read_config(previous).getint('Sim', 'seed', fallback=0)
+    if seed == 0:
+        seed = random.SystemRandom().randrange(1, 2**63)
+        print(f"{name}: seed {seed} 로 샤드 실행")
+
+    shard_configs = write_shard_configs(config_path, n_shards, shard_dir, name, seed)
+    return name, [(shard_config,
+                   os.path.join(shard_dir, f"{name}_shard{shard}_log.txt"),
+                   os.path.join(shard_dir, f"{name}_shard{shard}_results{hist_ext}"))
+                  for shard, shard_config in enumerate(shard_configs)]
+
+def run_job(binary, config_path, log_path, out_path, retries, seed, hist_format, checkpoint_s, ci_target, is_boost,
+            progress_s, profile):
+    """
+    faultsim 한 번 실행 (실패 시 retries 횟수만큼 재시도)
+    stdout 은 log_path, 히스토그램은 out_path, 정확한 개수의 통계는 log_path 옆의 NDJSON 통계 파일로 저장
+    progress_s 초마다 진행 상황을 log_path 옆의 상태 파일에 기록 (monitor_sweep.py 로 확인, 0 이면 끔)
+    profile 이면 구간별 시간/카운터를 log_path 옆의 프로파일 파일에 기록 (profile_report.py 로 확인)
+    이전 실행이 남긴 체크포인트(out_path.ckpt)가 있으면 처음부터 다시 하지 않고 이어서 실행
+    """
+    stats_path = stats_path_for_log(log_path)
+    cmd = [binary, "--configfile", config_path, "--outfile", out_path, "--statsfile", stats_path]
+    if seed is not None:
+        cmd += ["--seed", str(seed)]
+    if hist_format is not None:
+        cmd += ["--outformat", hist_format]
+    if checkpoint_s is not None:
+        cmd += ["--checkpoint", str(checkpoint_s)]
+    if ci_target is not None:
+        cmd += ["--citarget", str(ci_target)]
+    if is_boost is not None:
+        cmd += ["--isboost", str(is_boost)]
+    if progress_s:
+        cmd += ["--progress", str(progress_s), "--progressfile", status_path_for_log(log_path)]
+    if profile:
+        cmd += ["--profile", profile_path_for_log(log_path)]
+
+    returncode = None
+    attempts = 0
+    resumed = False
+    start = time.time()
+    while attempts <= retries:
+        attempts += 1
+        # 중단된 실행은 로그 뒤에 이어 쓰고 --resume 으로 체크포인트부터 계속
+        resume = os.path.exists(out_path + ".ckpt")
+        resumed = resumed or resume
+        if not resume and os.path.exists(stats_path):
+            # 이전 실행의 통계 파일이 새 로그 대신 읽히지 않도록 삭제
+            os.remove(stats_path)
+        with open(log_path, 'a' if resume else 'w', encoding='utf-8') as log:
+            returncode = subprocess.call(cmd + (["--resume"] if resume else []),
+                                         stdout=log, stderr=subprocess.STDOUT)
+        if returncode == 0:
+            break
+
+    return {
+        'config': config_path,
+        'log': log_path,
+        'hist': out_path,
+        'returncode': returncode,
+        'attempts': attempts,
+        'resumed': resumed,
+        'wall_s': time.time() - start,
+    }
+
+def merge_group(group, results_dir):
+    """
+    샤드로 나뉜 설정의 로그/히스토그램을 results_dir/<name>_log.txt, <name>_results.txt(.bin) 로 병합
+    """
+    name = group['name']
+    log_path = os.path.join(results_dir, f"{name}_log.txt")
+    hist_path = os.path.join(results_dir, f"{name}_results{os.path.splitext(group['done'][0]['hist'])[1]}")
+
+    merged = merge_logs([job['log'] for job in group['done']], log_path, group['config'])
+    # compare_repairmodes 실행은 최상위 모듈(MODULE0-<tag>)마다 히스토그램 파일이 따로 있다
+    modules = [name for name in merged if '.' not in name]
+    if len(modules) > 1:
+        for module in modules:
+            merge_histograms([domain_histogram_path(job['hist'], module) for job in group['done']],
+                             domain_histogram_path(hist_path, module), merged[module]['sims'])
+    else:
+        merge_histograms([job['hist'] for job in group['done']], hist_path, merged['MODULE0']['sims'])
+    return log_path
+
+def collect_results(config_path, log_path, cache):
+    """
+    끝난 작업의 로그를 parse_error_stats 로직으로 파싱하여 CSV 행 분량의 결과 목록을 돌려준다
+    (보통 한 행, compare_repairmodes 설정은 ECC 종류마다 한 행)
+    (분류는 실행한 설정 파일 기준, 파싱 결과는 parse_error_stats 의 캐시에도 기록)
+    """
+    info = classify_config(config_path)
+    if info is None:
+        return []
+
+    results = []
+    for ecc_type, stats in parse_log_modules(log_path, cache):
+        result = dict(info)
+        if ecc_type is not None:
+            result['ecc_type'] = ecc_type
+        result.update(stats)
+        results.append(result)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a FaultSim config sweep on a bounded worker pool")
+    parser.add_argument('configs', nargs='+', help="config file(s) or glob(s), e.g. 'configs/DDR5/*.ini'")
+    parser.add_argument('--binary', default='./faultsim', help="path to the faultsim executable")
+    parser.add_argument('--results-dir', default='./results', help="directory for *_log.txt / *_results.txt")
+    parser.add_argument('--csv', default='faultsim_error_statistics.csv', help="statistics CSV filled in as jobs finish")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="number of concurrent faultsim runs")
+    parser.add_argument('--retries', type=int, default=0, help="re-run a job this many times if it exits non-zero")
+    parser.add_argument('--shards', type=int, default=1, help="split each config's n_sims into this many parallel runs")
+    parser.add_argument('--seed', type=int, default=None, help="base random seed for reproducible runs (default: config [Sim] seed)")
+    parser.add_argument('--checkpoint', type=int, default=None,
+                        help="seconds between faultsim checkpoints (default: config [Sim] checkpoint_s); "
+                             "runs interrupted after a checkpoint are resumed by the next sweep")
+    parser.add_argument('--ci-target', type=float, default=None,
+                        help="stop each run once the CI relative half-width of the tracked rates (config [Sim] ci_rates, "
+                             "default rate_uncorr) reaches this "
+                             "(n_sims becomes an upper bound; default: config [Sim] ci_target)")
+    parser.add_argument('--is-boost', type=float, default=None,
+                        help="importance sampling: fault rate multiplier for event-mode runs (default: config [Sim] is_boost)")
+    parser.add_argument('--progress', type=int, default=10,
+                        help="seconds between progress reports in each job's <name>_status.json, "
+                             "shown by monitor_sweep.py (0 = per-trial characters in the log instead)")
+    parser.add_argument('--profile', action='store_true',
+                        help="write per-phase timers and counters of each job to <name>_profile.json "
+                             "(summarized by profile_report.py)")
+    parser.add_argument('--hist-format', choices=['csv', 'bin'], default=None,
+                        help="failure-time histogram format (default: config [Sim] output_format); bin writes <name>_results.bin")
+    args = parser.parse_args()
+
+    configs = []
+    seen = set()
+    for pattern in args.configs:
+        matched = sorted(glob.glob(pattern))
+        if not matched:
+            print(f"설정 파일을 찾을 수 없습니다: {pattern}")
+        # 글롭이 겹쳐 같은 파일이 두 번 잡히면 한 번만 실행
+        for config in matched:
+            if os.path.realpath(config) not in seen:
+                seen.add(os.path.realpath(config))
+                configs.append(config)
+
+    if not configs:
+        return 1
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    jobs = max(1, args.jobs)
+    print(f"{len(configs)}개 설정을 {jobs}개 워커로 실행합니다.")
+
+    hist_ext = ".bin" if args.hist_format == 'bin' else ".txt"
+    groups = []
+    for config, results_dir in job_dirs(configs, args.results_dir).items():
+        os.makedirs(results_dir, exist_ok=True)
+        name, shard_jobs = plan_jobs(config, results_dir, args.shards, args.seed, hist_ext)
+        groups.append({'name': name, 'config': config, 'jobs': shard_jobs, 'results_dir': results_dir,
+                       'done': [], 'finished': 0, 'failed': False})
+
+    n_failed = 0
+    cache = open_stats_cache(os.path.join(args.results_dir, STATS_CACHE_NAME))
+    with open(args.csv, 'w', encoding='utf-8') as csv_file:
+        csv_file.write(CSV_HEADER)
+        csv_file.flush()
+
+        # 워커는 faultsim 자식 프로세스를 기다리기만 하므로 스레드 풀로 충분하다
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {}
+            for group in groups:
+                for config, log_path, out_path in group['jobs']:
+                    future = pool.submit(run_job, args.binary, config, log_path, out_path, args.retries, args.seed,
+                                         args.hist_format, args.checkpoint, args.ci_target,
+                                         args.is_boost, args.progress, args.profile)
+                    futures[future] = group
+
+            for future in as_completed(futures):
+                group = futures[future]
+                job = future.result()
+                status = "OK" if job['returncode'] == 0 else f"FAILED(exit {job['returncode']})"
+                print(f"[{status}] {group['name']} ({job['config']}) "
+                      f"{job['wall_s']:.1f}s, attempts {job['attempts']}"
+                      + (", resumed from checkpoint" if job['resumed'] else ""))
+
+                group['finished'] += 1
+                if job['returncode'] != 0:
+                    group['failed'] = True
+                else:
+                    group['done'].append(job)
+
+                # 설정 하나의 모든 샤드가 끝났을 때만 결과를 기록
+                if group['finished'] < len(group['jobs']):
+                    continue
+                if group['failed']:
+                    n_failed += 1
+                    continue
+
+                if len(group['jobs']) > 1:
+                    group['done'].sort(key=lambda j: group['jobs'].index((j['config'], j['log'], j['hist'])))
+                    log_path = merge_group(group, group['results_dir'])
+                else:
+                    log_path = job['log']
+
+                results = collect_results(group['config'], log_path, cache)
+                if not results:
+                    print(f"  - MODULE0 통계를 찾을 수 없습니다: {log_path}")
+                    continue
+
+                for result in results:
+                    csv_file.write(format_csv_row(result))
+                csv_file.flush()
+
+    cache.close()
+    print(f"\n스윕 완료: {len(configs) - n_failed}/{len(configs)} 성공, 결과 CSV: {args.csv}")
+    return 1 if n_failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,7 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #define BCHREPAIR_HH_
 
 #include "RepairScheme.hh"
+#include "CodewordCounts.hh"
 
 class BCHRepair : public RepairScheme
 {
@@ -23,6 +24,9 @@ public:
 	BCHRepair( string name, int n_correct,int n_detect, uint64_t deviceBitWidth );
 	uint64_t fill_repl ( FaultDomain *fd );
 	void repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t &n_uncorrectable );
+	bool canRepairSingleFault( void );
+	bool canCoalesceRanges( void );
+	void repairSingleFault( FaultDomain *fd, FaultRange *fr, uint64_t &n_undetectable, uint64_t &n_uncorrectable );
 
 	void printStats( void );
 	void resetStats( void );
@@ -31,6 +35,7 @@ public:
 private:
 	uint64_t m_n_correct, m_n_detect, m_bitwidth;
 	uint64_t counter_prev, counter_now;
+	CodewordCounts m_counts;
 };
 
 
@@ -42,8 +42,8 @@ void BCHRepair_cube::repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t
 	for(it1 =pChips->begin(); it1 !=pChips->end(); it1++)
 	{
 		DRAMDomain *pDRAM1 = dynamic_cast<DRAMDomain*>((*it1));
-		list<FaultRange*> *pRange3 = pDRAM1->getRanges();
-		list<FaultRange*>::iterator itRange3;
+		vector<FaultRange*> *pRange3 = pDRAM1->getRanges();
+		vector<FaultRange*>::iterator itRange3;
 		for(itRange3 = pRange3->begin(); itRange3 !=pRange3->end(); itRange3++)
 		{
 			FaultRange *fr1 =(*itRange3);
@@ -56,9 +56,9 @@ void BCHRepair_cube::repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t
 	for( it0 = pChips->begin(); it0 != pChips->end(); it0++ )
 	{
 		DRAMDomain *pDRAM0 = dynamic_cast<DRAMDomain*>((*it0));
-		list<FaultRange*> *pRange0 = pDRAM0->getRanges();
+		vector<FaultRange*> *pRange0 = pDRAM0->getRanges();
 
-		list<FaultRange*>::iterator itRange0;
+		vector<FaultRange*>::iterator itRange0;
 		for( itRange0 = pRange0->begin(); itRange0 != pRange0->end(); itRange0++ )
 		{
 			FaultRange *frOrg = (*itRange0); // The pointer to the fault location
@@ -82,8 +82,8 @@ void BCHRepair_cube::repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t
 				for(ii=0;ii<loopcount_locations;ii++)
 				{
 					DRAMDomain *pDRAM1 = dynamic_cast<DRAMDomain*>((*it0));
-					list<FaultRange*> *pRange1 = pDRAM1->getRanges();
-					list<FaultRange*>::iterator itRange1;
+					vector<FaultRange*> *pRange1 = pDRAM1->getRanges();
+					vector<FaultRange*>::iterator itRange1;
 					for( itRange1 = pRange1->begin(); itRange1 != pRange1->end(); itRange1++ )
 					{
 						FaultRange *fr1 = (*itRange1);
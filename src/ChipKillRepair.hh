@@ -14,6 +14,7 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #define CHIPKILLREPAIR_HH_
 
 #include "RepairScheme.hh"
+#include "CodewordCounts.hh"
 
 class ChipKillRepair : public RepairScheme
 {
@@ -21,6 +22,9 @@ public:
 	ChipKillRepair( string name, int n_sym_correct, int n_sym_detect );
 
 	void repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t &n_uncorrectable );
+	bool canRepairSingleFault( void );
+	bool canCoalesceRanges( void );
+	void repairSingleFault( FaultDomain *fd, FaultRange *fr, uint64_t &n_undetectable, uint64_t &n_uncorrectable );
 	uint64_t fill_repl ( FaultDomain *fd );
 	void printStats( void );
 	void resetStats( void );
@@ -29,6 +33,7 @@ public:
 private:
 	uint64_t m_n_correct, m_n_detect;
 	uint64_t counter_prev, counter_now;
+	CodewordCounts m_counts;
 };
 
 
@@ -62,8 +62,8 @@ void ChipKillRepair_cube::repair_hc(FaultDomain *fd, uint64_t &n_undetect, uint6
 	for(it1 = pChips->begin(); it1 !=pChips->end(); it1++)
 	{
 		DRAMDomain *pDRAM =dynamic_cast<DRAMDomain*>((*it1));
-		list<FaultRange*> *pRange3 = pDRAM->getRanges();
-		list<FaultRange*>::iterator itRange3;
+		vector<FaultRange*> *pRange3 = pDRAM->getRanges();
+		vector<FaultRange*>::iterator itRange3;
 		for(itRange3 = pRange3->begin(); itRange3 != pRange3->end(); itRange3++)
 		{
 			FaultRange *fr1 = (*itRange3);
@@ -75,11 +75,11 @@ void ChipKillRepair_cube::repair_hc(FaultDomain *fd, uint64_t &n_undetect, uint6
 	for( it0 = pChips->begin(); it0 != pChips->end(); it0++ )
 	{
 		DRAMDomain *pDRAM0 = dynamic_cast<DRAMDomain*>((*it0));
-		list<FaultRange*> *pRange0 = pDRAM0->getRanges();
+		vector<FaultRange*> *pRange0 = pDRAM0->getRanges();
 
 		// For each fault in first chip, query the second chip to see if it has
 		// an intersecting fault range.
-		list<FaultRange*>::iterator itRange0;
+		vector<FaultRange*>::iterator itRange0;
 		for( itRange0 = pRange0->begin(); itRange0 != pRange0->end(); itRange0++ )
 		{
 			// Make a copy, otherwise fault is modified as a side-effect
@@ -106,10 +106,10 @@ void ChipKillRepair_cube::repair_hc(FaultDomain *fd, uint64_t &n_undetect, uint6
 				for(it1 = pChips->begin(); it1 != pChips->end(); it1++ )
 				{
 					DRAMDomain *pDRAM1 = dynamic_cast<DRAMDomain*>((*it1));
-					list<FaultRange*> *pRange1 = pDRAM1->getRanges();
+					vector<FaultRange*> *pRange1 = pDRAM1->getRanges();
 					if(counter1<2 && counter2<2)
 					{
-						list<FaultRange*>::iterator itRange1;
+						vector<FaultRange*>::iterator itRange1;
 						for( itRange1 = pRange1->begin(); itRange1 != pRange1->end(); itRange1++ )
 						{
 							FaultRange *fr1 = (*itRange1);
@@ -123,7 +123,7 @@ void ChipKillRepair_cube::repair_hc(FaultDomain *fd, uint64_t &n_undetect, uint6
 					}
 					if((counter1<2 || counter2<2)&& (counter1==4 || counter2==4))
 					{
-						list<FaultRange*>::iterator itRange1;
+						vector<FaultRange*>::iterator itRange1;
 						for( itRange1 = pRange1->begin(); itRange1 != pRange1->end(); itRange1++ )
 						{
 							FaultRange *fr1 = (*itRange1);
@@ -166,7 +166,7 @@ void ChipKillRepair_cube::repair_hc(FaultDomain *fd, uint64_t &n_undetect, uint6
 					}
 					if(counter1>1 && counter1<4 && counter2>1 && counter2<4)
 					{
-						list<FaultRange*>::iterator itRange1;
+						vector<FaultRange*>::iterator itRange1;
 						for( itRange1 = pRange1->begin(); itRange1 != pRange1->end(); itRange1++ )
 						{
 							FaultRange *fr1 = (*itRange1);
@@ -180,7 +180,7 @@ void ChipKillRepair_cube::repair_hc(FaultDomain *fd, uint64_t &n_undetect, uint6
 					}
 					if(((counter1>1 && counter1<4) || (counter2>1 && counter2<4))&& (counter1==4 || counter2==4))
 					{
-						list<FaultRange*>::iterator itRange1;
+						vector<FaultRange*>::iterator itRange1;
 						for( itRange1 = pRange1->begin(); itRange1 != pRange1->end(); itRange1++ )
 						{
 							FaultRange *fr1 = (*itRange1);
@@ -198,7 +198,7 @@ void ChipKillRepair_cube::repair_hc(FaultDomain *fd, uint64_t &n_undetect, uint6
 					}
 					if(counter1>4 && counter1<7 && counter2>4 && counter2<7)
 					{
-						list<FaultRange*>::iterator itRange1;
+						vector<FaultRange*>::iterator itRange1;
 						for( itRange1 = pRange1->begin(); itRange1 != pRange1->end(); itRange1++ )
 						{
 							FaultRange *fr1 = (*itRange1);
@@ -212,7 +212,7 @@ void ChipKillRepair_cube::repair_hc(FaultDomain *fd, uint64_t &n_undetect, uint6
 					}
 					if(((counter1>4 && counter1<7) || (counter2>4 && counter2<7))&& (counter1==7 || counter2==7))
 					{
-						list<FaultRange*>::iterator itRange1;
+						vector<FaultRange*>::iterator itRange1;
 						for( itRange1 = pRange1->begin(); itRange1 != pRange1->end(); itRange1++ )
 						{
 							FaultRange *fr1 = (*itRange1);
@@ -0,0 +1,136 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#include "CodewordCounts.hh"
+#include "DRAMDomain.hh"
+#include "FaultRange.hh"
+#include <assert.h>
+
+CodewordCounts::CodewordCounts( uint64_t group_mask, bool split_locations )
+{
+	m_group_mask = group_mask;
+	m_split = split_locations;
+	m_n_locations = split_locations ? (uint32_t)(group_mask + 1) : 1;
+	m_n_chips = 0;
+	m_epoch = 0;
+}
+
+void CodewordCounts::sync( FaultDomain *fd )
+{
+	list<FaultDomain*> *pChips = fd->getChildren();
+	m_n_chips = pChips->size();
+	m_epoch++;
+
+	// mark the ranges that are still there and add the new ones in chip and list order
+	uint64_t n_live = 0;
+	uint32_t chip = 0;
+	for( list<FaultDomain*>::iterator it = pChips->begin(); it != pChips->end(); it++, chip++ )
+	{
+		vector<FaultRange*> *pRange = dynamic_cast<DRAMDomain*>((*it))->getRanges();
+		for( vector<FaultRange*>::iterator itRange = pRange->begin(); itRange != pRange->end(); itRange++ )
+		{
+			unordered_map<FaultRange*, Tracked>::iterator found = m_tracked.find( (*itRange) );
+			if( found != m_tracked.end() ) {
+				found->second.epoch = m_epoch;
+				n_live++;
+			}
+		}
+	}
+
+	// ranges that were scrubbed since the last call
+	if( n_live != m_tracked.size() ) {
+		m_removed.clear();
+		for( unordered_map<FaultRange*, Tracked>::iterator it = m_tracked.begin(); it != m_tracked.end(); it++ ) {
+			if( it->second.epoch != m_epoch ) m_removed.push_back( it->first );
+		}
+		for( vector<FaultRange*>::iterator it = m_removed.begin(); it != m_removed.end(); it++ ) {
+			drop( (*it) );
+		}
+	}
+
+	chip = 0;
+	for( list<FaultDomain*>::iterator it = pChips->begin(); it != pChips->end(); it++, chip++ )
+	{
+		vector<FaultRange*> *pRange = dynamic_cast<DRAMDomain*>((*it))->getRanges();
+		for( vector<FaultRange*>::iterator itRange = pRange->begin(); itRange != pRange->end(); itRange++ )
+		{
+			if( m_tracked.find( (*itRange) ) == m_tracked.end() ) add( (*itRange), chip );
+		}
+	}
+}
+
+void CodewordCounts::add( FaultRange *fr, uint32_t chip )
+{
+	Tracked &tracked = m_tracked[fr];
+	tracked.fAddr = fr->fAddr;
+	tracked.fWildMask = fr->fWildMask;
+	tracked.chip = chip;
+	tracked.epoch = m_epoch;
+	tracked.n_intersections = 0;
+	tracked.hits.assign( m_n_locations * m_n_chips, 0 );
+
+	m_index.insert( fr, chip );
+
+	// every live range whose codeword group meets the new range's group, including itself
+	m_index.query( tracked.fAddr, tracked.fWildMask | m_group_mask, m_matches );
+	for( vector<FaultRangeIndex::Entry>::iterator it = m_matches.begin(); it != m_matches.end(); it++ ) {
+		Tracked &other = m_tracked[it->fr];
+		update( other, tracked, true );
+		if( it->fr != fr ) update( tracked, other, true );
+	}
+}
+
+void CodewordCounts::drop( FaultRange *fr )
+{
+	unordered_map<FaultRange*, Tracked>::iterator found = m_tracked.find( fr );
+	Tracked &tracked = found->second;
+
+	m_index.remove( fr, tracked.fAddr, tracked.fWildMask );
+
+	m_index.query( tracked.fAddr, tracked.fWildMask | m_group_mask, m_matches );
+	for( vector<FaultRangeIndex::Entry>::iterator it = m_matches.begin(); it != m_matches.end(); it++ ) {
+		update( m_tracked[it->fr], tracked, false );
+	}
+
+	m_tracked.erase( found );
+}
+
+void CodewordCounts::update( Tracked &target, const Tracked &source, bool add )
+{
+	// The groups of target and source meet. A single-location group is hit as a whole; otherwise
+	// source hits the locations whose low address bits it matches (target's own low bits are
+	// ignored, the group spans all of them).
+	for( uint32_t location = 0; location < m_n_locations; location++ )
+	{
+		if( m_split && ((location ^ source.fAddr) & ~source.fWildMask & m_group_mask) != 0 ) continue;
+
+		uint32_t &hits = target.hits[location * m_n_chips + source.chip];
+		if( add ) {
+			if( hits++ == 0 ) target.n_intersections++;
+		} else {
+			assert( hits > 0 );
+			if( --hits == 0 ) target.n_intersections--;
+		}
+	}
+}
+
+uint32_t CodewordCounts::getIntersections( FaultRange *fr )
+{
+	return m_tracked[fr].n_intersections;
+}
+
+void CodewordCounts::clear( void )
+{
+	m_tracked.clear();
+	m_index.clear();
+}
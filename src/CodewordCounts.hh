@@ -0,0 +1,72 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#ifndef CODEWORDCOUNTS_HH_
+#define CODEWORDCOUNTS_HH_
+
+#include "boost/cstdint.hpp"
+#include "FaultRangeIndex.hh"
+#include <vector>
+#include <unordered_map>
+
+class FaultDomain;
+class FaultRange;
+
+using namespace std;
+
+// Incrementally maintained n_intersections of every live fault range in a module.
+// A range covers one codeword group (its address with the group_mask bits wild); the group is
+// either one location (a ChipKill symbol) or split into group_mask+1 locations that are counted
+// separately (BCH bits of a codeword). For each range, location and chip the number of live
+// ranges of that chip hitting the location is kept, and n_intersections is the number of
+// (location, chip) pairs that are hit at least once. sync() compares the chips' fault lists with
+// the ranges seen by the previous call, so each new or scrubbed range only updates the ranges
+// whose codeword groups it touches instead of re-evaluating every pair.
+class CodewordCounts
+{
+public:
+	CodewordCounts( uint64_t group_mask, bool split_locations );
+
+	// bring the counts up to date with the current fault ranges of the chips of fd
+	void sync( FaultDomain *fd );
+	// n_intersections of a live range (valid after sync)
+	uint32_t getIntersections( FaultRange *fr );
+	// forget all ranges (between simulations, before the ranges are deleted)
+	void clear( void );
+
+private:
+	struct Tracked {
+		uint64_t fAddr, fWildMask;
+		uint32_t chip;
+		uint64_t epoch;	// last sync that found the range in its chip
+		uint32_t n_intersections;
+		vector<uint32_t> hits;	// [location * n_chips + chip]
+	};
+
+	void add( FaultRange *fr, uint32_t chip );
+	void drop( FaultRange *fr );
+	void update( Tracked &target, const Tracked &source, bool add );
+
+	uint64_t m_group_mask;
+	bool m_split;
+	uint32_t m_n_locations;
+	uint32_t m_n_chips;
+	uint64_t m_epoch;
+
+	unordered_map<FaultRange*, Tracked> m_tracked;
+	FaultRangeIndex m_index;
+	vector<FaultRangeIndex::Entry> m_matches;
+	vector<FaultRange*> m_removed;
+};
+
+#endif /* CODEWORDCOUNTS_HH_ */
@@ -11,22 +11,29 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 */
 
 #include<iostream>
-extern struct Settings settings;
 
 #include "ConfigParser.hh"
 #include <stdlib.h>
 #include <stdio.h>
 #include <string.h>
 #include "Settings.hh"
+#include "faultsim.hh"
 #include <stdint.h>
 #include <boost/property_tree/ptree.hpp>
 #include <boost/property_tree/ini_parser.hpp>
 
+// the settings of the current run, filled in by parser() and read throughout the simulator
+struct Settings settings;
+
 void parser(char *ininame)
 {
 	boost::property_tree::ptree pt;
 	boost::property_tree::ini_parser::read_ini( ininame, pt );
+	parseConfig( pt );
+}
 
+void parseConfig( boost::property_tree::ptree &pt )
+{
 	settings.sim_mode = pt.get<int>("Sim.sim_mode");
 	settings.interval_s = pt.get<uint64_t>("Sim.interval_s");
 	settings.scrub_s = pt.get<uint64_t>("Sim.scrub_s");
@@ -36,6 +43,23 @@ void parser(char *ininame)
 	settings.verbose = pt.get<int>("Sim.verbose");
 	settings.debug = pt.get<int>("Sim.debug");
 	settings.output_bucket_s = pt.get<uint64_t>("Sim.output_bucket_s");
+	settings.output_format = pt.get<int>("Sim.output_format", OF_CSV);
+	settings.stats_file = pt.get<std::string>("Sim.stats_file", "");
+	settings.progress_s = pt.get<uint64_t>("Sim.progress_s", 0);
+	settings.progress_file = pt.get<std::string>("Sim.progress_file", "");
+	settings.profile_file = pt.get<std::string>("Sim.profile_file", "");
+	settings.checkpoint_s = pt.get<uint64_t>("Sim.checkpoint_s", 0);
+	settings.ci_target = pt.get<double>("Sim.ci_target", 0.0);
+	settings.ci_confidence = pt.get<double>("Sim.ci_confidence", 0.95);
+	settings.ci_method = pt.get<int>("Sim.ci_method", CI_WILSON);
+	settings.ci_rates = pt.get<int>("Sim.ci_rates", CI_RATE_UNCORR);
+	settings.ci_batch = pt.get<uint64_t>("Sim.ci_batch", 10000);
+	settings.is_boost = pt.get<double>("Sim.is_boost", 1.0);
+	settings.presample = pt.get<bool>("Sim.presample", false);
+	settings.coalesce_ranges = pt.get<bool>("Sim.coalesce_ranges", false);
+	settings.skip_ahead = pt.get<bool>("Sim.skip_ahead", false);
+	settings.seed = pt.get<uint64_t>("Sim.seed", 0);
+	settings.shard = pt.get<uint64_t>("Sim.shard", 0);
 
 	settings.organization = pt.get<int>("Org.organization");
 	settings.chips_per_rank = pt.get<int>("Org.chips_per_rank");
@@ -58,4 +82,5 @@ void parser(char *ininame)
 	settings.tsv_fit = pt.get<double>("Fault.tsv_fit");
 
 	settings.repairmode = pt.get<int>("ECC.repairmode");
+	settings.compare_repairmodes = pt.get<std::string>("ECC.compare_repairmodes", "");
 }
@@ -13,7 +13,11 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #ifndef CONFIGPARSER_HH_
 #define CONFIGPARSER_HH_
 
+#include <boost/property_tree/ptree.hpp>
+
 void parser(char *ininame);
+// fill in the settings from an already read configuration (e.g. with overridden keys)
+void parseConfig( boost::property_tree::ptree &pt );
 
 
 #endif /* CONFIGPARSER_HH_ */
@@ -38,8 +38,8 @@ void CubeRAIDRepair::repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t
 	for( it1 = pChips->begin(); it1 != pChips->end(); it1++ )
 	{
 		DRAMDomain *pDRAM1 = dynamic_cast<DRAMDomain*>((*it1));
-		list<FaultRange*> *pRange3 = pDRAM1->getRanges();
-		list<FaultRange*>::iterator itRange3;
+		vector<FaultRange*> *pRange3 = pDRAM1->getRanges();
+		vector<FaultRange*>::iterator itRange3;
 		for( itRange3 = pRange3->begin(); itRange3 != pRange3->end(); itRange3++ )
 		{
 			FaultRange *fr3 = (*itRange3);
@@ -53,11 +53,11 @@ void CubeRAIDRepair::repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t
 	{
 
 		DRAMDomain *pDRAM0 = dynamic_cast<DRAMDomain*>((*it0));
-		list<FaultRange*> *pRange0 = pDRAM0->getRanges();
+		vector<FaultRange*> *pRange0 = pDRAM0->getRanges();
 
 		// For each fault in first chip, query the other chips to see if they have
 		// an intersecting fault range.
-		list<FaultRange*>::iterator itRange0;
+		vector<FaultRange*>::iterator itRange0;
 		for( itRange0 = pRange0->begin(); itRange0 != pRange0->end(); itRange0++ )
 		{
 			// Make a copy, otherwise fault is modified as a side-effect
@@ -78,8 +78,8 @@ void CubeRAIDRepair::repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t
 					if( it0 == it1 ) continue;	// skip if we're looking at the first chip
 
 					DRAMDomain *pDRAM1 = dynamic_cast<DRAMDomain*>((*it1));
-					list<FaultRange*> *pRange1 = pDRAM1->getRanges();
-					list<FaultRange*>::iterator itRange1;
+					vector<FaultRange*> *pRange1 = pDRAM1->getRanges();
+					vector<FaultRange*>::iterator itRange1;
 					for( itRange1 = pRange1->begin(); itRange1 != pRange1->end(); itRange1++ )
 					{
 						FaultRange frTemp1 = *(*itRange1);
@@ -119,6 +119,14 @@ void CubeRAIDRepair::repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t
 	}
 }
 
+bool CubeRAIDRepair::canCoalesceRanges( void )
+{
+	// A covered range meets no chip that its cover doesn't and has no more intersections than it.
+	// Only the early return on the first uncorrectable range depends on the order, and that
+	// doesn't skip any undetectable count as long as detection is at least as strong as correction.
+	return m_n_detect >= m_n_correct;
+}
+
 uint64_t CubeRAIDRepair::fill_repl(FaultDomain *fd)
 {
 	return 0;
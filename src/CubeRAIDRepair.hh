@@ -21,6 +21,7 @@ public:
 	CubeRAIDRepair( string name, uint n_sym_correct, uint n_sym_detect, uint detect_block_bytes );
 
 	void repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t &n_uncorrectable );
+	bool canCoalesceRanges( void );
 	uint64_t fill_repl ( FaultDomain *fd );
 	void printStats( void );
 	void resetStats( void );
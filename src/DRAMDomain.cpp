@@ -15,15 +15,19 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #include <stdlib.h>
 #include <ctime>
 #include <cmath>
+#include <algorithm>
 #include <sys/time.h>
 #include "faultsim.hh"
 #include "Settings.hh"
+#include "Profile.hh"
 
 extern struct Settings settings;
 
 DRAMDomain::DRAMDomain( char *name, uint32_t n_bitwidth, uint32_t n_ranks, uint32_t n_banks, uint32_t n_rows, uint32_t n_cols, uint32_t n_chips_per_rank ) : FaultDomain( name )
 , dist(0,1)
 , gen(eng,dist)
+, m_pool( this )
+, m_tsv_template( this )
 , m_bitwidth( n_bitwidth )
 , m_ranks( n_ranks )
 , m_banks( n_banks )
@@ -55,6 +59,12 @@ DRAMDomain::DRAMDomain( char *name, uint32_t n_bitwidth, uint32_t n_ranks, uint3
 	m_logBits = log2( m_bitwidth );
 
 	curr_interval = 0;
+	m_coalesce = false;
+	m_seq = 0;
+	m_skip_ahead = false;
+	m_interval = 0;
+	for( int i = 0; i < DRAM_MAX*2; i++ ) m_next_fault[i] = NO_FAULT_INTERVAL;
+	m_tsv_ranges = 0;
 
 	if( settings.verbose )
 	{
@@ -72,7 +82,133 @@ DRAMDomain::DRAMDomain( char *name, uint32_t n_bitwidth, uint32_t n_ranks, uint3
 	}
 }
 
-list<FaultRange*> *DRAMDomain::getRanges( void )
+void DRAMDomain::seed( uint64_t seed_t, uint64_t shard_t, uint64_t segment_t )
+{
+	FaultDomain::seed( seed_t, shard_t, segment_t );
+
+	// children_counter holds the chip index within the module
+	seedStream( gen.engine(), seed_t, shard_t, children_counter, STREAM_FAULT_TIME, segment_t );
+	seedStream( eng32, seed_t, shard_t, children_counter, STREAM_FAULT_LOC, segment_t );
+}
+
+void DRAMDomain::setCoalesceRanges( bool coalesce )
+{
+	m_coalesce = coalesce;
+	FaultDomain::setCoalesceRanges( coalesce );
+}
+
+void DRAMDomain::insertRange( FaultRange *fr )
+{
+	fr->seq = m_seq++;
+	if( !m_coalesce ) {
+		m_faultRanges.push_back( fr );
+		if( fr->transient ) m_transients.push_back( fr );
+		return;
+	}
+
+	// A range inside a permanent one adds no faulty address for as long as the permanent range
+	// lives, i.e. for the rest of the simulation. The fault itself was already counted.
+	vector<FaultRange*>::iterator it;
+	for( it = m_faultRanges.begin(); it != m_faultRanges.end(); it++ ) {
+		if( !(*it)->transient && (*it)->covers( fr ) ) {
+			if( profile.enabled ) profile.ranges_absorbed++;
+			return;
+		}
+	}
+
+	// a new permanent range absorbs the ranges it covers, the others keep their order
+	if( !fr->transient ) {
+		size_t n_live = 0;
+		for( size_t i = 0; i < m_faultRanges.size(); i++ ) {
+			if( fr->covers( m_faultRanges[i] ) ) continue;
+			m_faultRanges[n_live++] = m_faultRanges[i];
+		}
+		if( profile.enabled ) profile.ranges_absorbed += m_faultRanges.size() - n_live;
+		m_faultRanges.resize( n_live );
+
+		n_live = 0;
+		for( size_t i = 0; i < m_transients.size(); i++ ) {
+			if( fr->covers( m_transients[i] ) ) continue;
+			m_transients[n_live++] = m_transients[i];
+		}
+		m_transients.resize( n_live );
+	}
+	m_faultRanges.push_back( fr );
+	if( fr->transient ) m_transients.push_back( fr );
+}
+
+FaultRange *DRAMDomain::genTSVRange( uint64_t tsv, uint64_t n, bool transient )
+{
+	FaultRange *fr = m_pool.alloc();
+	*fr = m_tsv_template;
+	fr->transient = transient;
+	fr->fAddr = tsv + n*cube_data_tsv;
+	return fr;
+}
+
+void DRAMDomain::insertTSVFault( FaultRange *fr )
+{
+	// fr is range 0 of the fault, so its row bit is the chip's TSV number
+	uint64_t tsv = fr->fAddr;
+	uint64_t location = children_counter*cube_data_tsv + tsv;
+	if( tsv_bitmap[location] ) return;
+
+	// same state and counts as a TSV fault injected by update()
+	tsv_bitmap[location] = true;
+	if( fr->transient ) {
+		tsv_info[location] = 4;
+		n_faults_transient++;
+		n_faults_transient_tsv++;
+	} else {
+		tsv_info[location] = 3;
+		n_faults_permanent++;
+		n_faults_permanent_tsv++;
+	}
+
+	insertRange( fr );
+	for( uint64_t n = 1; n < m_tsv_ranges; n++ ) {
+		FaultRange *range = genTSVRange( tsv, n, fr->transient );
+		range->timestamp = fr->timestamp;
+		insertRange( range );
+	}
+}
+
+void DRAMDomain::setSkipAhead( bool skip_ahead )
+{
+	m_skip_ahead = skip_ahead;
+	FaultDomain::setSkipAhead( skip_ahead );
+}
+
+// Number of intervals without a fault before the next one of a process that fails with
+// probability p in every interval (geometric distribution), drawn by inversion
+uint64_t DRAMDomain::drawIntervals( double p )
+{
+	if( p <= 0 ) return NO_FAULT_INTERVAL;
+	double k = floor( log( 1.0 - gen() ) / log1p( -p ) );
+	return ( k < (double)NO_FAULT_INTERVAL ) ? (uint64_t)k : NO_FAULT_INTERVAL;
+}
+
+uint64_t DRAMDomain::nextFaultInterval( void )
+{
+	uint64_t next = FaultDomain::nextFaultInterval();
+	for( int i = 0; i < DRAM_MAX*2; i++ ) {
+		if( m_next_fault[i] < next ) next = m_next_fault[i];
+	}
+	return next;
+}
+
+void DRAMDomain::setInterval( uint64_t interval )
+{
+	m_interval = interval;
+	FaultDomain::setInterval( interval );
+}
+
+uint64_t DRAMDomain::getTransientCount( void )
+{
+	return FaultDomain::getTransientCount() + m_transients.size();
+}
+
+vector<FaultRange*> *DRAMDomain::getRanges( void )
 {
 	return &m_faultRanges;
 }
@@ -123,12 +259,34 @@ int DRAMDomain::update( uint test_mode_t )
 
 	// Insert DRAM die faults
 	for( uint i = 0; i < DRAM_MAX; i++ ) {
-		if(test_mode_t==0)
+		if( m_skip_ahead )
+		{
+			// the same processes, with the intervals between faults drawn at once (see reset)
+			if( m_next_fault[i] == m_interval ) {
+				m_next_fault[i] = m_interval + 1 + drawIntervals( transientFIT[i] );
+				n_faults_transient++;
+				n_faults_transient_class[i]++;
+				if( profile.enabled ) profile.faults_transient[i]++;
+				generateRanges( i, true );
+				newfault1 = 1;
+			}
+
+			if( m_next_fault[DRAM_MAX + i] == m_interval ) {
+				m_next_fault[DRAM_MAX + i] = m_interval + 1 + drawIntervals( permanentFIT[i] );
+				n_faults_permanent++;
+				n_faults_permanent_class[i]++;
+				if( profile.enabled ) profile.faults_permanent[i]++;
+				generateRanges( i, false );
+				newfault1 = 1;
+			}
+		}
+		else if(test_mode_t==0)
 		{
 			double random = gen();
 			if( random <= transientFIT[i] ) {
 				n_faults_transient++;
 				n_faults_transient_class[i]++;
+				if( profile.enabled ) profile.faults_transient[i]++;
 				generateRanges( i, true );
 				newfault1 = 1;			
 			}
@@ -138,6 +296,7 @@ int DRAMDomain::update( uint test_mode_t )
 			if( random <= permanentFIT[i] ) {
 				n_faults_permanent++;
 				n_faults_permanent_class[i]++;
+				if( profile.enabled ) profile.faults_permanent[i]++;
 				generateRanges( i, false );
 				newfault1 = 1;
 			}
@@ -148,6 +307,7 @@ int DRAMDomain::update( uint test_mode_t )
 			if( i == (test_mode_t-1)) {
 				n_faults_transient++;
 				n_faults_transient_class[i]++;
+				if( profile.enabled ) profile.faults_transient[i]++;
 				generateRanges( i, true );
 				newfault1 = 1;
 			}
@@ -155,6 +315,7 @@ int DRAMDomain::update( uint test_mode_t )
 			if( i == (test_mode_t-1) ) {
 				n_faults_permanent++;
 				n_faults_permanent_class[i]++;
+				if( profile.enabled ) profile.faults_permanent[i]++;
 				generateRanges( i, false );
 				newfault1 = 1;
 			}
@@ -174,10 +335,9 @@ int DRAMDomain::update( uint test_mode_t )
 					n_faults_permanent_tsv++;
 					newfault1 = 1;
 
-					for(uint jj=0; jj<(m_cols*m_bitwidth/cube_data_tsv); jj++ )
+					for(uint jj=0; jj<m_tsv_ranges; jj++ )
 					{
-						m_faultRanges.push_back( genRandomRange( 0, 0, 0, 1, 1, false, (ii%cube_data_tsv)+(jj*cube_data_tsv), true ) );
-						//cout << "|" <<(ii%cube_data_tsv)+(jj*cube_data_tsv)<< "|";
+						insertRange( genTSVRange( ii%cube_data_tsv, jj, false ) );
 					}
 					tsv_info[ii]=3;
 				}
@@ -187,11 +347,10 @@ int DRAMDomain::update( uint test_mode_t )
 					n_faults_transient_tsv++;
 					newfault1 = 1;
 
-					for(uint jj=0; jj<(m_cols*m_bitwidth/cube_data_tsv); jj++ )
+					for(uint jj=0; jj<m_tsv_ranges; jj++ )
 					{
-						m_faultRanges.push_back( genRandomRange( 0, 0, 0, 1, 1, true, (ii%cube_data_tsv)+(jj*cube_data_tsv), true ) );
-						//cout << "|" <<(ii%cube_data_tsv)+(jj*cube_data_tsv)<< "|";
-					} 
+						insertRange( genTSVRange( ii%cube_data_tsv, jj, true ) );
+					}
 					tsv_info[ii]=4;
 				}
 			}
@@ -199,6 +358,7 @@ int DRAMDomain::update( uint test_mode_t )
 	}
 
 	curr_interval++;
+	m_interval++;
 	
 	return (newfault0 || newfault1);
 }
@@ -211,28 +371,44 @@ void DRAMDomain::repair( uint64_t &n_undetectable, uint64_t &n_uncorrectable )
 	FaultDomain::repair( n_undetectable, n_uncorrectable );
 }
 
+void DRAMDomain::insertSingleFault( FaultRange *fr )
+{
+	// the fault is counted by its chip, as the event-driven simulator does when generating it
+	if( fr->m_pDRAM == this ) {
+		if( fr->transient ) n_faults_transient++;
+		else n_faults_permanent++;
+	}
+
+	FaultDomain::insertSingleFault( fr );
+}
+
 bool first_time = 1;
 
 void DRAMDomain::reset( void )
 {
 	FaultDomain::reset();
 
-	// delete all faults
-	list<FaultRange*>::iterator it;
-
-	for( it = m_faultRanges.begin(); it != m_faultRanges.end(); it++ )
-	{
-		delete (*it);
-	}
-
+	// delete all faults (including ranges that were generated or scrubbed without being listed here)
 	m_faultRanges.clear();
+	m_transients.clear();
+	m_seq = 0;
+	m_pool.clear();
+
+	// skip_ahead: first fault interval of every process of the new trial
+	if( m_skip_ahead ) {
+		m_interval = 0;
+		for( int i = 0; i < DRAM_MAX; i++ ) {
+			m_next_fault[i] = drawIntervals( transientFIT[i] );
+			m_next_fault[DRAM_MAX + i] = drawIntervals( permanentFIT[i] );
+		}
+	}
 
 	// DR DEBUG - insert known faults
 	/*
 	if( settings.debug && (first_time == 1) )
 	{
 		first_time = 0;
-		list<FaultRange*> *ranges = getRanges();
+		vector<FaultRange*> *ranges = getRanges();
 
 		// DR DEBUG: inject entire single bit column fault across all banks
 		FaultRange *range = new FaultRange( this );
@@ -256,7 +432,7 @@ void DRAMDomain::dumpState( void )
 	{
 		cout << m_name << " ";
 
-		list<FaultRange*>::iterator it;
+		vector<FaultRange*>::iterator it;
 
 		for( it = m_faultRanges.begin(); it != m_faultRanges.end(); it++ )
 		{
@@ -265,21 +441,71 @@ void DRAMDomain::dumpState( void )
 	}
 }
 
+static bool insertedBefore( FaultRange *a, FaultRange *b )
+{
+	return a->seq < b->seq;
+}
+
+// first of m_transients from t on that is still listed and may be scrubbed
+size_t DRAMDomain::nextRemovable( size_t t )
+{
+	while( t < m_transients.size() && (m_scrub_erased[t] || !m_transients[t]->transient_remove) ) t++;
+	return t;
+}
+
 void DRAMDomain::scrub( void )
 {
 	FaultDomain::scrub();
 
 	// delete all transient faults
-	list<FaultRange*>::iterator it;
-	for( it = m_faultRanges.begin(); it != m_faultRanges.end(); it++ )
-	{
-		if( (*it)->transient ) {
-			if((*it)->transient_remove)
-			{
-				it = m_faultRanges.erase( it );
-			}
+	// The result is that of the original walk over the whole std::list: the range following each
+	// removed one is stepped over, and removing the last range wraps around to the front. Only the
+	// transient ranges can change anything, so the walk is replayed on their list positions.
+	size_t n_trans = m_transients.size();
+	if( n_trans == 0 ) return;
+
+	size_t n = m_faultRanges.size();
+	m_scrub_pos.resize( n_trans );
+	m_scrub_erased.assign( n_trans, false );
+	vector<FaultRange*>::iterator from = m_faultRanges.begin();
+	for( size_t t = 0; t < n_trans; t++ ) {
+		from = lower_bound( from, m_faultRanges.end(), m_transients[t], insertedBefore );
+		m_scrub_pos[t] = from - m_faultRanges.begin();
+	}
+
+	size_t t = nextRemovable( 0 );
+	if( t == n_trans ) return;
+	while( t < n_trans ) {
+		m_scrub_erased[t] = true;
+
+		// the range now following the removed one (the ranges removed so far are all transient)
+		size_t next = m_scrub_pos[t] + 1;
+		size_t u = t + 1;
+		while( u < n_trans && m_scrub_pos[u] == next && m_scrub_erased[u] ) {
+			next++;
+			u++;
+		}
+
+		if( next == n ) t = nextRemovable( 0 );	// it was the last one
+		else if( u < n_trans && m_scrub_pos[u] == next ) t = nextRemovable( u + 1 );	// step over a transient
+		else t = nextRemovable( u );	// step over a permanent range
+	}
+
+	// drop the removed ranges from both lists in one pass
+	size_t n_live = m_scrub_pos[0];
+	size_t n_trans_live = 0;
+	t = 0;
+	for( size_t i = m_scrub_pos[0]; i < n; i++ ) {
+		if( t < n_trans && m_scrub_pos[t] == i ) {
+			bool erased = m_scrub_erased[t];
+			if( !erased ) m_transients[n_trans_live++] = m_transients[t];
+			t++;
+			if( erased ) continue;
 		}
+		m_faultRanges[n_live++] = m_faultRanges[i];
 	}
+	m_faultRanges.resize( n_live );
+	m_transients.resize( n_trans_live );
 }
 
 void DRAMDomain::setFIT( int faultClass, bool isTransient, double FIT )
@@ -421,11 +647,17 @@ void DRAMDomain::init( uint64_t interval, uint64_t sim_seconds, double fit_facto
 				scaling_factor = 1.0;
 				break;
 		}
-		std::cout << "DRAM Class " << faultClassString(i) << " Scaling Factor: " << scaling_factor << "\n";
-		std::cout << "DRAM Class " << faultClassString(i) << " Original Transient FIT: " << transientFIT[i] << " Permanent FIT: " << permanentFIT[i] << "\n";
+		// the library keeps the host process's stdout quiet unless verbose is set
+		bool report = settings.verbose || !settings.in_process;
+		if( report ) {
+			std::cout << "DRAM Class " << faultClassString(i) << " Scaling Factor: " << scaling_factor << "\n";
+			std::cout << "DRAM Class " << faultClassString(i) << " Original Transient FIT: " << transientFIT[i] << " Permanent FIT: " << permanentFIT[i] << "\n";
+		}
 		transientFIT[i] = (double)1.0 - exp( -transientFIT[i] * scaling_factor * fit_factor * interval_factor );
 		permanentFIT[i] = (double)1.0 - exp( -permanentFIT[i] * scaling_factor * fit_factor * interval_factor );
-		std::cout << "DRAM Class " << faultClassString(i) << " Scaled Transient FIT: " << transientFIT[i] << " Permanent FIT: " << permanentFIT[i] << "\n\n";
+		if( report ) {
+			std::cout << "DRAM Class " << faultClassString(i) << " Scaled Transient FIT: " << transientFIT[i] << " Permanent FIT: " << permanentFIT[i] << "\n\n";
+		}
 		/* Hamoci End */
 
 		/* Hamoci: This Codes Are Original */
@@ -437,37 +669,44 @@ void DRAMDomain::init( uint64_t interval, uint64_t sim_seconds, double fit_facto
 		assert( permanentFIT[i] >= 0 );
 		assert( permanentFIT[i] <= 1 );
 	}
+
+	// TSV fault template (row bit 0; genRandomRange draws no location for it)
+	if( (cube_model_enable>0) && enable_tsv ) {
+		m_tsv_template = *genRandomRange( 0, 0, 0, 1, 1, false, 0, true );
+		m_pool.clear();
+		m_tsv_ranges = m_cols*m_bitwidth/cube_data_tsv;
+	}
 }
 
 void DRAMDomain::generateRanges( int faultClass, bool transient )
 {
 	switch( faultClass ) {
 	case DRAM_1BIT:
-		m_faultRanges.push_back( genRandomRange( 1, 1, 1, 1, 1,transient, -1, false) );
+		insertRange( genRandomRange( 1, 1, 1, 1, 1,transient, -1, false) );
 		break;
 
 	case DRAM_1WORD:
-		m_faultRanges.push_back( genRandomRange( 1, 1, 1, 1, 0,transient, -1, false) );
+		insertRange( genRandomRange( 1, 1, 1, 1, 0,transient, -1, false) );
 		break;
 
 	case DRAM_1COL:
-		m_faultRanges.push_back( genRandomRange( 1, 1, 0, 1, 0,transient, -1, false) );
+		insertRange( genRandomRange( 1, 1, 0, 1, 0,transient, -1, false) );
 		break;
 
 	case DRAM_1ROW:
-		m_faultRanges.push_back( genRandomRange( 1, 1, 1, 0, 0,transient, -1, false) );
+		insertRange( genRandomRange( 1, 1, 1, 0, 0,transient, -1, false) );
 		break;
 
 	case DRAM_1BANK:
-		m_faultRanges.push_back( genRandomRange( 1, 1, 0, 0, 0,transient, -1, false) );
+		insertRange( genRandomRange( 1, 1, 0, 0, 0,transient, -1, false) );
 		break;
 
 	case DRAM_NBANK:
-		m_faultRanges.push_back( genRandomRange( 1, 0, 0, 0, 0,transient, -1, false) );
+		insertRange( genRandomRange( 1, 0, 0, 0, 0,transient, -1, false) );
 		break;
 
 	case DRAM_NRANK:
-		m_faultRanges.push_back( genRandomRange( 0, 0, 0, 0, 0,transient, -1, false) );
+		insertRange( genRandomRange( 0, 0, 0, 0, 0,transient, -1, false) );
 		break;
 
 	default:
@@ -478,7 +717,7 @@ void DRAMDomain::generateRanges( int faultClass, bool transient )
 
 FaultRange *DRAMDomain::genRandomRange( bool rank, bool bank, bool row, bool col, bool bit, bool transient, int64_t rowbit_num, bool isTSV_t )
 {
-	FaultRange *fr = new FaultRange( this );
+	FaultRange *fr = m_pool.alloc();
 	fr->fAddr = 0;
 	fr->fWildMask = 0;
 	fr->Chip=0;
@@ -608,6 +847,16 @@ uint32_t DRAMDomain::getChipsPerRank(void)
 	return m_chips_per_rank;
 }
 
+void DRAMDomain::getClassCounts( uint64_t *transient, uint64_t *permanent )
+{
+	for( int i = 0; i < DRAM_MAX; i++ ) {
+		transient[i] = n_faults_transient_class[i];
+		permanent[i] = n_faults_permanent_class[i];
+	}
+	transient[DRAM_MAX] = n_faults_transient_tsv;
+	permanent[DRAM_MAX] = n_faults_permanent_tsv;
+}
+
 void DRAMDomain::printStats( void )
 {
 	FaultDomain::printStats();
@@ -631,7 +880,7 @@ void DRAMDomain::printStats( void )
 
 	// For extra verbose mode, output list of all fault ranges
 	if( settings.verbose == 2 ) {
-		list<FaultRange*>::iterator it;
+		vector<FaultRange*>::iterator it;
 		for( it = m_faultRanges.begin(); it != m_faultRanges.end(); it++ )
 		{
 			cout << "FR " << (*it)->toString() << "\n";
@@ -639,6 +888,42 @@ void DRAMDomain::printStats( void )
 	}
 }
 
+void DRAMDomain::writeStatsFields( ostream &out )
+{
+	FaultDomain::writeStatsFields( out );
+
+	out << ", \"transient\": [";
+	for( int i = 0; i < DRAM_MAX; i++ ) out << (i ? ", " : "") << n_faults_transient_class[i];
+	out << "], \"transient_tsv\": " << n_faults_transient_tsv;
+	out << ", \"permanent\": [";
+	for( int i = 0; i < DRAM_MAX; i++ ) out << (i ? ", " : "") << n_faults_permanent_class[i];
+	out << "], \"permanent_tsv\": " << n_faults_permanent_tsv;
+}
+
+void DRAMDomain::saveCheckpoint( ostream &out )
+{
+	FaultDomain::saveCheckpoint( out );
+
+	out << "classes";
+	for( int i = 0; i < DRAM_MAX; i++ ) out << " " << n_faults_transient_class[i];
+	out << " " << n_faults_transient_tsv;
+	for( int i = 0; i < DRAM_MAX; i++ ) out << " " << n_faults_permanent_class[i];
+	out << " " << n_faults_permanent_tsv << "\n";
+}
+
+bool DRAMDomain::loadCheckpoint( istream &in )
+{
+	if( !FaultDomain::loadCheckpoint( in ) ) return false;
+
+	string tag;
+	in >> tag;
+	for( int i = 0; i < DRAM_MAX; i++ ) in >> n_faults_transient_class[i];
+	in >> n_faults_transient_tsv;
+	for( int i = 0; i < DRAM_MAX; i++ ) in >> n_faults_permanent_class[i];
+	in >> n_faults_permanent_tsv;
+	return in && tag == "classes";
+}
+
 void DRAMDomain::resetStats( void )
 {
 	FaultDomain::resetStats();
@@ -16,8 +16,10 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #include "dram_common.hh"
 
 #include <list>
+#include <vector>
 
 #include "FaultDomain.hh"
+#include "FaultRangePool.hh"
 class FaultRange;
 
 // 32-bit random integers for determining fault locations
@@ -30,15 +32,33 @@ class DRAMDomain : public FaultDomain
 
 	void setFIT( int faultClass, bool isTransient, double FIT );
     void init( uint64_t interval, uint64_t sim_seconds, double fit_factor );
+	void seed( uint64_t seed_t, uint64_t shard_t, uint64_t segment_t );
 	int update(uint test_mode_t);	// perform one iteration
 	void repair( uint64_t &n_undetectable, uint64_t &n_uncorrectable );
 	void scrub( void );
 	virtual void reset( void );
+	void insertSingleFault( FaultRange *fr );
+	void setCoalesceRanges( bool coalesce );
+	void setSkipAhead( bool skip_ahead );
+	uint64_t nextFaultInterval( void );
+	void setInterval( uint64_t interval );
+	uint64_t getTransientCount( void );
+	// add a new fault range; with coalescing, ranges covered by a permanent range are left out
+	void insertRange( FaultRange *fr );
+	// n-th fault range of a fault of data TSV tsv of this chip (copy of m_tsv_template)
+	FaultRange *genTSVRange( uint64_t tsv, uint64_t n, bool transient );
+	// event mode: add the TSV fault whose first range is fr, unless the TSV already failed in this simulation
+	void insertTSVFault( FaultRange *fr );
+	void saveCheckpoint( ostream &out );
+	bool loadCheckpoint( istream &in );
     
-	list<FaultRange*> *getRanges( void );
+	vector<FaultRange*> *getRanges( void );
+	// fault counts per class (DRAM_MAX entries, then TSV) over all simulations
+	void getClassCounts( uint64_t *transient, uint64_t *permanent );
 
 	void dumpState( void );
 	void printStats( void );
+	void writeStatsFields( ostream &out );
 	void resetStats( void );
 	uint32_t getLogBits(void);
 	uint32_t getLogRanks(void);
@@ -66,16 +86,37 @@ class DRAMDomain : public FaultDomain
 	// Parameters for event-driven simulation (hours per fault transient followed by permanent
 	double hrs_per_fault[DRAM_MAX*2];
 
-	list<FaultRange*> m_faultRanges;
+	vector<FaultRange*> m_faultRanges;
 
 	ENG  eng;
 	DIST dist;
 	GEN  gen;
+	FaultRangePool m_pool;	// storage of this chip's fault ranges, emptied by reset()
 	ENG32 eng32;
 
 	uint64_t curr_interval;
 
 	protected:
+	bool m_coalesce;	// keep m_faultRanges free of ranges covered by a permanent range
+	uint64_t m_seq;		// next FaultRange::seq; m_faultRanges is ordered by it
+	// The transient ranges of m_faultRanges in list order. A scrub always comes after the faults it
+	// clears, so all of them are due at the next one and it only has to look at these.
+	vector<FaultRange*> m_transients;
+	vector<size_t> m_scrub_pos;	// scrub scratch: position of each of m_transients in m_faultRanges
+	vector<bool> m_scrub_erased;
+
+	size_t nextRemovable( size_t t );
+
+	bool m_skip_ahead;
+	uint64_t m_interval;	// interval of the trial handled by the next update() (skip_ahead)
+	uint64_t m_next_fault[DRAM_MAX*2];	// interval of the next transient, then permanent fault per class
+	uint64_t drawIntervals( double p );
+
+	// A TSV fault covers every rank, bank and row at the row bits the TSV carries, so its ranges
+	// only differ in the row bit: m_tsv_ranges copies of this range, built by init()
+	FaultRange m_tsv_template;
+	uint64_t m_tsv_ranges;
+
 	uint64_t n_faults_transient_class[DRAM_MAX];
 	uint64_t n_faults_permanent_class[DRAM_MAX];
 
@@ -15,6 +15,7 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #include "FaultDomain.hh"
 #include "DRAMDomain.hh"
 #include "FaultRange.hh"
+#include "Profile.hh"
 #include <list>
 #include <iostream>
 #include <fstream>
@@ -22,6 +23,7 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #include <iomanip>
 #include <stdio.h>
 #include <math.h>
+#include <algorithm>
 #define __STDC_FORMAT_MACROS
 #include <inttypes.h>
 using namespace std;
@@ -40,6 +42,138 @@ EventSimulation::EventSimulation( uint64_t interval_t, uint64_t scrub_interval_t
 									bool debug_mode_t, bool cont_running_t, uint64_t output_bucket_t)
 : Simulation( interval_t, scrub_interval_t, fit_factor_t, test_mode_t, debug_mode_t, cont_running_t, output_bucket_t)
 {
+	m_presample_ready = false;
+	m_presample_single = false;
+	m_presample_rate = 0;
+}
+
+// Fault range of one of the DRAM_MAX*2 event-driven fault processes of a chip
+// (transient classes followed by permanent ones)
+static FaultRange *genEventRange( DRAMDomain *pD, int errtype )
+{
+	FaultRange *fr = NULL;
+	if( profile.enabled ) {
+		if( errtype < DRAM_MAX ) profile.faults_transient[errtype]++;
+		else profile.faults_permanent[errtype - DRAM_MAX]++;
+	}
+	if(errtype==0)
+	{
+		fr = pD->genRandomRange( 1, 1, 1, 1, 1, 1, -1, 0);
+	}
+	else if(errtype==1)
+	{
+		fr = pD->genRandomRange( 1, 1, 1, 1, 0, 1, -1, 0);
+	}
+	else if(errtype==2)
+	{
+		fr = pD->genRandomRange( 1, 1, 0, 1, 0, 1, -1, 0);
+	}
+	else if(errtype==3)
+	{
+		fr = pD->genRandomRange( 1, 1, 1, 0, 0, 1, -1, 0);
+	}
+	else if(errtype==4)
+	{
+		fr = pD->genRandomRange( 1, 1, 0, 0, 0, 1, -1, 0);
+	}
+	else if(errtype==5)
+	{
+		fr = pD->genRandomRange( 1, 0, 0, 0, 0, 1, -1, 0);
+	}
+	else if(errtype==6)
+	{
+		fr = pD->genRandomRange( 0, 0, 0, 0, 0, 1, -1, 0);
+	}
+	else if(errtype==7)
+	{
+		fr = pD->genRandomRange( 1, 1, 1, 1, 1, 0, -1, 0);
+	}
+	else if(errtype==8)
+	{
+		fr = pD->genRandomRange( 1, 1, 1, 1, 0, 0, -1, 0);
+	}
+	else if(errtype==9)
+	{
+		fr = pD->genRandomRange( 1, 1, 0, 1, 0, 0, -1, 0);
+	}
+	else if(errtype==10)
+	{
+		fr = pD->genRandomRange( 1, 1, 1, 0, 0, 0, -1, 0);
+	}
+	else if(errtype==11)
+	{
+		fr = pD->genRandomRange( 1, 1, 0, 0, 0, 0, -1, 0);
+	}
+	else if(errtype==12)
+	{
+		fr = pD->genRandomRange( 1, 0, 0, 0, 0, 0, -1, 0);
+	}
+	else if(errtype==13)
+	{
+		fr = pD->genRandomRange( 0, 0, 0, 0, 0, 0, -1, 0);
+	}
+	return fr;
+}
+
+void EventSimulation::initPresample( uint64_t max_s )
+{
+	// expected number of faults per trial of every (chip, fault process), kept as a running sum
+	// so that one uniform draw picks the process of a fault in proportion to its rate
+	list<FaultDomain*> *pChips = m_domains.front()->getChildren();
+	m_presample_rate = 0;
+	for( list<FaultDomain*>::iterator it1 = pChips->begin(); it1 != pChips->end(); it1++ )
+	{
+		DRAMDomain* pD = (DRAMDomain*)(*it1);
+		for(int errtype=0; errtype<DRAM_MAX*2; errtype++)
+		{
+			m_presample_rate += (double)max_s / (pD->hrs_per_fault[errtype] * (60 * 60));
+			m_presample_cumulative.push_back( m_presample_rate );
+			m_presample_chip.push_back( pD );
+			m_presample_errtype.push_back( errtype );
+		}
+	}
+	m_presample_single = true;
+	for( list<FaultDomain*>::iterator it = m_domains.begin(); it != m_domains.end(); it++ ) {
+		if( !(*it)->canRepairSingleFault() ) m_presample_single = false;
+	}
+	m_presample_ready = true;
+
+	if( m_presample_rate * m_is_boost > PRESAMPLE_MAX_MEAN ) {
+		cout << "Presampling disabled: " << m_presample_rate * m_is_boost << " faults per trial expected\n";
+	}
+}
+
+// One fault of a presampled trial: the process is picked in proportion to its (boosted) rate and,
+// given the number of faults in the trial, its time is uniform over the simulated period
+FaultRange *EventSimulation::genPresampledFault( DRAMDomain *pD0, uint64_t max_s )
+{
+	double r = pD0->gen() * m_presample_rate;
+	size_t idx = upper_bound( m_presample_cumulative.begin(), m_presample_cumulative.end(), r ) - m_presample_cumulative.begin();
+	if( idx == m_presample_cumulative.size() ) idx--;
+
+	FaultRange *fr = genEventRange( m_presample_chip[idx], m_presample_errtype[idx] );
+	fr->timestamp = pD0->gen() * max_s;
+	return fr;
+}
+
+// Copy of a trace fault for another top-level domain: same range and time, on the chip with the
+// same position in that domain
+FaultRange *EventSimulation::replayFault( FaultRange *fr, FaultDomain *domain )
+{
+	list<FaultDomain*> *pChips0 = m_domains.front()->getChildren();
+	list<FaultDomain*> *pChips = domain->getChildren();
+	list<FaultDomain*>::iterator it0 = pChips0->begin();
+	list<FaultDomain*>::iterator it = pChips->begin();
+	while( (*it0) != (FaultDomain*)fr->m_pDRAM ) {
+		it0++;
+		it++;
+	}
+
+	DRAMDomain *pDRAM = (DRAMDomain*)(*it);
+	FaultRange *copy = pDRAM->m_pool.alloc();
+	*copy = *fr;
+	copy->m_pDRAM = pDRAM;
+	return copy;
 }
 
 // Event-driven simulation takes over the task of injecting errors into the chips
@@ -48,11 +182,10 @@ EventSimulation::EventSimulation( uint64_t interval_t, uint64_t scrub_interval_t
 uint64_t EventSimulation::runOne( uint64_t max_s, int verbose, uint64_t bin_length)
 {
 	// returns number of uncorrectable simulations
-	priority_queue<FaultRange*, vector<FaultRange*>, CompareFR> q1;
-
-	// reset the domain states e.g. recorded errors for the simulated timeframe
-	reset();
-	uint64_t bin;
+	// The trial's faults are drawn from the chips of the first top-level domain. Further top-level
+	// domains (the other ECC schemes of compare_repairmodes) replay copies of the same fault trace,
+	// so all schemes are evaluated on common random numbers; the result is that of the first one.
+	vector<FaultRange*> trace;
 
 	// New for Event-Driven: set up the time-ordered event list
 	// Get access to a DRAM domain
@@ -60,6 +193,45 @@ uint64_t EventSimulation::runOne( uint64_t max_s, int verbose, uint64_t bin_leng
 
 	int err_inserted = 0;
 
+	// Importance sampling: draw every fault process at is_boost times its rate and weight the trial
+	// by the likelihood ratio of the sampled events, prod( boost^-k * exp( (boost - 1) * rate * max_s ) )
+	double log_weight = 0;
+
+	if( m_presample && !m_presample_ready ) initPresample( max_s );
+
+	// reset the domain states e.g. recorded errors for the simulated timeframe
+	double t0 = profile.enabled ? profileNow() : 0;
+	reset();
+	if( profile.enabled ) {
+		profileAdd( PROF_RESET, t0 );
+		t0 = profileNow();
+	}
+
+	bool presampled = m_presample && m_presample_rate * m_is_boost <= PRESAMPLE_MAX_MEAN;
+	if( presampled ) {
+		// Presampling: draw the trial's total number of faults from the combined Poisson rate first
+		// (by inversion). Trials without faults and most single-fault trials are accounted directly;
+		// the faults of the others are spread over the processes and the period as the independent
+		// processes would have produced them.
+		DRAMDomain *pD0 = (DRAMDomain*)pChips->front();
+		double mean = m_presample_rate * m_is_boost;
+		double p = exp( -mean );
+		double cdf = p;
+		double u = pD0->gen();
+		uint64_t n_faults = 0;
+		while( u > cdf && p > 0 ) {
+			n_faults++;
+			p *= mean / n_faults;
+			cdf += p;
+		}
+		if( m_is_boost != 1.0 ) log_weight = (m_is_boost - 1) * m_presample_rate - n_faults * log( m_is_boost );
+
+		for( uint64_t n = 0; n < n_faults; n++ ) {
+			trace.push_back( genPresampledFault( pD0, max_s ) );
+			err_inserted=1;
+		}
+	} else {
+
 	int devices = 0;
 	for( list<FaultDomain*>::iterator it1 = pChips->begin(); it1 != pChips->end(); it1++ )
 	{
@@ -68,73 +240,17 @@ uint64_t EventSimulation::runOne( uint64_t max_s, int verbose, uint64_t bin_leng
 		for(int errtype=0; errtype<DRAM_MAX*2; errtype++)
 		{
 			double currtime=0;
+			if( m_is_boost != 1.0 ) log_weight += (m_is_boost - 1) * ((double)max_s / (pD->hrs_per_fault[errtype] * (60 * 60)));
 			while(currtime <= ((double)max_s)){
-				period = -1*log(pD->gen())*pD->hrs_per_fault[errtype] * (60 * 60); //Exponential interval in SECONDS
+				period = -1*log(pD->gen())*pD->hrs_per_fault[errtype] * (60 * 60) / m_is_boost; //Exponential interval in SECONDS
 				currtime += period;
 				if(currtime <= max_s){
+					if( m_is_boost != 1.0 ) log_weight -= log( m_is_boost );
 					double timestamp = currtime;
-					FaultRange *fr = NULL;
-					if(errtype==0)
-					{
-						fr = pD->genRandomRange( 1, 1, 1, 1, 1, 1, -1, 0);
-					}
-					else if(errtype==1)
-					{
-						fr = pD->genRandomRange( 1, 1, 1, 1, 0, 1, -1, 0);
-					}
-					else if(errtype==2)
-					{
-						fr = pD->genRandomRange( 1, 1, 0, 1, 0, 1, -1, 0);
-					}
-					else if(errtype==3)
-					{
-						fr = pD->genRandomRange( 1, 1, 1, 0, 0, 1, -1, 0);
-					}
-					else if(errtype==4)
-					{
-						fr = pD->genRandomRange( 1, 1, 0, 0, 0, 1, -1, 0);
-					}
-					else if(errtype==5)
-					{
-						fr = pD->genRandomRange( 1, 0, 0, 0, 0, 1, -1, 0);
-					}
-					else if(errtype==6)
-					{
-						fr = pD->genRandomRange( 0, 0, 0, 0, 0, 1, -1, 0);
-					}
-					else if(errtype==7)
-					{
-						fr = pD->genRandomRange( 1, 1, 1, 1, 1, 0, -1, 0);
-					}
-					else if(errtype==8)
-					{
-						fr = pD->genRandomRange( 1, 1, 1, 1, 0, 0, -1, 0);
-					}
-					else if(errtype==9)
-					{
-						fr = pD->genRandomRange( 1, 1, 0, 1, 0, 0, -1, 0);
-					}
-					else if(errtype==10)
-					{
-						fr = pD->genRandomRange( 1, 1, 1, 0, 0, 0, -1, 0);
-					}
-					else if(errtype==11)
-					{
-						fr = pD->genRandomRange( 1, 1, 0, 0, 0, 0, -1, 0);
-					}
-					else if(errtype==12)
-					{
-						fr = pD->genRandomRange( 1, 0, 0, 0, 0, 0, -1, 0);
-					}
-					else if(errtype==13)
-					{
-						fr = pD->genRandomRange( 0, 0, 0, 0, 0, 0, -1, 0);
-					}
+					FaultRange *fr = genEventRange( pD, errtype );
 
 					fr->timestamp = timestamp;
-					if( fr->transient ) fr->m_pDRAM->n_faults_transient++;
-					else fr->m_pDRAM->n_faults_permanent++;
-					q1.push( fr );
+					trace.push_back( fr );
 					//iter_num_errors++;
 					err_inserted=1;
 				}
@@ -144,6 +260,80 @@ uint64_t EventSimulation::runOne( uint64_t max_s, int verbose, uint64_t bin_leng
 		devices++;
 	}
 
+	// TSV faults of a cube: one event per fault, expanded into the chip's ranges by runEvents
+	m_domains.front()->genTSVEvents( max_s, m_is_boost, log_weight, trace );
+	}
+	m_trial_weight = exp( log_weight );
+
+	if( trace.empty() ) {
+		if( profile.enabled ) profileAdd( PROF_GENERATE, t0 );
+		finalize();
+		return 0;
+	}
+
+	// copy the trace for the other domains before the first one's repairs modify the fault ranges
+	vector< vector<FaultRange*> > events( m_domains.size() );
+	events[0] = trace;
+	list<FaultDomain*>::iterator it = m_domains.begin();
+	for( size_t d = 1; d < m_domains.size(); d++ ) {
+		it++;
+		for( size_t n = 0; n < trace.size(); n++ ) events[d].push_back( replayFault( trace[n], (*it) ) );
+	}
+	if( profile.enabled ) profileAdd( PROF_GENERATE, t0 );
+
+	uint64_t failures = 0;
+	it = m_domains.begin();
+	for( size_t d = 0; d < m_domains.size(); d++, it++ ) {
+		uint64_t failed;
+		if( presampled && m_presample_single && events[d].size() == 1 ) {
+			if( profile.enabled ) t0 = profileNow();
+			failed = runSingleFault( (*it), events[d][0], d * m_bin_stride, bin_length );
+			if( profile.enabled ) profileAdd( PROF_SINGLE, t0 );
+		} else {
+			failed = runEvents( (*it), events[d], d * m_bin_stride, verbose, bin_length );
+		}
+		if( d == 0 ) failures = failed;
+	}
+
+	return failures;
+}
+
+uint64_t EventSimulation::runSingleFault( FaultDomain *domain, FaultRange *fr, uint64_t bin_offset, uint64_t bin_length )
+{
+	// A lone fault is classified from its own range by the repair schemes; the event loop
+	// would see one repair and, for the schemes that can do this, no scrub-time replacement
+	uint64_t bin;
+	domain->insertSingleFault( fr );
+	uint64_t failed = (domain->getFaultCountUndetected() || domain->getFaultCountUncorrected()) ? 1 : 0;
+	if( failed ) {
+		bin = bin_offset + fr->timestamp/bin_length;
+		fail_time_bins[bin]++;
+		if( domain->getFaultCountUncorrected() > 0 )
+		fail_uncorrectable[bin]++;
+		if( domain->getFaultCountUndetected() > 0 )
+		fail_undetectable[bin]++;
+	}
+	domain->finalize();
+	return failed;
+}
+
+uint64_t EventSimulation::runEvents( FaultDomain *domain, vector<FaultRange*> &events, uint64_t bin_offset, int verbose, uint64_t bin_length )
+{
+	// returns 1 if the domain failed in this simulation
+	priority_queue<FaultRange*, vector<FaultRange*>, CompareFR> q1;
+	uint64_t bin;
+	double t0 = profile.enabled ? profileNow() : 0;
+
+	for( size_t n = 0; n < events.size(); n++ ) {
+		FaultRange *fr = events[n];
+		// TSV faults are counted by insertTSVFault, once per failing TSV
+		if( !fr->TSV ) {
+			if( fr->transient ) fr->m_pDRAM->n_faults_transient++;
+			else fr->m_pDRAM->n_faults_permanent++;
+		}
+		q1.push( fr );
+	}
+	if( profile.enabled ) profileAdd( PROF_QUEUE, t0 );
 	// Step through the event list, injecting a fault into corresponding chip at each event, and invoking ECC
 	uint64_t n_undetected = 0;
 	uint64_t n_uncorrected = 0;
@@ -154,25 +344,30 @@ uint64_t EventSimulation::runOne( uint64_t max_s, int verbose, uint64_t bin_leng
 	//Run the Repair function: This will check the correctability/ detectability of the fault(s); Repairing is also done instantaneously
 	while( !q1.empty() ) {
       //  printf("calling repair\n");
+		if( profile.enabled ) t0 = profileNow();
 		FaultRange *fr = q1.top();
+		q1.pop();
+		if( profile.enabled ) profileAdd( PROF_QUEUE, t0 );
 		DRAMDomain *pDRAM = fr->m_pDRAM;
-		pDRAM->m_faultRanges.push_back( fr );
+		if( fr->TSV ) pDRAM->insertTSVFault( fr );
+		else pDRAM->insertRange( fr );
+		if( profile.enabled ) profileLiveRanges( domain );
 
 		if( verbose == 2 ) {
 			// Dump all FaultRanges before
 			cout << "FAULTS INSERTED: BEFORE REPAIR\n";
-			// DR DEBUG check all domains, not just the first one
-			m_domains.front()->dumpState();
+			domain->dumpState();
 		}
 
         	errors=0;
-		m_domains.front()->repair( n_undetected, n_uncorrected );//Calls repair  function
+		if( profile.enabled ) t0 = profileNow();
+		domain->repair( n_undetected, n_uncorrected );//Calls repair  function
+		if( profile.enabled ) profileAdd( PROF_REPAIR, t0 );
 		if( verbose == 2 ) {
 			// Dump all FaultRanges after
 			cout << "FAULTS INSERTED: AFTER REPAIR\n";
-			m_domains.front()->dumpState();
+			domain->dumpState();
 		}
-		q1.pop();
          
        		// printf("ECC Undetected %d Uncorrected %d \n", n_undetected, n_uncorrected); 
 
@@ -180,9 +375,9 @@ uint64_t EventSimulation::runOne( uint64_t max_s, int verbose, uint64_t bin_leng
 		    {
 				if( n_undetected || n_uncorrected ) {
 				// if any iteration fails to repair, halt the simulation and report failure
-				finalize();
+				domain->finalize();
 				//Update the appropriate Bin to log into the output file
-				bin = fr->timestamp/bin_length;
+				bin = bin_offset + fr->timestamp/bin_length;
 				fail_time_bins[bin]++;
 		    
 			if(n_uncorrected>0)
@@ -198,7 +393,7 @@ uint64_t EventSimulation::runOne( uint64_t max_s, int verbose, uint64_t bin_leng
 		    if(n_undetected ||n_uncorrected)
 			{
 			errors++;
-			bin = fr->timestamp/bin_length;
+			bin = bin_offset + fr->timestamp/bin_length;
 				fail_time_bins[bin]++;
 			if(n_uncorrected>0)
 			fail_uncorrectable[bin]++;
@@ -216,20 +411,25 @@ uint64_t EventSimulation::runOne( uint64_t max_s, int verbose, uint64_t bin_leng
 		
 		new_scrubid = fr->timestamp/m_scrub_interval;	
                 if(new_scrubid!=old_scrubid) {
-                        for(list<FaultDomain*>::iterator it = m_domains.begin(); it != m_domains.end(); it++ ) {
-                                (*it)->scrub();
-                                if((*it)->fill_repl()){
-                                        finalize();
-                                        return 1;
-                                }
-			}
+                        if( profile.enabled ) t0 = profileNow();
+                        domain->scrub();
+                        if( profile.enabled ) {
+                                profileAdd( PROF_SCRUB, t0 );
+                                t0 = profileNow();
+                        }
+                        uint64_t repl_failed = domain->fill_repl();
+                        if( profile.enabled ) profileAdd( PROF_FILL_REPL, t0 );
+                        if(repl_failed){
+                                domain->finalize();
+                                return 1;
+                        }
 		}
 		old_scrubid = new_scrubid;
 	} //End of the loop for all faults
 	/***********************************************/
 	//   printf("ECC Undetected %d Uncorrected %d \n", n_undetected, n_uncorrected); 
 
-	finalize();
+	domain->finalize();
     	if(errors>0)
     	return 1;
     	else
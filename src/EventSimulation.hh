@@ -15,12 +15,32 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 
 #include "Simulation.hh"
 
+// Presampling is only used while a trial is expected to have at most this many faults
+#define PRESAMPLE_MAX_MEAN 50.0
+
+class DRAMDomain;
+
 class EventSimulation : public Simulation {
 public:
 	EventSimulation( uint64_t interval_t, uint64_t scrub_interval_t, double fit_factor_t, uint test_mode_t, bool debug_mode_t,
 			     bool cont_running_t, uint64_t output_bucket_t );	
 	// Simulation loop for a single simulation in Event Driven mode
 	virtual uint64_t runOne( uint64_t max_time, int verbose, uint64_t bin_length );
+
+private:
+	void initPresample( uint64_t max_s );
+	FaultRange *genPresampledFault( DRAMDomain *pD0, uint64_t max_s );
+	FaultRange *replayFault( FaultRange *fr, FaultDomain *domain );
+	// Evaluate one top-level domain on its copy of the trial's fault trace
+	uint64_t runEvents( FaultDomain *domain, vector<FaultRange*> &events, uint64_t bin_offset, int verbose, uint64_t bin_length );
+	uint64_t runSingleFault( FaultDomain *domain, FaultRange *fr, uint64_t bin_offset, uint64_t bin_length );
+
+	bool m_presample_ready;
+	bool m_presample_single;	// all repair schemes classify single-fault trials themselves
+	double m_presample_rate;	// expected number of faults per trial (unboosted)
+	vector<double> m_presample_cumulative;
+	vector<DRAMDomain*> m_presample_chip;
+	vector<int> m_presample_errtype;
 };
 
 
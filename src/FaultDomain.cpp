@@ -34,6 +34,19 @@ FaultDomain::FaultDomain( const char *name_t)
 	children_counter=0;
 }
 
+FaultDomain::~FaultDomain()
+{
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		delete (*it);
+	}
+
+	list<RepairScheme*>::iterator itr;
+	for( itr = m_repairSchemes.begin(); itr != m_repairSchemes.end(); itr++ ) {
+		delete (*itr);
+	}
+}
+
 string FaultDomain::getName( void )
 {
 	return m_name;
@@ -49,6 +62,15 @@ void FaultDomain::setDebug( bool dbg )
 	debug = dbg;
 }
 
+void FaultDomain::seed( uint64_t seed_t, uint64_t shard_t, uint64_t segment_t )
+{
+	list<FaultDomain*>::iterator it;
+
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		(*it)->seed( seed_t, shard_t, segment_t );
+	}
+}
+
 void FaultDomain::reset( void )
 {
 	// reset per-simulation statistics used internally
@@ -217,6 +239,124 @@ void FaultDomain::repair( uint64_t &n_undetectable, uint64_t &n_uncorrectable )
 
 	//return n_uncorrectable;
 }
+bool FaultDomain::canRepairSingleFault( void )
+{
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		if( !(*it)->canRepairSingleFault() ) return false;
+	}
+
+	list<RepairScheme*>::iterator itr;
+	for( itr = m_repairSchemes.begin(); itr != m_repairSchemes.end(); itr++ ) {
+		if( !(*itr)->canRepairSingleFault() ) return false;
+	}
+
+	return true;
+}
+
+bool FaultDomain::canCoalesceRanges( void )
+{
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		if( !(*it)->canCoalesceRanges() ) return false;
+	}
+
+	list<RepairScheme*>::iterator itr;
+	for( itr = m_repairSchemes.begin(); itr != m_repairSchemes.end(); itr++ ) {
+		if( !(*itr)->canCoalesceRanges() ) return false;
+	}
+
+	return true;
+}
+
+void FaultDomain::setCoalesceRanges( bool coalesce )
+{
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		(*it)->setCoalesceRanges( coalesce );
+	}
+}
+
+void FaultDomain::setSkipAhead( bool skip_ahead )
+{
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		(*it)->setSkipAhead( skip_ahead );
+	}
+}
+
+uint64_t FaultDomain::nextFaultInterval( void )
+{
+	uint64_t next = NO_FAULT_INTERVAL;
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		uint64_t child_next = (*it)->nextFaultInterval();
+		if( child_next < next ) next = child_next;
+	}
+	return next;
+}
+
+void FaultDomain::setInterval( uint64_t interval )
+{
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		(*it)->setInterval( interval );
+	}
+}
+
+uint64_t FaultDomain::getTransientCount( void )
+{
+	uint64_t n_transient = 0;
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		n_transient += (*it)->getTransientCount();
+	}
+	return n_transient;
+}
+
+void FaultDomain::genTSVEvents( uint64_t max_s, double is_boost, double &log_weight, vector<FaultRange*> &events )
+{
+	// only cubes have fault processes above the chips
+}
+
+void FaultDomain::repairSingleFault( FaultRange *fr, uint64_t &n_undetectable, uint64_t &n_uncorrectable )
+{
+	// same as repair() with fr as the only fault range of the simulation
+	uint64_t faults_before_repair = getFaultCountPerm() + getFaultCountTrans();
+	n_undetectable = n_uncorrectable = faults_before_repair;
+
+	// a domain that doesn't hold fr has nothing to repair
+	if( faults_before_repair == 0 ) return;
+
+	list<RepairScheme*>::iterator itr;
+	for( itr = m_repairSchemes.begin(); itr != m_repairSchemes.end(); itr++ ) {
+		uint64_t uncorrectable_after_repair = 0;
+		uint64_t undetectable_after_repair = 0;
+		(*itr)->repairSingleFault( this, fr, undetectable_after_repair, uncorrectable_after_repair );
+		n_uncorrectable = min( n_uncorrectable, uncorrectable_after_repair );
+		n_undetectable = min( n_undetectable, undetectable_after_repair );
+	}
+}
+
+void FaultDomain::insertSingleFault( FaultRange *fr )
+{
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		(*it)->insertSingleFault( fr );
+	}
+
+	uint64_t n_undetectable, n_uncorrectable;
+	repairSingleFault( fr, n_undetectable, n_uncorrectable );
+
+	if( n_undetectable > 0 ) {
+		n_errors_undetected++;
+	}
+
+	if( n_uncorrectable > 0 ) {
+		n_errors_uncorrected++;
+	}
+}
+
 uint64_t FaultDomain::fill_repl( void )
 {
 	uint64_t n_uncorrectable = 0;
@@ -270,6 +410,21 @@ uint64_t FaultDomain::getFailedSimCount( void )
 	return stat_n_failures;
 }
 
+uint64_t FaultDomain::getSimCount( void )
+{
+	return stat_n_simulations;
+}
+
+uint64_t FaultDomain::getUncorrectedSimCount( void )
+{
+	return stat_n_failures_uncorrected;
+}
+
+uint64_t FaultDomain::getUndetectedSimCount( void )
+{
+	return stat_n_failures_undetected;
+}
+
 void FaultDomain::finalize( void )
 {
 	// walk through all children and observe their error counts
@@ -335,7 +490,53 @@ void FaultDomain::printStats( void )
 	cout << "[" << m_name << "] sims " << stat_n_simulations << " failed_sims " << stat_n_failures
 	     << " rate_raw " << device_fail_rate << " FIT_raw " << FIT_raw
 	     << " rate_uncorr " << uncorrected_fail_rate << " FIT_uncorr " << FIT_uncorr
-	     << " rate_undet " << undetected_fail_rate << " FIT_undet " << FIT_undet << "\n";
+	     << " rate_undet " << undetected_fail_rate << " FIT_undet " << FIT_undet
+	     << " uncorr_sims " << stat_n_failures_uncorrected << " undet_sims " << stat_n_failures_undetected << "\n";
+}
+
+void FaultDomain::writeStats( ostream &out )
+{
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		(*it)->writeStats( out );
+	}
+
+	out << "{";
+	writeStatsFields( out );
+	out << "}\n";
+}
+
+void FaultDomain::writeStatsFields( ostream &out )
+{
+	out << "\"name\": \"" << m_name << "\", \"max_s\": " << m_sim_seconds
+	    << ", \"sims\": " << stat_n_simulations << ", \"failed_sims\": " << stat_n_failures
+	    << ", \"ce_sims\": " << stat_n_failures - stat_n_failures_uncorrected
+	    << ", \"uncorr_sims\": " << stat_n_failures_uncorrected << ", \"undet_sims\": " << stat_n_failures_undetected;
+}
+
+void FaultDomain::saveCheckpoint( ostream &out )
+{
+	out << "domain " << m_name << " " << stat_n_simulations << " " << stat_n_failures
+	    << " " << stat_n_failures_undetected << " " << stat_n_failures_uncorrected << "\n";
+
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		(*it)->saveCheckpoint( out );
+	}
+}
+
+bool FaultDomain::loadCheckpoint( istream &in )
+{
+	string tag, name;
+	in >> tag >> name >> stat_n_simulations >> stat_n_failures
+	   >> stat_n_failures_undetected >> stat_n_failures_uncorrected;
+	if( !in || tag != "domain" || name != m_name ) return false;
+
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		if( !(*it)->loadCheckpoint( in ) ) return false;
+	}
+	return true;
 }
 
 void FaultDomain::resetStats( void )
@@ -16,6 +16,7 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #include <list>
 #include <vector>
 #include <string>
+#include <iostream>
 #include "FaultRange.hh"
 #include "dram_common.hh"
 class RepairScheme;
@@ -26,6 +27,8 @@ class FaultDomain
 {
 public:
 	FaultDomain( const char *name );
+	// deletes the child domains and repair schemes added to this domain
+	virtual ~FaultDomain();
 
 	string getName( void );
 	uint64_t getFaultCountTrans( void );
@@ -33,6 +36,9 @@ public:
 	uint64_t getFaultCountUncorrected( void );
 	uint64_t getFaultCountUndetected( void );
 	uint64_t getFailedSimCount( void );
+	uint64_t getSimCount( void );
+	uint64_t getUncorrectedSimCount( void );
+	uint64_t getUndetectedSimCount( void );
 
 	virtual int update(uint test_mode_t);	// perform one iteration ; Prashant: Changed the update to return a non-void value
 	virtual void repair( uint64_t &n_undetectable, uint64_t &n_uncorrectable );
@@ -46,14 +52,45 @@ public:
 	virtual void finalize( void );
 	// reset after each sim run
 	virtual void reset( void );
+	// Trials with a single fault can be accounted without running the events (see EventSimulation)
+	// if every repair scheme of this domain and its children can classify a lone fault range
+	bool canRepairSingleFault( void );
+	// Fault ranges covered by a permanent range of the same chip can be dropped as they arrive
+	// (see DRAMDomain::insertRange) if no repair scheme of this domain and its children needs them
+	bool canCoalesceRanges( void );
+	virtual void setCoalesceRanges( bool coalesce );
+	// Interval mode with skip_ahead: the chips draw the interval of each fault process's next fault
+	// (see DRAMDomain::update), so the simulation can jump to the first one of any chip
+	virtual void setSkipAhead( bool skip_ahead );
+	virtual uint64_t nextFaultInterval( void );
+	// the next update() is for this interval of the trial
+	virtual void setInterval( uint64_t interval );
+	// number of listed transient ranges, i.e. of the ranges a scrub may remove
+	virtual uint64_t getTransientCount( void );
+	// Event mode: add the faults of this domain's own fault processes (cube TSVs) in one simulated
+	// period to events, drawn at is_boost times their rate with the likelihood ratio added to log_weight
+	virtual void genTSVEvents( uint64_t max_s, double is_boost, double &log_weight, vector<FaultRange*> &events );
+	// repair result of this domain if fr were the only fault
+	void repairSingleFault( FaultRange *fr, uint64_t &n_undetectable, uint64_t &n_uncorrectable );
+	// after reset(), set the per-simulation state to that left by inserting and repairing fr
+	virtual void insertSingleFault( FaultRange *fr );
 	virtual void dumpState( void );
 	void setDebug( bool dbg );
+	// replace the time-of-day seeds with streams derived from (seed, shard, domain index, segment)
+	virtual void seed( uint64_t seed_t, uint64_t shard_t, uint64_t segment_t );
 	void setFIT_TSV(bool isTransient_TSV, double FIT_TSV );
 	void update_cube();
 
 	list<FaultDomain*> *getChildren( void );
 	virtual void resetStats( void );
 	virtual void printStats( void );	// output end-of-run stats
+	// end-of-run stats as NDJSON, one record per domain in printStats order
+	void writeStats( ostream &out );
+	// exact counters of this domain as JSON object members
+	virtual void writeStatsFields( ostream &out );
+	// save / restore the cross-simulation statistics of this domain and its children
+	virtual void saveCheckpoint( ostream &out );
+	virtual bool loadCheckpoint( istream &in );
 
 //private:
 	string m_name;
@@ -15,6 +15,7 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #include "DRAMDomain.hh"
 #include "FaultRange.hh"
 #include "dram_common.hh"
+#include "Profile.hh"
 
 FaultRange::FaultRange( DRAMDomain *pDRAM ) :
 m_pDRAM(pDRAM)
@@ -27,6 +28,7 @@ m_pDRAM(pDRAM)
 	recent_touched=false;
 	max_faults=0;
 	TSV = false;
+	seq = 0;
 	
 	// Event-driven FaultSim
 	timestamp = 0;
@@ -67,6 +69,7 @@ bool FaultRange::intersectsSlow( FaultRange *fr )
 
 bool FaultRange::intersects( FaultRange *fr )
 {
+	if( profile.enabled ) profile.intersects++;
 	uint64_t fAddr0 = fAddr;
 	uint64_t fMask0 = fWildMask;
 	uint64_t fAddr1 = fr->fAddr;
@@ -92,6 +95,12 @@ bool FaultRange::intersects( FaultRange *fr )
 	return result;
 }
 
+bool FaultRange::covers( FaultRange *fr )
+{
+	// every wildcard bit of fr is wild here too, and the bits fixed here match fr's address
+	return ( (fr->fWildMask & ~fWildMask) == 0 ) && ( ((fAddr ^ fr->fAddr) & ~fWildMask) == 0 );
+}
+
 string FaultRange::toString( void )
 {
 	char buf[100];
@@ -26,6 +26,8 @@ public:
 	FaultRange( DRAMDomain *pDRAM );
 	// does this FR intersect with the supplied FR?
 	bool intersects( FaultRange *fr );
+	// does this FR contain every address of the supplied FR?
+	bool covers( FaultRange *fr );
 	// How many bits in any sym_bits-wide symbol could be faulty?
 	//uint64_t maxFaultyBits( uint64_t sym_bits );
 	string toString( void );	// for debugging
@@ -40,6 +42,7 @@ public:
 	bool recent_touched;
 	uint64_t max_faults;
     	uint32_t Chip;  // Chip location of this fault range.
+	uint64_t seq;	// insertion order in its chip's fault list (DRAMDomain::insertRange)
 	
 	// For Event-driven simulation
 	double timestamp;	// time in seconds at which teh FR was inserted
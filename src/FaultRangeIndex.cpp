@@ -0,0 +1,126 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#include "FaultRangeIndex.hh"
+#include "DRAMDomain.hh"
+#include "FaultRange.hh"
+#include "Profile.hh"
+#include <algorithm>
+#include <assert.h>
+
+FaultRangeIndex::FaultRangeIndex( void )
+{
+	m_layout = false;
+	m_bank_mask = 0;
+	m_row_mask = 0;
+}
+
+vector<FaultRangeIndex::Entry> *FaultRangeIndex::bucketOf( uint64_t fAddr, uint64_t fWildMask, uint64_t &key )
+{
+	if( fWildMask & m_bank_mask ) {
+		key = 0;
+		return &m_wide;
+	} else if( fWildMask & m_row_mask ) {
+		key = fAddr & m_bank_mask;
+		return &m_banks;
+	} else {
+		key = fAddr & (m_bank_mask | m_row_mask);
+		return &m_rows;
+	}
+}
+
+void FaultRangeIndex::insert( FaultRange *fr, uint32_t chip )
+{
+	if( !m_layout ) {
+		// address layout from genRandomRange: rank, bank, row, column, bit
+		DRAMDomain *pDRAM = fr->m_pDRAM;
+		uint32_t row_lsb = pDRAM->getLogCols() + pDRAM->getLogBits();
+		uint32_t bank_lsb = row_lsb + pDRAM->getLogRows();
+		uint32_t all_bits = bank_lsb + pDRAM->getLogBanks() + pDRAM->getLogRanks();
+		m_bank_mask = (((uint64_t)1 << all_bits) - 1) & ~(((uint64_t)1 << bank_lsb) - 1);
+		m_row_mask = (((uint64_t)1 << bank_lsb) - 1) & ~(((uint64_t)1 << row_lsb) - 1);
+		m_layout = true;
+	}
+
+	Entry entry = { 0, fr->fAddr, fr->fWildMask, fr, chip };
+	vector<Entry> *bucket = bucketOf( fr->fAddr, fr->fWildMask, entry.key );
+	if( bucket == &m_wide ) {
+		m_wide.push_back( entry );
+	} else {
+		bucket->insert( upper_bound( bucket->begin(), bucket->end(), entry ), entry );
+	}
+}
+
+void FaultRangeIndex::remove( FaultRange *fr, uint64_t fAddr, uint64_t fWildMask )
+{
+	uint64_t key;
+	vector<Entry> *bucket = bucketOf( fAddr, fWildMask, key );
+	Entry probe = { key, 0, 0, NULL, 0 };
+	vector<Entry>::iterator it = (bucket == &m_wide) ? m_wide.begin() : lower_bound( bucket->begin(), bucket->end(), probe );
+
+	for( ; it != bucket->end(); it++ ) {
+		if( it->fr == fr ) {
+			bucket->erase( it );
+			return;
+		}
+	}
+	assert(0);
+}
+
+void FaultRangeIndex::clear( void )
+{
+	m_rows.clear();
+	m_banks.clear();
+	m_wide.clear();
+}
+
+void FaultRangeIndex::query( uint64_t fAddr, uint64_t fWildMask, vector<Entry> &matches )
+{
+	matches.clear();
+
+	if( fWildMask & m_bank_mask ) {
+		// a multi-bank or rank wide query can meet anything
+		scan( m_rows.begin(), m_rows.end(), fAddr, fWildMask, matches );
+		scan( m_banks.begin(), m_banks.end(), fAddr, fWildMask, matches );
+	} else {
+		uint64_t bank = fAddr & m_bank_mask;
+		if( fWildMask & m_row_mask ) {
+			// every range of the bank
+			scanKeys( m_rows, bank, bank | m_row_mask, fAddr, fWildMask, matches );
+		} else {
+			// ranges of the same row
+			uint64_t row = fAddr & (m_bank_mask | m_row_mask);
+			scanKeys( m_rows, row, row, fAddr, fWildMask, matches );
+		}
+		scanKeys( m_banks, bank, bank, fAddr, fWildMask, matches );
+	}
+	scan( m_wide.begin(), m_wide.end(), fAddr, fWildMask, matches );
+}
+
+void FaultRangeIndex::scanKeys( vector<Entry> &entries, uint64_t lo, uint64_t hi, uint64_t fAddr, uint64_t fWildMask, vector<Entry> &matches )
+{
+	Entry first = { lo, 0, 0, NULL, 0 };
+	Entry last = { hi, 0, 0, NULL, 0 };
+	scan( lower_bound( entries.begin(), entries.end(), first ), upper_bound( entries.begin(), entries.end(), last ),
+		  fAddr, fWildMask, matches );
+}
+
+void FaultRangeIndex::scan( vector<Entry>::iterator first, vector<Entry>::iterator last, uint64_t fAddr, uint64_t fWildMask, vector<Entry> &matches )
+{
+	if( profile.enabled ) profile.intersects += last - first;
+	for( vector<Entry>::iterator it = first; it != last; it++ )
+	{
+		// same test as FaultRange::intersects
+		if( ((fAddr ^ it->fAddr) & ~(fWildMask | it->fWildMask)) == 0 ) matches.push_back( (*it) );
+	}
+}
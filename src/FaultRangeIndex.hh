@@ -0,0 +1,63 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#ifndef FAULTRANGEINDEX_HH_
+#define FAULTRANGEINDEX_HH_
+
+#include "boost/cstdint.hpp"
+#include <vector>
+
+class FaultRange;
+
+using namespace std;
+
+// Spatial index over the live fault ranges of all chips in a module, used by the repair schemes
+// so that an intersection query only visits ranges that could intersect it.
+// Ranges whose rank/bank/row address bits are fully specified are kept sorted by those bits,
+// ranges wild in the row (column and bank faults) are kept sorted by their rank/bank bits, and
+// ranges that are wild in the rank or bank (multi-bank and rank faults) are kept in a separate
+// list that every query scans. Ranges are inserted and removed as they appear and get scrubbed.
+class FaultRangeIndex
+{
+public:
+	struct Entry {
+		uint64_t key;
+		uint64_t fAddr, fWildMask;	// copied so that queries never touch the FaultRange itself
+		FaultRange *fr;
+		uint32_t chip;
+		bool operator<( const Entry &other ) const { return key < other.key; }
+	};
+
+	FaultRangeIndex( void );
+
+	void insert( FaultRange *fr, uint32_t chip );
+	// remove a range, given the address and mask it was inserted with
+	void remove( FaultRange *fr, uint64_t fAddr, uint64_t fWildMask );
+	void clear( void );
+	// collect every indexed range that intersects the range (fAddr, fWildMask)
+	void query( uint64_t fAddr, uint64_t fWildMask, vector<Entry> &matches );
+
+private:
+	vector<Entry> *bucketOf( uint64_t fAddr, uint64_t fWildMask, uint64_t &key );
+	void scan( vector<Entry>::iterator first, vector<Entry>::iterator last, uint64_t fAddr, uint64_t fWildMask, vector<Entry> &matches );
+	void scanKeys( vector<Entry> &entries, uint64_t lo, uint64_t hi, uint64_t fAddr, uint64_t fWildMask, vector<Entry> &matches );
+
+	bool m_layout;	// masks below are set from the first inserted range's chip
+	uint64_t m_bank_mask;	// rank/bank address bits
+	uint64_t m_row_mask;	// row address bits
+	vector<Entry> m_rows;	// rank/bank/row fixed, sorted by rank/bank/row
+	vector<Entry> m_banks;	// rank/bank fixed but row wild, sorted by rank/bank
+	vector<Entry> m_wide;	// wild in rank or bank
+};
+
+#endif /* FAULTRANGEINDEX_HH_ */
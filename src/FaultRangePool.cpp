@@ -0,0 +1,51 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#include "FaultRangePool.hh"
+#include "DRAMDomain.hh"
+#include "FaultRange.hh"
+#include <new>
+
+FaultRangePool::FaultRangePool( DRAMDomain *pDRAM ) :
+m_pDRAM(pDRAM)
+{
+	m_n_used = 0;
+}
+
+FaultRangePool::~FaultRangePool()
+{
+	for( size_t c = 0; c < m_chunks.size(); c++ ) {
+		for( uint64_t i = 0; i < FR_POOL_CHUNK; i++ ) m_chunks[c][i].~FaultRange();
+		::operator delete( m_chunks[c] );
+	}
+}
+
+FaultRange *FaultRangePool::alloc( void )
+{
+	uint64_t chunk = m_n_used / FR_POOL_CHUNK;
+	if( chunk == m_chunks.size() ) {
+		FaultRange *ranges = static_cast<FaultRange*>( ::operator new( FR_POOL_CHUNK * sizeof(FaultRange) ) );
+		for( uint64_t i = 0; i < FR_POOL_CHUNK; i++ ) new( &ranges[i] ) FaultRange( m_pDRAM );
+		m_chunks.push_back( ranges );
+	}
+
+	FaultRange *fr = &m_chunks[chunk][m_n_used % FR_POOL_CHUNK];
+	*fr = FaultRange( m_pDRAM );
+	m_n_used++;
+	return fr;
+}
+
+void FaultRangePool::clear( void )
+{
+	m_n_used = 0;
+}
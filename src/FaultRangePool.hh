@@ -0,0 +1,47 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#ifndef FAULTRANGEPOOL_HH_
+#define FAULTRANGEPOOL_HH_
+
+#include "boost/cstdint.hpp"
+#include <vector>
+
+class FaultRange;
+class DRAMDomain;
+
+using namespace std;
+
+// number of FaultRanges allocated together in one contiguous block
+#define FR_POOL_CHUNK 64
+
+// Per-chip arena for the chip's FaultRanges. Ranges are handed out from contiguous blocks that
+// are kept for the whole run; clear() makes every range of the trial available again at once,
+// so steady-state trials do no heap allocation for their faults and never delete them one by one.
+class FaultRangePool
+{
+public:
+	FaultRangePool( DRAMDomain *pDRAM );
+	~FaultRangePool();
+
+	// a freshly initialized range of this chip, valid until the next clear()
+	FaultRange *alloc( void );
+	void clear( void );
+
+private:
+	DRAMDomain *m_pDRAM;
+	vector<FaultRange*> m_chunks;	// FR_POOL_CHUNK ranges each
+	uint64_t m_n_used;
+};
+
+#endif /* FAULTRANGEPOOL_HH_ */
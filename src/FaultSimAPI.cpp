@@ -0,0 +1,206 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#include <string>
+#include <sstream>
+#include <vector>
+#include <list>
+#include <exception>
+#include <string.h>
+#include <boost/property_tree/ptree.hpp>
+#include <boost/property_tree/ini_parser.hpp>
+
+#include "faultsim.hh"
+#include "ConfigParser.hh"
+#include "GroupDomain.hh"
+#include "DRAMDomain.hh"
+#include "Simulation.hh"
+#include "Settings.hh"
+#include "ModuleBuilder.hh"
+#include "Profile.hh"
+#include "FaultSimAPI.hh"
+
+extern struct Settings settings;
+
+struct FaultSimRun
+{
+	struct Settings settings;	// installed as the global settings while this run simulates
+	std::string config_file;
+	Simulation *sim;
+	vector<FaultDomain*> domains;
+	vector<string> names;
+	vector<string> module_names;
+};
+
+static std::string api_error;
+
+// domains in the order of FaultDomain::printStats
+static void collectDomains( FaultDomain *domain, FaultSimRun *run )
+{
+	list<FaultDomain*> *children = domain->getChildren();
+	for( list<FaultDomain*>::iterator it = children->begin(); it != children->end(); it++ ) {
+		collectDomains( (*it), run );
+	}
+	run->domains.push_back( domain );
+	run->names.push_back( domain->getName() );
+}
+
+void *faultsim_create( const char *config_file, const char *overrides )
+{
+	try {
+		boost::property_tree::ptree pt;
+		boost::property_tree::ini_parser::read_ini( config_file, pt );
+
+		std::stringstream lines( overrides ? overrides : "" );
+		std::string line;
+		while( getline( lines, line ) ) {
+			size_t eq = line.find( '=' );
+			if( line.find_first_not_of( " \t\r" ) == std::string::npos ) continue;
+			if( eq == std::string::npos ) {
+				api_error = "override is not Section.key=value: " + line;
+				return NULL;
+			}
+			pt.put( line.substr( 0, eq ), line.substr( eq + 1 ) );
+		}
+
+		parseConfig( pt );
+	} catch( std::exception &e ) {
+		api_error = e.what();
+		return NULL;
+	}
+	settings.output_file = "";
+	settings.checkpoint_s = 0;
+	settings.in_process = true;
+
+	vector<int> repairmodes;
+	std::string error = parseRepairmodes( repairmodes );
+	if( error.empty() ) error = checkSettings( repairmodes );
+	if( error.empty() && settings.sim_mode != 1 && settings.sim_mode != 2 ) {
+		error = "Invalid sim_mode option (must be 1 (interval-based) or 2 (event-driven))";
+	}
+	// checked here because the Simulation constructor would exit the calling process
+	if( error.empty() && (settings.interval_s == 0 || settings.scrub_s % settings.interval_s != 0) ) {
+		error = "Scrub interval must be a multiple of simulation time step interval";
+	}
+	if( error.empty() && settings.is_boost != 1.0 ) {
+		error = "is_boost is not supported in-process (the weighted statistics are only printed by faultsim)";
+	}
+	if( !error.empty() ) {
+		api_error = error;
+		return NULL;
+	}
+
+	FaultSimRun *run = new FaultSimRun;
+	run->settings = settings;
+	run->config_file = config_file;
+	run->sim = genSimulation();
+
+	list<GroupDomain*> modules = genModules( repairmodes );
+	for( list<GroupDomain*>::iterator it = modules.begin(); it != modules.end(); it++ ) {
+		if( settings.seed != 0 ) (*it)->seed( settings.seed, settings.shard, 0 );
+		run->sim->addDomain( (*it) );
+		run->module_names.push_back( (*it)->getName() );
+		collectDomains( (*it), run );
+	}
+
+	run->sim->init( settings.max_s );
+	run->sim->setImportanceBoost( settings.is_boost );
+	run->sim->setPresample( settings.presample );
+	run->sim->setCoalesceRanges( settings.coalesce_ranges );
+	run->sim->setSkipAhead( settings.skip_ahead );
+	run->sim->setProgress( settings.progress_s, settings.progress_file );
+	run->sim->setConvergenceTarget( settings.ci_target, settings.ci_confidence, settings.ci_method, settings.ci_rates, settings.ci_batch );
+	return run;
+}
+
+const char *faultsim_error( void )
+{
+	return api_error.c_str();
+}
+
+uint64_t faultsim_simulate( void *run_t )
+{
+	FaultSimRun *run = (FaultSimRun*)run_t;
+	settings = run->settings;
+	profileReset( !settings.profile_file.empty() );
+	run->sim->simulate( settings.max_s, settings.n_sims, settings.verbose, "", settings.output_format );
+	if( profile.enabled ) writeProfile( settings.profile_file, run->config_file, settings.sim_mode );
+	return run->sim->getSimCount();
+}
+
+void faultsim_destroy( void *run_t )
+{
+	FaultSimRun *run = (FaultSimRun*)run_t;
+	delete run->sim;
+	delete run;
+}
+
+void faultsim_run_info( void *run_t, uint64_t *info )
+{
+	FaultSimRun *run = (FaultSimRun*)run_t;
+	info[0] = run->sim->getSimCount();
+	info[1] = run->settings.max_s;
+	info[2] = run->settings.output_bucket_s;
+}
+
+uint64_t faultsim_domain_count( void *run_t )
+{
+	return ((FaultSimRun*)run_t)->domains.size();
+}
+
+const char *faultsim_domain_name( void *run_t, uint64_t i )
+{
+	return ((FaultSimRun*)run_t)->names[i].c_str();
+}
+
+void faultsim_domain_stats( void *run_t, uint64_t i, uint64_t *stats )
+{
+	FaultDomain *domain = ((FaultSimRun*)run_t)->domains[i];
+	stats[0] = domain->getSimCount();
+	stats[1] = domain->getFailedSimCount();
+	stats[2] = domain->getUncorrectedSimCount();
+	stats[3] = domain->getUndetectedSimCount();
+}
+
+int faultsim_domain_class_counts( void *run_t, uint64_t i, uint64_t *transient, uint64_t *permanent )
+{
+	DRAMDomain *pDRAM = dynamic_cast<DRAMDomain*>( ((FaultSimRun*)run_t)->domains[i] );
+	if( pDRAM == NULL ) return 0;
+	pDRAM->getClassCounts( transient, permanent );
+	return DRAM_MAX + 1;
+}
+
+uint64_t faultsim_module_count( void *run_t )
+{
+	return ((FaultSimRun*)run_t)->module_names.size();
+}
+
+const char *faultsim_module_name( void *run_t, uint64_t m )
+{
+	return ((FaultSimRun*)run_t)->module_names[m].c_str();
+}
+
+uint64_t faultsim_bin_count( void *run_t )
+{
+	FaultSimRun *run = (FaultSimRun*)run_t;
+	return run->settings.max_s / run->settings.output_bucket_s;
+}
+
+void faultsim_histogram( void *run_t, uint64_t m, uint64_t *fail, uint64_t *uncorrectable, uint64_t *undetectable )
+{
+	FaultSimRun *run = (FaultSimRun*)run_t;
+	uint64_t n_bins = faultsim_bin_count( run_t );
+	memcpy( fail, run->sim->getFailBins( m ), n_bins * sizeof(uint64_t) );
+	memcpy( uncorrectable, run->sim->getUncorrectableBins( m ), n_bins * sizeof(uint64_t) );
+	memcpy( undetectable, run->sim->getUndetectableBins( m ), n_bins * sizeof(uint64_t) );
+}
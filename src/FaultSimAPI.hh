@@ -0,0 +1,55 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#ifndef FAULTSIMAPI_HH_
+#define FAULTSIMAPI_HH_
+
+#include <stdint.h>
+
+// C interface of libfaultsim.so (make lib) for running simulations in-process, e.g. from
+// Python through ctypes (faultsim_lib.py), without spawning faultsim and parsing its log.
+// The simulator keeps its settings in a global, so runs must not be simulated concurrently.
+
+extern "C" {
+
+// Build the memory organization and simulator of a config file. overrides holds one
+// "Section.key=value" line per setting to change, e.g. "Sim.n_sims=10000\nSim.seed=4" (may be NULL).
+// Returns NULL on error, see faultsim_error().
+void *faultsim_create( const char *config_file, const char *overrides );
+const char *faultsim_error( void );
+// Run the configured number of trials; returns the number of trials run
+uint64_t faultsim_simulate( void *run );
+void faultsim_destroy( void *run );
+
+// trials run, max_s and output bucket seconds
+void faultsim_run_info( void *run, uint64_t *info );
+
+// All domains in the order of the printed statistics (chips before their module)
+uint64_t faultsim_domain_count( void *run );
+const char *faultsim_domain_name( void *run, uint64_t i );
+// sims, failed_sims, uncorr_sims and undet_sims of domain i
+void faultsim_domain_stats( void *run, uint64_t i, uint64_t *stats );
+// transient and permanent fault counts per class (DRAM_MAX + 1 entries each, the last one TSV);
+// returns the number of entries written, 0 if domain i is not a chip
+int faultsim_domain_class_counts( void *run, uint64_t i, uint64_t *transient, uint64_t *permanent );
+
+// Top-level modules (one per compare repairmode) and their failure-time histograms
+uint64_t faultsim_module_count( void *run );
+const char *faultsim_module_name( void *run, uint64_t m );
+uint64_t faultsim_bin_count( void *run );
+// FAULT, UNCORRECTABLE and UNDETECTABLE counts of module m, faultsim_bin_count() entries each
+void faultsim_histogram( void *run, uint64_t m, uint64_t *fail, uint64_t *uncorrectable, uint64_t *undetectable );
+
+}
+
+#endif /* FAULTSIMAPI_HH_ */
@@ -11,7 +11,10 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 */
 
 #include "GroupDomain_cube.hh"
+#include "DRAMDomain.hh"
 #include <iostream>
+#include <algorithm>
+#include <math.h>
 #include <stdlib.h>
 #include <ctime>
 #include <sys/time.h>
@@ -147,6 +150,14 @@ int GroupDomain_cube::update( uint test_mode_t )
 	return newfault;
 }
 
+void GroupDomain_cube::seed( uint64_t seed_t, uint64_t shard_t, uint64_t segment_t )
+{
+	FaultDomain::seed( seed_t, shard_t, segment_t );
+	seedStream( gen.engine(), seed_t, shard_t, children_counter, STREAM_GROUP, segment_t );
+	// TSV locations are drawn from eng directly
+	seedStream( eng, seed_t, shard_t, children_counter, STREAM_FAULT_LOC, segment_t );
+}
+
 void GroupDomain_cube::setFIT( int faultClass, bool isTransient, double FIT )
 {
 	assert(0);
@@ -161,6 +172,10 @@ void GroupDomain_cube::init( uint64_t interval, uint64_t max_s, double fit_facto
 	m_sim_seconds = max_s;
 	m_fit_factor = fit_factor;
 
+	// For Event Driven sim
+	tsv_hrs_per_fault[0] = ((double)1000000000.0) / (tsv_transientFIT * fit_factor);
+	tsv_hrs_per_fault[1] = ((double)1000000000.0) / (tsv_permanentFIT * fit_factor);
+
 	double sec_per_hour = 60 * 60;
 	double interval_factor = (interval / sec_per_hour) / 1000000000.0;
 	tsv_transientFIT = (double)1.0 - exp( -tsv_transientFIT * fit_factor * interval_factor );
@@ -173,6 +188,52 @@ void GroupDomain_cube::init( uint64_t interval, uint64_t max_s, double fit_facto
 	FaultDomain::init( interval, max_s, fit_factor );
 }
 
+void GroupDomain_cube::reset( void )
+{
+	FaultDomain::reset();
+
+	// failed TSVs belong to one simulation, like the fault ranges of the chips
+	if(enable_tsv)
+	{
+		fill( tsv_bitmap, tsv_bitmap + total_tsv, false );
+		fill( tsv_info, tsv_info + total_tsv, 0 );
+	}
+}
+
+void GroupDomain_cube::genTSVEvents( uint64_t max_s, double is_boost, double &log_weight, vector<FaultRange*> &events )
+{
+	if(!enable_tsv) return;
+
+	// a data TSV is read by one chip (see DRAMDomain::update); faults of the other TSVs don't reach memory contents
+	vector<DRAMDomain*> pChips;
+	list<FaultDomain*>::iterator it;
+	for( it = m_children.begin(); it != m_children.end(); it++ ) {
+		pChips.push_back( (DRAMDomain*)(*it) );
+	}
+
+	for( int tsvtype = 0; tsvtype < 2; tsvtype++ )
+	{
+		double currtime = 0;
+		if( is_boost != 1.0 ) log_weight += (is_boost - 1) * ((double)max_s / (tsv_hrs_per_fault[tsvtype] * (60 * 60)));
+		while( currtime <= ((double)max_s) ) {
+			currtime += -1*log(gen())*tsv_hrs_per_fault[tsvtype] * (60 * 60) / is_boost; //Exponential interval in SECONDS
+			if( currtime > max_s ) break;
+
+			if( is_boost != 1.0 ) log_weight -= log( is_boost );
+			if( tsvtype == 0 ) tsv_n_faults_transientFIT_class++;
+			else tsv_n_faults_permanentFIT_class++;
+
+			uint64_t location = eng()%total_tsv;
+			if( location / cube_data_tsv >= pChips.size() ) continue;
+
+			// the chip expands the fault into its ranges when the event is processed (DRAMDomain::insertTSVFault)
+			FaultRange *fr = pChips[location / cube_data_tsv]->genTSVRange( location % cube_data_tsv, 0, tsvtype == 0 );
+			fr->timestamp = currtime;
+			events.push_back( fr );
+		}
+	}
+}
+
 void GroupDomain_cube::generateRanges( int faultClass )
 {
 
@@ -31,13 +31,19 @@ class GroupDomain_cube : public GroupDomain
 	void setFIT( int faultClass, bool isTransient, double FIT );
 	void init( uint64_t interval, uint64_t max_s, double fit_factor );
 	int update( uint test_mode_t );	// perform one iteration
+	void seed( uint64_t seed_t, uint64_t shard_t, uint64_t segment_t );
 	void setFIT_TSV(bool isTransient_TSV, double FIT_TSV );
+	void reset( void );
+	void genTSVEvents( uint64_t max_s, double is_boost, double &log_weight, vector<FaultRange*> &events );
 	protected:
 	void generateRanges( int faultClass ); // based on a fault, create all faulty address ranges
 	
 	ENG  eng;
 	DIST dist;
 	GEN  gen;
+
+	// Parameters for event-driven simulation (hours per TSV fault, transient followed by permanent)
+	double tsv_hrs_per_fault[2];
 };
 
 
@@ -34,6 +34,12 @@ int GroupDomain_dimm::update( uint test_mode_t )
 	return FaultDomain::update(test_mode_t);
 }
 
+void GroupDomain_dimm::seed( uint64_t seed_t, uint64_t shard_t, uint64_t segment_t )
+{
+	FaultDomain::seed( seed_t, shard_t, segment_t );
+	seedStream( gen.engine(), seed_t, shard_t, children_counter, STREAM_GROUP, segment_t );
+}
+
 void GroupDomain_dimm::setFIT( int faultClass, bool isTransient, double FIT )
 {
 }
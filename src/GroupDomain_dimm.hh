@@ -31,6 +31,7 @@ class GroupDomain_dimm : public GroupDomain
 	void setFIT( int faultClass, bool isTransient, double FIT );
 	void init( uint64_t interval, uint64_t max_s, double fit_factor );
 	int update( uint test_mode_t );	// perform one iteration
+	void seed( uint64_t seed_t, uint64_t shard_t, uint64_t segment_t );
 	protected:
 	void generateRanges( int faultClass ); // based on a fault, create all faulty address ranges
 	
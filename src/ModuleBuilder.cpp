@@ -0,0 +1,270 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#include <iostream>
+#include <string>
+#include <sstream>
+#include <stdlib.h>
+#include <stdio.h>
+
+#include "faultsim.hh"
+#include "GroupDomain.hh"
+#include "GroupDomain_dimm.hh"
+#include "GroupDomain_cube.hh"
+#include "DRAMDomain.hh"
+#include "ChipKillRepair.hh"
+#include "ChipKillRepair_cube.hh"
+#include "BCHRepair_cube.hh"
+#include "CubeRAIDRepair.hh"
+#include "BCHRepair.hh"
+#include "Simulation.hh"
+#include "EventSimulation.hh"
+#include "Settings.hh"
+#include "ModuleBuilder.hh"
+
+extern struct Settings settings;
+
+const char *REPAIRMODE_TAGS[] = { "NONE", "CK1", "CK2", "SECDED", "3EC4ED", "6EC7ED" };
+
+string parseRepairmodes( vector<int> &repairmodes )
+{
+	repairmodes.clear();
+	std::stringstream modes( settings.compare_repairmodes );
+	std::string mode;
+	while( getline( modes, mode, ',' ) ) {
+		int repairmode = atoi( mode.c_str() );
+		if( mode.find_first_not_of( " 0123456789" ) != std::string::npos || repairmode < 0 || repairmode > 5 ) {
+			return "Invalid repairmode " + mode + " in compare_repairmodes (must be 0-5)";
+		}
+		repairmodes.push_back( repairmode );
+	}
+	return "";
+}
+
+string checkSettings( const vector<int> &repairmodes )
+{
+	if( settings.is_boost <= 0 || (settings.is_boost != 1.0 && settings.sim_mode != 2) ) {
+		return "is_boost must be positive and requires the event-driven simulator (sim_mode 2)";
+	}
+	if( settings.presample && settings.sim_mode != 2 ) {
+		return "presample requires the event-driven simulator (sim_mode 2)";
+	}
+	// presampling only knows the fault processes of the chips
+	if( settings.presample && settings.organization == MO_3D && settings.enable_tsv ) {
+		return "presample does not support TSV faults (enable_tsv)";
+	}
+	// test_mode injects faults in every interval, and the TSV faults of cubes are still drawn per interval
+	if( settings.skip_ahead && (settings.sim_mode != 1 || settings.test_mode != 0 || (settings.organization == MO_3D && settings.enable_tsv)) ) {
+		return "skip_ahead requires the interval simulator (sim_mode 1) without test_mode and without TSV faults";
+	}
+	// Common random numbers: one module per listed ECC type, all replaying the same fault trace per trial
+	if( !repairmodes.empty() && (settings.sim_mode != 2 || settings.organization != MO_DIMM || settings.is_boost != 1.0) ) {
+		return "compare_repairmodes requires the event-driven simulator (sim_mode 2), a DIMM organization and is_boost = 1";
+	}
+	return "";
+}
+
+list<GroupDomain*> genModules( const vector<int> &repairmodes )
+{
+	list<GroupDomain*> modules;
+
+	if( !repairmodes.empty() ) {
+		for( size_t i = 0; i < repairmodes.size(); i++ ) {
+			modules.push_back( genModuleDIMM( string("MODULE0-") + REPAIRMODE_TAGS[repairmodes[i]], repairmodes[i] ) );
+		}
+	} else if( settings.organization == MO_DIMM ) {
+		modules.push_back( genModuleDIMM( string("MODULE0"), settings.repairmode ) );
+	} else if( settings.organization == MO_3D ) {
+		modules.push_back( genModule3D() );
+	}
+
+	return modules;
+}
+
+Simulation *genSimulation( void )
+{
+	// Simulator settings are as follows: 
+	// a. The setting.interval_s (in seconds) indicates the granularity of inserting faults 
+	// (not used in Event Based Simulator). 
+	// b. The setting.scrub_s (in seconds) indicates the granularity of scrubbing transient faults.
+	// c. The setting.fit_factor indicates the multiplicative factor for fit_rates. 
+	// d. The setting.debug will enable debug messages
+	// e. The setting.continue_running will enable uses to continue running even if an uncorrectable error occurs 
+	// (until an undetectable error occurs.
+	// f. The settings.output_bucket_s wil bucket system failure times
+	// NOTE: The test_mode setting allows the user to inject specific faults at very FIT rates. This enables the user to test their
+	// ECC technique and also stress corner cases for fault specific ECC.
+	// NOTE: The test_mode setting is currently not implemented in the Event Based Simulator
+
+	if( settings.sim_mode == 1 ) {
+		return (new Simulation( settings.interval_s, settings.scrub_s, settings.fit_factor, settings.test_mode,
+		                        settings.debug,settings.continue_running, settings.output_bucket_s ));
+	} else if( settings.sim_mode == 2 ) {
+		return (new EventSimulation( settings.interval_s, settings.scrub_s, settings.fit_factor, settings.test_mode,
+		                             settings.debug,settings.continue_running, settings.output_bucket_s ));
+	}
+	return NULL;
+}
+
+/*
+ * Simulate a DIMM module
+ */
+
+GroupDomain* genModuleDIMM( string name, int repairmode )
+{
+	GroupDomain *dimm0;
+
+	// Create a DIMM or a CUBE
+	// settings.data_block_bits is the number of bits per transaction when you create a DIMM
+
+	dimm0 = new GroupDomain_dimm( name.c_str(), settings.chips_per_rank, settings.banks, settings.data_block_bits );
+
+	for( uint32_t i = 0; i < settings.chips_per_rank; i++ ) {
+		char buf[64];
+		sprintf( buf, "%s.DRAM%d", name.c_str(), i );
+		DRAMDomain *dram0 = new DRAMDomain( buf, settings.chip_bus_bits, settings.ranks, settings.banks, settings.rows, settings.cols, settings.chips_per_rank );
+
+		if( settings.faultmode == FM_UNIFORM_BIT ) {
+			if( settings.enable_transient ) dram0->setFIT( DRAM_1BIT, 1, 33.05 );
+			if( settings.enable_permanent ) dram0->setFIT( DRAM_1BIT, 0, 33.05 );
+		} else if( settings.faultmode == FM_JAGUAR ) {
+			if( settings.enable_transient ) {
+				dram0->setFIT( DRAM_1BIT, 1, 50.28 );
+				dram0->setFIT( DRAM_1WORD, 1, 0.0 );
+				dram0->setFIT( DRAM_1COL, 1, 17.4715 );
+				dram0->setFIT( DRAM_1ROW, 1, 1.83706 );
+				dram0->setFIT( DRAM_1BANK, 1, 19.5283 );
+				dram0->setFIT( DRAM_NBANK, 1, 0.1816 );
+				dram0->setFIT( DRAM_NRANK, 1, 0.19514 );
+			}
+
+			if( settings.enable_permanent ) {
+				dram0->setFIT( DRAM_1BIT, 0, 76.68 );
+				dram0->setFIT( DRAM_1WORD, 0, 0.0 );
+				dram0->setFIT( DRAM_1COL, 0, 5.81738 );
+				dram0->setFIT( DRAM_1ROW, 0, 14.3127 );
+				dram0->setFIT( DRAM_1BANK, 0, 7.92444 );
+				dram0->setFIT( DRAM_NBANK, 0, 0.365924 );
+				dram0->setFIT( DRAM_NRANK, 0, 0.989311 );
+			}
+		} else {
+			assert(0);
+		}
+
+		dimm0->addDomain( dram0, i );
+	}
+
+	//Add the 2D Repair Schemes
+	if( repairmode == 0 ) {
+		// do nothing (no ECC)
+	} else if( repairmode == 1 ) {
+		ChipKillRepair *ck0 = new ChipKillRepair( string("CK1"), 1, 2 );
+		dimm0->addRepair( ck0 );
+	} else if( repairmode == 2 ) {
+		ChipKillRepair *ck0 = new ChipKillRepair( string("CK2"), 2, 4 );
+		dimm0->addRepair( ck0 );
+	} else if( repairmode == 3 ) {
+		BCHRepair *bch0 = new BCHRepair( string("SECDED"), 1, 2, 4 );
+		dimm0->addRepair( bch0 );
+	} else if( repairmode == 4 ) {
+		BCHRepair *bch1 = new BCHRepair( string("3EC4ED"), 3, 4, 4 );
+		dimm0->addRepair( bch1 ); //Repair from Fault Domain
+	} else if( repairmode == 5 ) {
+		BCHRepair *bch2 = new BCHRepair( string("6EC7ED"), 6, 7, 4 );
+		dimm0->addRepair( bch2 );
+	} else {
+		assert(0);
+	}
+
+	return dimm0;
+}
+
+GroupDomain *genModule3D( void )
+{
+	GroupDomain *stack0;
+
+	// Create a stack or a CUBE
+	// settings.data_block_bits is the number of bits per transaction when you create a Cube
+	         
+	stack0 = new GroupDomain_cube( "MODULE0",1,settings.chips_per_rank,settings.banks,settings.data_block_bits,settings.cube_addr_dec_depth, settings.cube_ecc_tsv, settings.cube_redun_tsv, settings.enable_tsv);
+
+	//Set FIT rates for TSVs, these are set at the GroupDomain level as these are common to the entire cube
+	stack0->setFIT_TSV( 1, settings.tsv_fit );
+	stack0->setFIT_TSV( 0, settings.tsv_fit );
+
+	// Set FIT rates for different granularity for all devices in the module and add devices into the module
+	double DRAM_nrank_fit_trans = 0;
+	double DRAM_nrank_fit_perm = 0;
+
+	// Rank FIT rates cannot be directly translated to 3D stack
+	DRAM_nrank_fit_trans = 0.0;
+	DRAM_nrank_fit_perm = 0.0;
+
+	for( uint32_t i = 0; i < settings.chips_per_rank; i++ ) {
+		char buf[20];
+		sprintf( buf, "MODULE0.DRAM%d", i );
+		DRAMDomain *dram0 = new DRAMDomain( buf, settings.chip_bus_bits, settings.ranks, settings.banks, settings.rows, settings.cols, settings.chips_per_rank );
+
+		if( settings.faultmode == FM_UNIFORM_BIT ) {
+			// use a default FIT rate equal to probability of any Jaguar fault
+			if( settings.enable_transient ) dram0->setFIT( DRAM_1BIT, 1, 33.05 );
+			if( settings.enable_permanent ) dram0->setFIT( DRAM_1BIT, 0, 33.05 );
+		} else if( settings.faultmode == FM_JAGUAR ) {
+			if( settings.enable_transient ) {
+				dram0->setFIT( DRAM_1BIT, 1, 14.2 );
+				dram0->setFIT( DRAM_1WORD, 1, 1.4 );
+				dram0->setFIT( DRAM_1COL, 1, 1.4 );
+				dram0->setFIT( DRAM_1ROW, 1, 0.2 );
+				dram0->setFIT( DRAM_1BANK, 1, 0.8 );
+				dram0->setFIT( DRAM_NBANK, 1, 0.3 );
+				dram0->setFIT( DRAM_NRANK, 1, DRAM_nrank_fit_trans );
+			}
+
+			if( settings.enable_permanent ) {
+				dram0->setFIT( DRAM_1BIT, 0, 18.6 );
+				dram0->setFIT( DRAM_1WORD, 0, 0.3 );
+				dram0->setFIT( DRAM_1COL, 0, 5.6 );
+				dram0->setFIT( DRAM_1ROW, 0, 8.2 );
+				dram0->setFIT( DRAM_1BANK, 0, 10.0 );
+				dram0->setFIT( DRAM_NBANK, 0, 1.4 );
+				dram0->setFIT( DRAM_NRANK, 0, DRAM_nrank_fit_perm );
+			}
+		} else {
+			assert(0);
+		}
+
+		stack0->addDomain( dram0, i );
+	}
+
+	if( settings.repairmode == 1 ) {
+		ChipKillRepair_cube *ck0 = new ChipKillRepair_cube( string("CK1"), 1, 2, stack0);
+		stack0->addRepair( ck0 );
+	} else if( settings.repairmode == 2 ) {
+		CubeRAIDRepair *ck1 = new CubeRAIDRepair( string("RAID"), 1, 2, settings.data_block_bits );
+		stack0->addRepair( ck1 ); //settings.data_block_bits used as RAID is computed over 512 bits (in our design)
+	} else if( settings.repairmode == 3 ) {
+		BCHRepair_cube *bch0 = new BCHRepair_cube( string("SECDED"), 1, 2, settings.data_block_bits );
+		stack0->addRepair( bch0 ); //settings.data_block_bits used as SECDED/3EC4ED/6EC7ED is computed over 512 bits (in our design)
+	} else if( settings.repairmode == 4 ) {
+		BCHRepair_cube *bch1 = new BCHRepair_cube( string("3EC4ED"), 3, 4, settings.data_block_bits );
+		stack0->addRepair( bch1 ); //Repair from Fault Domain
+	} else if( settings.repairmode == 5 ) {
+		BCHRepair_cube *bch2 = new BCHRepair_cube( string("6EC7ED"), 6, 7, settings.data_block_bits );
+		stack0->addRepair( bch2 );
+	}
+	else if( settings.repairmode == 6 ) {
+		assert(0);
+	}
+
+	return stack0;
+}
@@ -0,0 +1,43 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#ifndef MODULEBUILDER_HH_
+#define MODULEBUILDER_HH_
+
+#include <list>
+#include <vector>
+#include <string>
+
+class GroupDomain;
+class Simulation;
+
+using namespace std;
+
+// Construction of the memory organization and the simulator from the global settings, shared by
+// the faultsim executable (main.cpp) and the in-process library interface (FaultSimAPI.cpp)
+
+// module name suffixes of the DIMM repairmodes in compare_repairmodes runs (MODULE0-<tag>)
+extern const char *REPAIRMODE_TAGS[];
+
+GroupDomain* genModuleDIMM( string name, int repairmode );
+GroupDomain* genModule3D( void );
+// parse settings.compare_repairmodes into repairmodes; returns an error message, empty if valid
+string parseRepairmodes( vector<int> &repairmodes );
+// check the settings for combinations the simulator does not support; returns an error message, empty if valid
+string checkSettings( const vector<int> &repairmodes );
+// one DIMM per compare repairmode, otherwise the configured DIMM or 3D stack
+list<GroupDomain*> genModules( const vector<int> &repairmodes );
+// interval-based or event-driven simulator for settings.sim_mode (NULL if invalid)
+Simulation *genSimulation( void );
+
+#endif /* MODULEBUILDER_HH_ */
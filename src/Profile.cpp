@@ -0,0 +1,86 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#include <iostream>
+#include <fstream>
+#include <list>
+#include <string.h>
+
+#include "Profile.hh"
+#include "DRAMDomain.hh"
+
+struct Profile profile;
+
+static const char *phase_names[PROF_MAX] = { "reset", "generate", "queue", "repair", "scrub", "fill_repl", "single_fault" };
+
+void profileReset( bool enabled )
+{
+	memset( &profile, 0, sizeof(profile) );
+	profile.enabled = enabled;
+}
+
+static uint64_t liveRanges( FaultDomain *domain )
+{
+	DRAMDomain *pDRAM = dynamic_cast<DRAMDomain*>( domain );
+	if( pDRAM != NULL ) return pDRAM->getRanges()->size();
+
+	uint64_t n = 0;
+	list<FaultDomain*> *children = domain->getChildren();
+	for( list<FaultDomain*>::iterator it = children->begin(); it != children->end(); it++ ) {
+		n += liveRanges( (*it) );
+	}
+	return n;
+}
+
+void profileLiveRanges( FaultDomain *domain )
+{
+	uint64_t n = liveRanges( domain );
+	if( n > profile.trial_peak ) profile.trial_peak = n;
+}
+
+void profileEndTrial( void )
+{
+	int bucket = 0;
+	while( bucket < PROF_PEAK_BUCKETS - 1 && (profile.trial_peak >> bucket) != 0 ) bucket++;
+
+	profile.sims++;
+	profile.peak_hist[bucket]++;
+	profile.peak_sum += profile.trial_peak;
+	if( profile.trial_peak > profile.peak_max ) profile.peak_max = profile.trial_peak;
+	profile.trial_peak = 0;
+}
+
+void writeProfile( std::string profile_file, std::string config_file, int sim_mode )
+{
+	ofstream out( profile_file.c_str() );
+	if( !out.is_open() ) {
+		cout << "ERROR: profile file " << profile_file << ": opening failed\n" << endl;
+		return;
+	}
+
+	out << "{\"config\": \"" << config_file << "\", \"sim_mode\": " << sim_mode
+	    << ", \"sims\": " << profile.sims << ", \"wall_s\": " << profile.wall_s << ", \"phases\": {";
+	for( int p = 0; p < PROF_MAX; p++ ) {
+		out << (p ? ", " : "") << "\"" << phase_names[p] << "\": {\"s\": " << profile.phase_s[p]
+		    << ", \"calls\": " << profile.phase_calls[p] << "}";
+	}
+	out << "}, \"intersects\": " << profile.intersects << ", \"ranges_absorbed\": " << profile.ranges_absorbed
+	    << ", \"faults_transient\": [";
+	for( int i = 0; i < DRAM_MAX; i++ ) out << (i ? ", " : "") << profile.faults_transient[i];
+	out << "], \"faults_permanent\": [";
+	for( int i = 0; i < DRAM_MAX; i++ ) out << (i ? ", " : "") << profile.faults_permanent[i];
+	out << "], \"peak_ranges_max\": " << profile.peak_max << ", \"peak_ranges_sum\": " << profile.peak_sum
+	    << ", \"peak_ranges_hist\": [";
+	for( int i = 0; i < PROF_PEAK_BUCKETS; i++ ) out << (i ? ", " : "") << profile.peak_hist[i];
+	out << "]}\n";
+}
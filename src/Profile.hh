@@ -0,0 +1,78 @@
+/*
+Copyright (c) 2015, Advanced Micro Devices, Inc. All rights reserved.
+
+Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+*/
+
+
+#ifndef PROFILE_HH_
+#define PROFILE_HH_
+
+#include <stdint.h>
+#include <string>
+#include <time.h>
+#include "dram_common.hh"
+
+class FaultDomain;
+
+// Phases of a trial timed by the profiler
+#define PROF_RESET      0	// resetting the domains before a trial
+#define PROF_GENERATE   1	// drawing the trial's faults (event mode) or DRAMDomain::update (interval mode)
+#define PROF_QUEUE      2	// ordering the events by time (event mode)
+#define PROF_REPAIR     3	// repair schemes
+#define PROF_SCRUB      4	// scrubbing transient faults
+#define PROF_FILL_REPL  5	// fill_repl after scrubbing
+#define PROF_SINGLE     6	// presampled single-fault trials classified without the event loop
+#define PROF_MAX        7
+
+// Per-trial peaks of live fault ranges are counted in power-of-two buckets: 0, 1, 2-3, 4-7, ...
+#define PROF_PEAK_BUCKETS 40
+
+// Opt-in instrumentation of the simulation loop (profile_file / --profile). All counters cover the
+// trials run by this process and are written as one JSON record by writeProfile.
+struct Profile
+{
+	bool enabled;
+	double wall_s;				// time spent in the trial loop
+	uint64_t sims;
+	double phase_s[PROF_MAX];
+	uint64_t phase_calls[PROF_MAX];
+	uint64_t intersects;		// fault range intersection tests (FaultRange::intersects and index scans)
+	uint64_t ranges_absorbed;	// fault ranges dropped by range coalescing (DRAMDomain::insertRange)
+	uint64_t faults_transient[DRAM_MAX];	// faults generated per class
+	uint64_t faults_permanent[DRAM_MAX];
+	uint64_t trial_peak;		// most live fault ranges of a top-level domain during the current trial
+	uint64_t peak_max;
+	uint64_t peak_sum;
+	uint64_t peak_hist[PROF_PEAK_BUCKETS];	// trials by their peak
+};
+
+extern struct Profile profile;
+
+static inline double profileNow( void )
+{
+	struct timespec ts;
+	clock_gettime( CLOCK_MONOTONIC, &ts );
+	return ts.tv_sec + ts.tv_nsec * 1e-9;
+}
+
+// add the time since start to a phase
+static inline void profileAdd( int phase, double start )
+{
+	profile.phase_s[phase] += profileNow() - start;
+	profile.phase_calls[phase]++;
+}
+
+void profileReset( bool enabled );
+// note the live fault ranges of a domain (summed over its chips) for the trial's peak
+void profileLiveRanges( FaultDomain *domain );
+void profileEndTrial( void );
+void writeProfile( std::string profile_file, std::string config_file, int sim_mode );
+
+#endif /* PROFILE_HH_ */
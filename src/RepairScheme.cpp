@@ -23,6 +23,18 @@ uint64_t RepairScheme::fill_repl (FaultDomain *fd)
 {
 	return 1;
 }
+bool RepairScheme::canRepairSingleFault( void )
+{
+	return false;
+}
+bool RepairScheme::canCoalesceRanges( void )
+{
+	return false;
+}
+void RepairScheme::repairSingleFault( FaultDomain *fd, FaultRange *fr, uint64_t &n_undetectable, uint64_t &n_uncorrectable )
+{
+	n_undetectable = n_uncorrectable = 1;
+}
 void RepairScheme::printStats( void )
 {
 }
@@ -21,11 +21,18 @@ class RepairScheme
 {
 public:
 	RepairScheme( string name );
+	virtual ~RepairScheme() {}
 	string getName( void );
 
 	virtual void repair( FaultDomain *fd, uint64_t &n_undetectable, uint64_t &n_uncorrectable ) = 0;
 	virtual uint64_t fill_repl (FaultDomain *fd);
 	virtual void clear_counters (void)=0;
+	// can the scheme tell the repair result of a lone fault range without seeing the simulation?
+	virtual bool canRepairSingleFault( void );
+	// repair result if fr were the only fault in fd, without inserting it
+	virtual void repairSingleFault( FaultDomain *fd, FaultRange *fr, uint64_t &n_undetectable, uint64_t &n_uncorrectable );
+	// is the repair result unchanged when a range covered by a permanent range of the same chip is dropped?
+	virtual bool canCoalesceRanges( void );
 
 	void printStats( void );
 	void resetStats( void );
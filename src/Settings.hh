@@ -25,6 +25,24 @@ public:
 	int verbose;			// Enable or disable runtime output
 	bool debug; 			// TODO document
 	uint64_t output_bucket_s; // Seconds per output histogram bucket
+	int output_format;		// Output histogram format (OF_CSV or OF_BINARY)
+	std::string stats_file;	// One NDJSON statistics record per domain is written here at the end ("" = off)
+	uint64_t progress_s;	// Wall-clock seconds between progress reports (0 = off, per-trial characters with verbose)
+	std::string progress_file;	// Progress reports are written to this JSON status file instead of stderr ("" = stderr)
+	std::string profile_file;	// Per-phase timings and counters of the trial loop are written here as JSON ("" = off)
+	uint64_t checkpoint_s;	// Wall-clock seconds between checkpoints to <output_file>.ckpt (0 = off)
+	double ci_target;		// Stop once the CI relative half-width of the tracked rates is below this (0 = run n_sims)
+	double ci_confidence;	// Confidence level of the early-stopping intervals
+	int ci_method;			// CI_WILSON or CI_CLOPPER_PEARSON
+	int ci_rates;			// Tracked rates, CI_RATE_UNCORR (default) | CI_RATE_UNDET
+	uint64_t ci_batch;		// Trials between convergence checks
+	double is_boost;		// Importance sampling: fault arrival rate multiplier in event mode (1 = off)
+	bool presample;			// Event mode: draw each trial's fault count first, 0/1-fault trials skip the event loop
+	bool coalesce_ranges;		// Drop fault ranges covered by a permanent range of the same chip
+	bool skip_ahead;		// Interval mode: draw the interval of each process's next fault, skip the intervals without one
+	uint64_t seed;			// Base random seed (0 = seed from the time of day)
+	uint64_t shard;			// Shard index, mixed into every seed so parallel shards get independent streams
+	bool in_process;		// Running inside libfaultsim (FaultSimAPI): per-chip init messages only with verbose
 
 	// Memory system physical configuration
 	int organization;	// Which topology to simulate e.g. DIMM or 3D stack
@@ -48,4 +66,5 @@ public:
 
 	// ECC configuration
 	int repairmode;     // Type of ECC to apply
+	std::string compare_repairmodes;	// e.g. "0,3,1": evaluate these DIMM ECC types on the same fault traces (event mode)
 };
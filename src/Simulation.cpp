@@ -13,15 +13,38 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #include "boost/cstdint.hpp"
 #include "Simulation.hh"
 #include "FaultDomain.hh"
+#include "faultsim.hh"
+#include "Profile.hh"
 #include <list>
 #include <iostream>
 #include <fstream>
 #include <iomanip>
 #include <stdio.h>
+#include <time.h>
+#include <math.h>
+#include <boost/math/distributions/normal.hpp>
+#include <boost/math/distributions/beta.hpp>
 #define __STDC_FORMAT_MACROS
 #include <inttypes.h>
+#include <unistd.h>
+#include <sys/time.h>
 using namespace std;
 
+#define CHECKPOINT_VERSION 2
+
+// indices of the importance-sampling indicator sums
+#define IS_RAW    0
+#define IS_UNCORR 1
+#define IS_UNDET  2
+
+
+// wall-clock seconds with microsecond resolution, for the progress rate
+static double wallSeconds( void )
+{
+	struct timeval tv;
+	gettimeofday( &tv, NULL );
+	return tv.tv_sec + tv.tv_usec * 1e-6;
+}
 
 Simulation::Simulation( uint64_t interval_t, uint64_t scrub_interval_t, double fit_factor_t , uint test_mode_t, bool debug_mode_t, bool cont_running_t, uint64_t output_bucket_t) :
 				  m_interval(interval_t)
@@ -33,6 +56,21 @@ Simulation::Simulation( uint64_t interval_t, uint64_t scrub_interval_t, double f
 , m_output_bucket(output_bucket_t)
 {
 	m_iteration = 0;	// start at time zero
+	m_checkpoint_s = 0;
+	m_segment = 0;
+	m_resumed = false;
+	m_ci_target = 0;
+	m_ci_confidence = 0.95;
+	m_ci_method = CI_WILSON;
+	m_ci_rates = CI_RATE_UNCORR;
+	m_ci_batch = 10000;
+	m_is_boost = 1.0;
+	m_trial_weight = 1.0;
+	m_presample = false;
+	m_skip_ahead = false;
+	m_progress_s = 0;
+	fail_time_bins = fail_uncorrectable = fail_undetectable = NULL;
+	m_bin_stride = 0;
 
 	if( (m_scrub_interval%m_interval) != 0 ) {
 		cout << "ERROR: Scrub interval must be a multiple of simulation time step interval\n";
@@ -40,6 +78,18 @@ Simulation::Simulation( uint64_t interval_t, uint64_t scrub_interval_t, double f
 	}
 }
 
+Simulation::~Simulation()
+{
+	delete [] fail_time_bins;
+	delete [] fail_uncorrectable;
+	delete [] fail_undetectable;
+
+	list<FaultDomain*>::iterator it;
+	for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
+		delete (*it);
+	}
+}
+
 void Simulation::addDomain( FaultDomain *domain )
 {
 	domain->setDebug( debug_mode );
@@ -82,32 +132,30 @@ void Simulation::resetStats( void )
 	/* Hamoci: Initialize CE */
 	stat_total_ce = 0;
 	/* Hamoci */
+
+	is_sum_w = is_sum_w2 = 0;
+	for( int k = 0; k < 3; k++ ) is_sum_wy[k] = is_sum_wy2[k] = 0;
 }
 
-void Simulation::simulate( uint64_t max_time, uint64_t n_sims, int verbose, std::string output_file)
+void Simulation::simulate( uint64_t max_time, uint64_t n_sims, int verbose, std::string output_file, int output_format )
 {
-	//Reset Stats before starting any simulation
-	resetStats();
-
-	//Additional feature to dump logs to a outfile in the ./Results directory
-	ofstream opfile;
+	//Reset Stats before starting any simulation (a resumed run keeps the counters loaded from its checkpoint)
+	if( !m_resumed ) {
+		resetStats();
+		allocateBins( max_time );
+	}
 
 	uint64_t bin_length = m_output_bucket;
 
 	//Max time of simulation in seconds
 	stat_sim_seconds = max_time;
 
-	//Number of bins that the output file will have
-	fail_time_bins = new uint64_t[max_time/bin_length];
-	fail_uncorrectable = new uint64_t[max_time/bin_length];
-	fail_undetectable = new uint64_t[max_time/bin_length];
-
-	for( uint i = 0; i < max_time/bin_length; i++ )
-	{
-		fail_time_bins[i] = 0;
-		fail_uncorrectable[i]=0;
-		fail_undetectable[i]=0;
-	}
+	time_t next_checkpoint = time( NULL ) + m_checkpoint_s;
+	m_progress_start = wallSeconds();
+	m_progress_first = stat_total_sims;
+	time_t next_progress = time( NULL ) + m_progress_s;
+	// progress reports replace the per-trial characters
+	bool trial_chars = verbose && !m_progress_s;
 
 	if( verbose )
 	{
@@ -116,30 +164,60 @@ void Simulation::simulate( uint64_t max_time, uint64_t n_sims, int verbose, std:
 		cout << "# ===================================================================\n\n";
 	}
 
+	double loop_start = profile.enabled ? profileNow() : 0;
+
 	/**************************************************************
 	 * MONTE CARLO SIMULATION LOOP : THIS IS THE HEART OF FAULTSIM *
 	 **************************************************************/
-	for( uint64_t i = 0; i < n_sims; i++ ) {
+	for( uint64_t i = stat_total_sims; i < n_sims; i++ ) {
+
+		FaultDomain *top = m_domains.front();
+		uint64_t before[3] = { top->getFailedSimCount(), top->getUncorrectedSimCount(), top->getUndetectedSimCount() };
 
 		uint64_t failures = runOne( max_time, verbose, bin_length);
 		stat_total_sims++;
+		if( profile.enabled ) profileEndTrial();
+
+		if( m_is_boost != 1.0 ) {
+			uint64_t after[3] = { top->getFailedSimCount(), top->getUncorrectedSimCount(), top->getUndetectedSimCount() };
+			is_sum_w += m_trial_weight;
+			is_sum_w2 += m_trial_weight * m_trial_weight;
+			for( int k = 0; k < 3; k++ ) {
+				double wy = (after[k] != before[k]) ? m_trial_weight : 0.0;
+				is_sum_wy[k] += wy;
+				is_sum_wy2[k] += wy * wy;
+			}
+		}
 
 		uint64_t trans, perm;
 		getFaultCounts( &trans, &perm );
 		if( failures != 0 ) {
 			stat_total_failures++;
-			if( verbose ) cout << "F";  // uncorrected
+			if( trial_chars ) cout << "F";  // uncorrected
 		} else if( trans + perm != 0 ) {
 			stat_total_ce++;
-			if( verbose ) cout << "C";	// corrected
+			if( trial_chars ) cout << "C";	// corrected
 		} else {
-			if( verbose ) cout << ".";  // no failures
+			if( trial_chars ) cout << ".";  // no failures
+		}
+
+		if( m_progress_s && time( NULL ) >= next_progress ) {
+			reportProgress( n_sims, false );
+			next_progress = time( NULL ) + m_progress_s;
 		}
 
-		if( verbose ) fflush(stdout);
+		if( m_checkpoint_s && time( NULL ) >= next_checkpoint ) {
+			saveCheckpoint( max_time, n_sims );
+			next_checkpoint = time( NULL ) + m_checkpoint_s;
+		}
+
+		if( m_ci_target > 0 && (stat_total_sims % m_ci_batch) == 0 && converged( false ) ) break;
 	}
 	/**************************************************************/
 
+	if( profile.enabled ) profile.wall_s += profileNow() - loop_start;
+	if( m_progress_s ) reportProgress( n_sims, true );
+
 	if( verbose )
 	{
 		cout << "\n\n# ===================================================================\n";
@@ -147,6 +225,356 @@ void Simulation::simulate( uint64_t max_time, uint64_t n_sims, int verbose, std:
 		cout << "# ===================================================================\n";
 	}
 
+	if( m_ci_target > 0 ) {
+		if( stat_total_sims < n_sims ) cout << "Early stopping after " << stat_total_sims << " of " << n_sims << " sims\n";
+		bool done = converged( true );
+		cout << (done ? "Converged" : "Target not reached") << endl;
+	}
+
+	//Additional feature to dump logs to a outfile in the ./Results directory
+	//(probabilities are over the trials actually run, which early stopping can make fewer than n_sims)
+	//(with several top-level domains, each gets its own file named after it; no file without a name)
+	uint64_t first_bin = 0;
+	list<FaultDomain*>::iterator it;
+	for( it = m_domains.begin(); !output_file.empty() && it != m_domains.end(); it++ ) {
+		std::string domain_file = output_file;
+		if( m_domains.size() > 1 ) domain_file = domainOutputFile( output_file, (*it)->getName() );
+		if( output_format == OF_BINARY ) {
+			writeHistogramBinary( domain_file, max_time, stat_total_sims, first_bin );
+		} else {
+			writeHistogramCSV( domain_file, max_time, stat_total_sims, first_bin );
+		}
+		first_bin += m_bin_stride;
+	}
+}
+
+// Histogram file of one of several top-level domains: the domain name is inserted before the extension
+// e.g. results.csv -> results_MODULE0-SECDED.csv
+std::string Simulation::domainOutputFile( std::string output_file, std::string domain_name )
+{
+	size_t dot = output_file.rfind( '.' );
+	size_t slash = output_file.rfind( '/' );
+	if( dot == std::string::npos || (slash != std::string::npos && dot < slash) ) return output_file + "_" + domain_name;
+	return output_file.substr( 0, dot ) + "_" + domain_name + output_file.substr( dot );
+}
+
+void Simulation::setImportanceBoost( double is_boost )
+{
+	m_is_boost = is_boost;
+}
+
+void Simulation::setPresample( bool presample )
+{
+	m_presample = presample;
+}
+
+void Simulation::setSkipAhead( bool skip_ahead )
+{
+	m_skip_ahead = skip_ahead;
+
+	list<FaultDomain*>::iterator it;
+	for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
+		(*it)->setSkipAhead( skip_ahead );
+	}
+}
+
+void Simulation::setCoalesceRanges( bool coalesce )
+{
+	list<FaultDomain*>::iterator it;
+	for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
+		bool allowed = coalesce && (*it)->canCoalesceRanges();
+		if( coalesce && !allowed ) {
+			cout << "Range coalescing disabled for " << (*it)->getName() << ": its repair schemes need every fault range\n";
+		}
+		(*it)->setCoalesceRanges( allowed );
+	}
+}
+
+// Weighted importance-sampling estimate of P(Y) and the variance of that estimate
+static void importanceEstimate( double sum_wy, double sum_wy2, uint64_t n, double &mean, double &var )
+{
+	mean = n ? sum_wy / n : 0;
+	var = (n > 1) ? (sum_wy2 / n - mean * mean) / (n - 1) : 0;
+	if( var < 0 ) var = 0;
+}
+
+void Simulation::setConvergenceTarget( double ci_target, double ci_confidence, int ci_method, int ci_rates, uint64_t ci_batch )
+{
+	m_ci_target = ci_target;
+	m_ci_confidence = ci_confidence;
+	m_ci_method = ci_method;
+	m_ci_rates = ci_rates;
+	m_ci_batch = ci_batch ? ci_batch : 1;
+}
+
+// Two-sided interval [lo, hi] for a binomial proportion with k successes out of n trials
+static void binomialInterval( uint64_t k, uint64_t n, double confidence, int method, double &lo, double &hi )
+{
+	double alpha = 1.0 - confidence;
+
+	if( method == CI_CLOPPER_PEARSON ) {
+		// exact interval from beta quantiles
+		lo = (k == 0) ? 0.0 : boost::math::quantile( boost::math::beta_distribution<>( k, n - k + 1 ), alpha / 2 );
+		hi = (k == n) ? 1.0 : boost::math::quantile( boost::math::beta_distribution<>( k + 1, n - k ), 1 - alpha / 2 );
+	} else {
+		double z = boost::math::quantile( boost::math::normal(), 1 - alpha / 2 );
+		double p = (double)k / n;
+		double denom = 1 + z * z / n;
+		double centre = (p + z * z / (2.0 * n)) / denom;
+		double half = z * sqrt( p * (1 - p) / n + z * z / (4.0 * n * n) ) / denom;
+		lo = centre - half;
+		hi = centre + half;
+	}
+}
+
+bool Simulation::converged( bool report )
+{
+	// The rates are the ones FaultDomain::printStats reports for each top-level domain;
+	// a rate with no failures yet has an unbounded relative width, so it only counts as converged
+	// once another tracked rate of the same domain has (e.g. rate_undet stays 0 under SECDED/ChipKill)
+	bool done = true;
+	list<FaultDomain*>::iterator it;
+
+	for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
+		uint64_t n = (*it)->getSimCount();
+		uint64_t counts[2] = { (*it)->getUncorrectedSimCount(), (*it)->getUndetectedSimCount() };
+		int masks[2] = { CI_RATE_UNCORR, CI_RATE_UNDET };
+		const char *names[2] = { "rate_uncorr", "rate_undet" };
+		double rates[2] = { 0, 0 }, widths[2] = { INFINITY, INFINITY }, los[2] = { 0, 0 }, his[2] = { 1, 1 };
+		bool any_converged = false;
+
+		for( int r = 0; r < 2; r++ ) {
+			if( !(m_ci_rates & masks[r]) ) continue;
+
+			rates[r] = n ? (double)counts[r] / n : 0;
+			if( m_is_boost != 1.0 && it == m_domains.begin() ) {
+				// weighted trials: normal interval on the importance-sampling estimate
+				double var;
+				double z = boost::math::quantile( boost::math::normal(), 1 - (1 - m_ci_confidence) / 2 );
+				importanceEstimate( is_sum_wy[r + 1], is_sum_wy2[r + 1], stat_total_sims, rates[r], var );
+				los[r] = rates[r] - z * sqrt( var );
+				his[r] = rates[r] + z * sqrt( var );
+				if( rates[r] > 0 ) widths[r] = z * sqrt( var ) / rates[r];
+			} else if( n > 0 && counts[r] > 0 ) {
+				binomialInterval( counts[r], n, m_ci_confidence, m_ci_method, los[r], his[r] );
+				widths[r] = (his[r] - los[r]) / 2 / rates[r];
+			}
+			if( widths[r] <= m_ci_target ) any_converged = true;
+		}
+
+		for( int r = 0; r < 2; r++ ) {
+			if( !(m_ci_rates & masks[r]) ) continue;
+
+			bool ignored = (rates[r] == 0 && any_converged);
+			if( !(widths[r] <= m_ci_target) && !ignored ) done = false;
+
+			if( report ) {
+				cout << "  " << (*it)->getName() << " " << names[r] << " " << rates[r]
+				     << " CI [" << los[r] << ", " << his[r] << "] rel_half_width " << widths[r]
+				     << " target " << m_ci_target << (ignored ? " (no events, ignored)" : "") << "\n";
+			}
+		}
+	}
+
+	return done;
+}
+
+void Simulation::allocateBins( uint64_t max_time )
+{
+	//Number of bins that the output file will have, for each top-level domain one after the other;
+	//each domain has a spare bin for failures in the last, partial bucket (those are not written out)
+	m_bin_stride = max_time/m_output_bucket + 1;
+	uint64_t n_bins = m_bin_stride * m_domains.size();
+	delete [] fail_time_bins;
+	delete [] fail_uncorrectable;
+	delete [] fail_undetectable;
+	fail_time_bins = new uint64_t[n_bins];
+	fail_uncorrectable = new uint64_t[n_bins];
+	fail_undetectable = new uint64_t[n_bins];
+
+	for( uint i = 0; i < n_bins; i++ )
+	{
+		fail_time_bins[i] = 0;
+		fail_uncorrectable[i]=0;
+		fail_undetectable[i]=0;
+	}
+}
+
+// Position of the i-th written-out bin (domain by domain, without the spare bins) in the bin arrays
+uint64_t Simulation::binIndex( uint64_t i, uint64_t max_time )
+{
+	uint64_t n_bins = max_time/m_output_bucket;
+	return (i / n_bins) * m_bin_stride + (i % n_bins);
+}
+
+list<FaultDomain*> *Simulation::getDomains( void )
+{
+	return &m_domains;
+}
+
+uint64_t Simulation::getSimCount( void )
+{
+	return stat_total_sims;
+}
+
+const uint64_t *Simulation::getFailBins( uint64_t d )
+{
+	return fail_time_bins + d * m_bin_stride;
+}
+
+const uint64_t *Simulation::getUncorrectableBins( uint64_t d )
+{
+	return fail_uncorrectable + d * m_bin_stride;
+}
+
+const uint64_t *Simulation::getUndetectableBins( uint64_t d )
+{
+	return fail_undetectable + d * m_bin_stride;
+}
+
+void Simulation::setCheckpoint( std::string checkpoint_file, uint64_t checkpoint_s )
+{
+	m_checkpoint_file = checkpoint_file;
+	m_checkpoint_s = checkpoint_s;
+}
+
+void Simulation::setProgress( uint64_t progress_s, std::string progress_file )
+{
+	m_progress_s = progress_s;
+	m_progress_file = progress_file;
+}
+
+void Simulation::reportProgress( uint64_t n_sims, bool done )
+{
+	FaultDomain *top = m_domains.front();
+	double elapsed_s = wallSeconds() - m_progress_start;
+	double sims_per_s = elapsed_s > 0 ? (double)(stat_total_sims - m_progress_first) / elapsed_s : 0;
+	// an upper bound with early stopping
+	uint64_t eta_s = (done || sims_per_s == 0) ? 0 : (uint64_t)((double)(n_sims - stat_total_sims) / sims_per_s);
+
+	if( m_progress_file.empty() ) {
+		std::ios_base::fmtflags flags = cerr.flags();
+		std::streamsize precision = cerr.precision( 1 );
+		cerr << "Progress: " << stat_total_sims << " of " << n_sims << " sims ("
+		     << std::fixed << 100.0 * stat_total_sims / n_sims << "%) "
+		     << (uint64_t)sims_per_s << " sims/s ETA " << eta_s << " s failed "
+		     << top->getFailedSimCount() << " uncorr " << top->getUncorrectedSimCount()
+		     << " undet " << top->getUndetectedSimCount() << (done ? " done" : "") << endl;
+		cerr.flags( flags );
+		cerr.precision( precision );
+		return;
+	}
+
+	// Write to a temporary file and rename it, so a monitor never reads a partial record
+	std::string tmp_file = m_progress_file + ".tmp";
+	ofstream status( tmp_file.c_str() );
+	if( !status.is_open() ) {
+		cout << "ERROR: progress file " << tmp_file << ": opening failed\n" << endl;
+		return;
+	}
+	status << "{\"pid\": " << getpid() << ", \"state\": \"" << (done ? "done" : "running")
+	       << "\", \"sims\": " << stat_total_sims << ", \"n_sims\": " << n_sims << ", \"elapsed_s\": " << (uint64_t)elapsed_s
+	       << ", \"sims_per_s\": " << (uint64_t)sims_per_s << ", \"eta_s\": " << eta_s << ", \"failed_sims\": " << top->getFailedSimCount()
+	       << ", \"uncorr_sims\": " << top->getUncorrectedSimCount() << ", \"undet_sims\": " << top->getUndetectedSimCount()
+	       << ", \"time\": " << time( NULL ) << "}\n";
+	status.close();
+	if( status.fail() || rename( tmp_file.c_str(), m_progress_file.c_str() ) != 0 ) {
+		cout << "ERROR: progress file " << m_progress_file << ": writing failed\n" << endl;
+	}
+}
+
+void Simulation::saveCheckpoint( uint64_t max_time, uint64_t n_sims )
+{
+	// Write to a temporary file and rename it, so a run killed mid-write keeps the previous checkpoint
+	std::string tmp_file = m_checkpoint_file + ".tmp";
+	ofstream ckpt( tmp_file.c_str() );
+	if( !ckpt.is_open() )
+	{
+		cout << "ERROR: checkpoint file " << tmp_file << ": opening failed\n" << endl;
+		return;
+	}
+
+	uint64_t n_bins = (max_time/m_output_bucket) * m_domains.size();
+	ckpt << "FAULTSIM_CHECKPOINT " << CHECKPOINT_VERSION << "\n";
+	ckpt << "run " << n_sims << " " << max_time << " " << m_output_bucket << " " << m_segment << "\n";
+	ckpt << "totals " << stat_total_sims << " " << stat_total_failures << " " << stat_total_ce << "\n";
+	ckpt << std::setprecision(17) << "weights " << m_is_boost << " " << is_sum_w << " " << is_sum_w2;
+	for( int k = 0; k < 3; k++ ) ckpt << " " << is_sum_wy[k] << " " << is_sum_wy2[k];
+	ckpt << "\n";
+
+	ckpt << "bins " << n_bins;
+	for( uint64_t i = 0; i < n_bins; i++ ) ckpt << " " << fail_time_bins[binIndex( i, max_time )];
+	for( uint64_t i = 0; i < n_bins; i++ ) ckpt << " " << fail_uncorrectable[binIndex( i, max_time )];
+	for( uint64_t i = 0; i < n_bins; i++ ) ckpt << " " << fail_undetectable[binIndex( i, max_time )];
+	ckpt << "\n";
+
+	list<FaultDomain*>::iterator it;
+	for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
+		(*it)->saveCheckpoint( ckpt );
+	}
+
+	ckpt.close();
+	if( ckpt.fail() || rename( tmp_file.c_str(), m_checkpoint_file.c_str() ) != 0 ) {
+		cout << "ERROR: checkpoint file " << m_checkpoint_file << ": writing failed\n" << endl;
+	}
+}
+
+uint64_t Simulation::loadCheckpoint( uint64_t max_time, uint64_t n_sims )
+{
+	ifstream ckpt( m_checkpoint_file.c_str() );
+	if( !ckpt.is_open() ) return 0;	// nothing to resume, start from the first trial
+
+	std::string tag;
+	uint64_t version = 0, ckpt_sims = 0, ckpt_max_time = 0, ckpt_bucket = 0, segment = 0;
+	ckpt >> tag >> version;
+	if( tag != "FAULTSIM_CHECKPOINT" || version != CHECKPOINT_VERSION ) {
+		cout << "ERROR: " << m_checkpoint_file << " is not a FaultSim checkpoint (version " << CHECKPOINT_VERSION << ")\n";
+		exit(1);
+	}
+	ckpt >> tag >> ckpt_sims >> ckpt_max_time >> ckpt_bucket >> segment;
+	if( ckpt_sims != n_sims || ckpt_max_time != max_time || ckpt_bucket != m_output_bucket ) {
+		cout << "ERROR: checkpoint " << m_checkpoint_file << " was written for a different n_sims/max_s/output_bucket_s\n";
+		exit(1);
+	}
+
+	resetStats();
+	allocateBins( max_time );
+
+	uint64_t n_bins = 0;
+	double ckpt_boost = 0;
+	ckpt >> tag >> stat_total_sims >> stat_total_failures >> stat_total_ce;
+	ckpt >> tag >> ckpt_boost >> is_sum_w >> is_sum_w2;
+	for( int k = 0; k < 3; k++ ) ckpt >> is_sum_wy[k] >> is_sum_wy2[k];
+	if( ckpt && ckpt_boost != m_is_boost ) {
+		cout << "ERROR: checkpoint " << m_checkpoint_file << " was written with a different is_boost\n";
+		exit(1);
+	}
+	ckpt >> tag >> n_bins;
+	if( n_bins != (max_time/m_output_bucket) * m_domains.size() ) ckpt.setstate( ios::failbit );
+	for( uint64_t i = 0; ckpt && i < n_bins; i++ ) ckpt >> fail_time_bins[binIndex( i, max_time )];
+	for( uint64_t i = 0; ckpt && i < n_bins; i++ ) ckpt >> fail_uncorrectable[binIndex( i, max_time )];
+	for( uint64_t i = 0; ckpt && i < n_bins; i++ ) ckpt >> fail_undetectable[binIndex( i, max_time )];
+
+	list<FaultDomain*>::iterator it;
+	for( it = m_domains.begin(); ckpt && it != m_domains.end(); it++ ) {
+		if( !(*it)->loadCheckpoint( ckpt ) ) ckpt.setstate( ios::failbit );
+	}
+
+	if( !ckpt ) {
+		cout << "ERROR: checkpoint " << m_checkpoint_file << " is truncated or does not match this memory organization\n";
+		exit(1);
+	}
+
+	m_segment = segment + 1;
+	m_resumed = true;
+	return m_segment;
+}
+
+void Simulation::writeHistogramCSV( std::string output_file, uint64_t max_time, uint64_t n_sims, uint64_t first_bin )
+{
+	ofstream opfile;
+	uint64_t bin_length = m_output_bucket;
+
 	opfile.open(output_file);
 	if(!opfile.is_open())
 	{
@@ -166,29 +594,64 @@ void Simulation::simulate( uint64_t max_time, uint64_t n_sims, int verbose, std:
 
 	for(uint64_t jj=0;jj<max_time/bin_length;jj++)
 	{
-		p_fail = ((double)fail_time_bins[jj])/n_sims;
-		p_uncorrected = ((double)fail_uncorrectable[jj])/n_sims;
-		p_undetected = ((double)fail_undetectable[jj])/n_sims;
+		p_fail = ((double)fail_time_bins[first_bin+jj])/n_sims;
+		p_uncorrected = ((double)fail_uncorrectable[first_bin+jj])/n_sims;
+		p_undetected = ((double)fail_undetectable[first_bin+jj])/n_sims;
 		p_fail_cumulative += p_fail;
-		fail_cumulative += fail_time_bins[jj];
+		fail_cumulative += fail_time_bins[first_bin+jj];
 		p_uncorrected_cumulative += p_uncorrected;
-		uncorrectable_cumulative += fail_uncorrectable[jj];
+		uncorrectable_cumulative += fail_uncorrectable[first_bin+jj];
 		p_undetected_cumulative += p_undetected;
-		undetectable_cumulative += fail_undetectable[jj];
+		undetectable_cumulative += fail_undetectable[first_bin+jj];
 
-		opfile << jj*12 << "," << fail_time_bins[jj] << "," << fail_cumulative << "," << std::fixed << std::setprecision(6) << p_fail << "," << std::fixed << std::setprecision(6) << p_fail_cumulative << "," << fail_uncorrectable[jj] << "," << uncorrectable_cumulative << "," << std::fixed << std::setprecision(6) << p_uncorrected << "," << p_uncorrected_cumulative << "," << fail_undetectable[jj] << "," << undetectable_cumulative << "," <<std::fixed << std::setprecision(6) << p_undetected << "," << p_undetected_cumulative <<endl;
+		opfile << jj*12 << "," << fail_time_bins[first_bin+jj] << "," << fail_cumulative << "," << std::fixed << std::setprecision(6) << p_fail << "," << std::fixed << std::setprecision(6) << p_fail_cumulative << "," << fail_uncorrectable[first_bin+jj] << "," << uncorrectable_cumulative << "," << std::fixed << std::setprecision(6) << p_uncorrected << "," << p_uncorrected_cumulative << "," << fail_undetectable[first_bin+jj] << "," << undetectable_cumulative << "," <<std::fixed << std::setprecision(6) << p_undetected << "," << p_undetected_cumulative <<endl;
 	}
 
 	opfile.close();
 }
 
+// Write values as little-endian uint64 words regardless of the host byte order
+static void writeLE64( ofstream &opfile, const uint64_t *values, uint64_t n )
+{
+	unsigned char buf[8];
+	for( uint64_t i = 0; i < n; i++ ) {
+		for( int b = 0; b < 8; b++ ) buf[b] = (unsigned char)(values[i] >> (8 * b));
+		opfile.write( (const char *)buf, 8 );
+	}
+}
+
+void Simulation::writeHistogramBinary( std::string output_file, uint64_t max_time, uint64_t n_sims, uint64_t first_bin )
+{
+	// Layout: magic[8], then uint64 version, n_bins, n_sims, bucket seconds, max seconds, n_columns,
+	// then the raw fail_time_bins, fail_uncorrectable and fail_undetectable arrays (n_bins each).
+	// Cumulative and probability columns are left to the reader.
+	uint64_t n_bins = max_time/m_output_bucket;
+	uint64_t header[6] = { OF_BINARY_VERSION, n_bins, n_sims, m_output_bucket, max_time, 3 };
+
+	ofstream opfile( output_file.c_str(), ios::out | ios::binary );
+	if(!opfile.is_open())
+	{
+		cout << "ERROR: output file " << output_file << ": opening failed\n"<< endl;
+		return;
+	}
+
+	opfile.write( OF_BINARY_MAGIC, 8 );
+	writeLE64( opfile, header, 6 );
+	writeLE64( opfile, fail_time_bins + first_bin, n_bins );
+	writeLE64( opfile, fail_uncorrectable + first_bin, n_bins );
+	writeLE64( opfile, fail_undetectable + first_bin, n_bins );
+	opfile.close();
+}
+
 
 uint64_t Simulation::runOne( uint64_t max_s, int verbose, uint64_t bin_length)
 {
 	// returns number of uncorrectable simulations
 
 	// reset the domain states e.g. recorded errors for the simulated timeframe
+	double t0 = profile.enabled ? profileNow() : 0;
 	reset();
+	if( profile.enabled ) profileAdd( PROF_RESET, t0 );
 	uint64_t bin;
 
 	// calculate number of iterations
@@ -197,6 +660,9 @@ uint64_t Simulation::runOne( uint64_t max_s, int verbose, uint64_t bin_length)
 	// compute the ratio at which scrubbing needs to be performed
 	uint64_t scrub_ratio = m_scrub_interval / m_interval;
 	uint64_t errors =0;
+	// skip_ahead: the last scrub removed nothing and no fault came since, so until the next fault
+	// every scrub (and fill_repl) would see the same state again
+	bool scrubs_idle = false;
 	/*************************************************
 	 * THIS IS THE LOOP FOR A SINGLE RUN FOR N YEARS *
 	 *************************************************/
@@ -205,22 +671,50 @@ uint64_t Simulation::runOne( uint64_t max_s, int verbose, uint64_t bin_length)
 		// loop through all fault domains and update
 		list<FaultDomain*>::iterator it;
 
+		if( m_skip_ahead ) {
+			// go to the next interval with a fault or with a scrub that can still change the state;
+			// intervals without either would neither repair nor record anything
+			uint64_t next = NO_FAULT_INTERVAL;
+			for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
+				uint64_t domain_next = (*it)->nextFaultInterval();
+				if( domain_next < next ) next = domain_next;
+			}
+			if( !scrubs_idle ) {
+				uint64_t next_scrub = ((iter + scrub_ratio - 1) / scrub_ratio) * scrub_ratio;
+				if( next_scrub < next ) next = next_scrub;
+			}
+			if( next >= max_iterations ) break;
+
+			iter = next;
+			for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
+				(*it)->setInterval( iter );
+			}
+		}
+
 		for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
 
 			//Insert Faults Hierarchially: GroupDomain -> Lower Domains -> .. ; since (time between updates) << (Total Running Time), faults can be assumed to be inserted instantaneously
+			if( profile.enabled ) t0 = profileNow();
 			int newfault = (*it)->update(test_mode);
+			if( profile.enabled ) profileAdd( PROF_GENERATE, t0 );
 			uint64_t n_undetected = 0;
 			uint64_t n_uncorrected = 0;
 
 			//Run the Repair function: This will check the correctability/ detectability of the fault(s); Repairing is also done instantaneously
 			if( newfault ) {
+				scrubs_idle = false;
 				if( verbose == 2 ) {
 					// Dump all FaultRanges before
 					cout << "FAULTS INSERTED: BEFORE REPAIR\n";
 					(*it)->dumpState();
 				}
 
+				if( profile.enabled ) {
+					profileLiveRanges( (*it) );
+					t0 = profileNow();
+				}
 				(*it)->repair( n_undetected, n_uncorrected );
+				if( profile.enabled ) profileAdd( PROF_REPAIR, t0 );
 
 				if( verbose == 2 ) {
 					// Dump all FaultRanges after
@@ -273,11 +767,21 @@ uint64_t Simulation::runOne( uint64_t max_s, int verbose, uint64_t bin_length)
 
 		// Check if the time to scrub the domain has arrived
 		if( (iter % scrub_ratio) == 0 ) {
+			scrubs_idle = true;
 			for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
+				uint64_t n_transient = m_skip_ahead ? (*it)->getTransientCount() : 0;
+				if( profile.enabled ) t0 = profileNow();
 				(*it)->scrub();
+				if( m_skip_ahead && (*it)->getTransientCount() != n_transient ) scrubs_idle = false;
+				if( profile.enabled ) {
+					profileAdd( PROF_SCRUB, t0 );
+					t0 = profileNow();
+				}
 
 				//User Defined Special operation to be performed while Scrubbing
-				if((*it)->fill_repl()){
+				uint64_t repl_failed = (*it)->fill_repl();
+				if( profile.enabled ) profileAdd( PROF_FILL_REPL, t0 );
+				if( repl_failed ){
 					finalize();
 					return 1;
 				}
@@ -320,7 +824,61 @@ void Simulation::printStats( void )
 	for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
 		(*it)->printStats();
 	}
+	if( m_is_boost != 1.0 ) printImportanceStats();
 	// cout << "Correctable Errors (CE): " << stat_total_ce 
 	// 	<< " (" << stat_total_ce << "\n";
 	cout << "\n";
 }
+
+void Simulation::writeStats( std::string stats_file )
+{
+	ofstream out( stats_file.c_str() );
+	if( !out.is_open() ) {
+		cout << "ERROR: stats file " << stats_file << ": opening failed\n" << endl;
+		return;
+	}
+
+	list<FaultDomain*>::iterator it;
+	for( it = m_domains.begin(); it != m_domains.end(); it++ ) {
+		(*it)->writeStats( out );
+	}
+
+	if( m_is_boost != 1.0 ) {
+		// the raw weight sums of printImportanceStats, from which the weighted rates follow exactly
+		const char *names[3] = { "raw", "uncorr", "undet" };
+		out << std::setprecision( 17 );
+		out << "{\"name\": \"" << m_domains.front()->getName() << "\", \"importance\": {\"is_boost\": " << m_is_boost
+		    << ", \"sims\": " << stat_total_sims << ", \"sum_w\": " << is_sum_w << ", \"sum_w2\": " << is_sum_w2;
+		for( int k = 0; k < 3; k++ ) {
+			out << ", \"sum_wy_" << names[k] << "\": " << is_sum_wy[k] << ", \"sum_wy2_" << names[k] << "\": " << is_sum_wy2[k];
+		}
+		out << "}}\n";
+	}
+}
+
+void Simulation::printImportanceStats( void )
+{
+	// Unbiased likelihood-ratio weighted rates of the top-level domain (the plain rates printed by
+	// FaultDomain::printStats are those of the boosted fault process). The raw weight sums follow at
+	// full precision so that shards can be merged exactly.
+	FaultDomain *top = m_domains.front();
+	double hour_ns = (double)60*60*1000000000;
+	const char *names[3] = { "raw", "uncorr", "undet" };
+
+	cout << "[" << top->getName() << "] is_boost " << m_is_boost << " sims " << stat_total_sims
+	     << " weight_mean " << (stat_total_sims ? is_sum_w / stat_total_sims : 0);
+	for( int k = 0; k < 3; k++ ) {
+		double mean, var;
+		importanceEstimate( is_sum_wy[k], is_sum_wy2[k], stat_total_sims, mean, var );
+		cout << " rate_" << names[k] << " " << mean << " rate_" << names[k] << "_var " << var
+		     << " FIT_" << names[k] << " " << mean * hour_ns / (double)stat_sim_seconds;
+	}
+
+	std::streamsize precision = cout.precision( 17 );
+	cout << " sum_w " << is_sum_w << " sum_w2 " << is_sum_w2;
+	for( int k = 0; k < 3; k++ ) {
+		cout << " sum_wy_" << names[k] << " " << is_sum_wy[k] << " sum_wy2_" << names[k] << " " << is_sum_wy2[k];
+	}
+	cout << "\n";
+	cout.precision( precision );
+}
@@ -14,19 +14,57 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #define SIMULATION_HH_
 
 #include "FaultDomain.hh"
+#include <time.h>
 
 class Simulation {
 public:
 	Simulation( uint64_t interval_t, uint64_t scrub_interval_t, double fit_factor_t, uint test_mode_t, bool debug_mode_t, bool cont_running_t, uint64_t output_bucket_t );
+	// deletes the histogram bins and the top-level domains
+	virtual ~Simulation();
 	void init( uint64_t max_s );
 	void reset( void );
 	void finalize( void );
-	virtual void simulate( uint64_t max_time, uint64_t n_sims, int verbose, std::string output_file);
+	virtual void simulate( uint64_t max_time, uint64_t n_sims, int verbose, std::string output_file, int output_format );
 	virtual uint64_t runOne( uint64_t max_time, int verbose, uint64_t bin_length );
 	void addDomain( FaultDomain *domain );
 	void getFaultCounts( uint64_t *pTrans, uint64_t *pPerm );
 	void resetStats( void );
 	void printStats( void );	// output end-of-run stats
+	// the same stats with exact counts as NDJSON (FaultDomain::writeStats, then the weighted sums with is_boost)
+	void writeStats( std::string stats_file );
+	// histograms of the top-level domain whose bins start at first_bin
+	void writeHistogramCSV( std::string output_file, uint64_t max_time, uint64_t n_sims, uint64_t first_bin );
+	void writeHistogramBinary( std::string output_file, uint64_t max_time, uint64_t n_sims, uint64_t first_bin );
+	static std::string domainOutputFile( std::string output_file, std::string domain_name );
+	// periodic checkpoints of all counters and histogram bins (checkpoint_s = 0 disables them)
+	void setCheckpoint( std::string checkpoint_file, uint64_t checkpoint_s );
+	void saveCheckpoint( uint64_t max_time, uint64_t n_sims );
+	uint64_t loadCheckpoint( uint64_t max_time, uint64_t n_sims );	// returns the new seed segment, 0 if nothing was resumed
+	// rate-limited progress reports (trials done, trials/s, ETA, failure counts) every progress_s
+	// wall-clock seconds to stderr, or to progress_file as a JSON status record (progress_s = 0 disables them)
+	void setProgress( uint64_t progress_s, std::string progress_file );
+	// early stopping: treat n_sims as an upper bound and stop once the tracked rates have converged
+	void setConvergenceTarget( double ci_target, double ci_confidence, int ci_method, int ci_rates, uint64_t ci_batch );
+	bool converged( bool report );
+	// importance sampling: fault arrival rates are multiplied by is_boost and every trial is
+	// weighted by its likelihood ratio (only supported by the event-driven simulator)
+	void setImportanceBoost( double is_boost );
+	// draw the number of faults of each trial before its events (only supported by the event-driven simulator)
+	void setPresample( bool presample );
+	// drop fault ranges covered by a permanent range of their chip as they arrive, in the top-level
+	// domains whose repair schemes allow it (FaultDomain::canCoalesceRanges)
+	void setCoalesceRanges( bool coalesce );
+	// interval mode: draw the interval of each fault process's next fault instead of testing every
+	// interval, and only visit the intervals with faults and the scrubs that can change something
+	void setSkipAhead( bool skip_ahead );
+
+	// results for callers that do not read the printed statistics (FaultSimAPI)
+	list<FaultDomain*> *getDomains( void );
+	uint64_t getSimCount( void );
+	// failure-time bins of the d-th top-level domain: n_bins = max_time/output_bucket each
+	const uint64_t *getFailBins( uint64_t d );
+	const uint64_t *getUncorrectableBins( uint64_t d );
+	const uint64_t *getUndetectableBins( uint64_t d );
 
 protected:
 	uint64_t m_interval;
@@ -50,8 +88,41 @@ protected:
     uint64_t *fail_time_bins;
 	uint64_t *fail_uncorrectable;
     uint64_t *fail_undetectable;
+    uint64_t m_bin_stride;	// bins per top-level domain in the arrays above, see allocateBins
 
     list<FaultDomain*> m_domains;
+
+    std::string m_checkpoint_file;
+    uint64_t m_checkpoint_s;
+    uint64_t m_segment;	// number of times this run has been resumed from a checkpoint
+    bool m_resumed;
+
+    double m_ci_target;
+    double m_ci_confidence;
+    int m_ci_method;
+    int m_ci_rates;
+    uint64_t m_ci_batch;
+
+    double m_is_boost;
+    double m_trial_weight;	// likelihood ratio of the current trial, set by runOne
+
+    bool m_presample;
+    bool m_skip_ahead;
+
+    uint64_t m_progress_s;
+    std::string m_progress_file;
+    double m_progress_start;	// wall-clock start (seconds) and trial count of this process, for the rate
+    uint64_t m_progress_first;
+    void reportProgress( uint64_t n_sims, bool done );
+    // sums of w and w^2 over all trials, and of w*Y and (w*Y)^2 for the indicators
+    // Y = failed / uncorrected / undetected of the top-level domain
+    double is_sum_w, is_sum_w2;
+    double is_sum_wy[3], is_sum_wy2[3];
+
+    void printImportanceStats( void );
+
+    void allocateBins( uint64_t max_time );
+    uint64_t binIndex( uint64_t i, uint64_t max_time );
 };
 
 
@@ -16,6 +16,7 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #include <boost/random/mersenne_twister.hpp>
 #include <boost/random/uniform_real_distribution.hpp>
 #include <boost/random/variate_generator.hpp>
+#include <boost/random/seed_seq.hpp>
 #include <ctime>
 #include <sys/time.h>
 
@@ -30,9 +31,31 @@ using namespace std;
 #define DRAM_NRANK 6
 #define DRAM_MAX 7
 
+// next fault interval of a process that doesn't fail within any simulated period (skip_ahead)
+#define NO_FAULT_INTERVAL ((uint64_t)1 << 62)
+
 // 64-bit random doubles for determining if failure happened
 typedef boost::mt19937_64                     ENG;    // Mersenne Twister
 typedef boost::random::uniform_real_distribution<double> DIST;
 typedef boost::random::variate_generator<ENG,DIST> GEN;    // Variate generator
 
+// Random stream identifiers used when deriving per-domain seeds
+#define STREAM_FAULT_TIME 0		// uniform doubles deciding when faults happen
+#define STREAM_FAULT_LOC 1		// integers deciding where faults land
+#define STREAM_GROUP 2			// group-level (e.g. TSV) fault streams
+
+// Seed an engine from (seed, shard, domain index, stream) through a seed sequence, so every
+// engine in every shard gets its own reproducible stream instead of a time-of-day seed.
+// A non-zero segment (the number of times a checkpointed run was resumed) selects a fresh
+// stream for the remaining trials; segment 0 keeps the original seed sequence.
+template<class Engine>
+void seedStream( Engine &engine, uint64_t seed, uint64_t shard, uint64_t domain, uint64_t stream, uint64_t segment )
+{
+	uint32_t key[9] = { (uint32_t)seed, (uint32_t)(seed >> 32), (uint32_t)shard, (uint32_t)(shard >> 32),
+						(uint32_t)domain, (uint32_t)(domain >> 32), (uint32_t)stream,
+						(uint32_t)segment, (uint32_t)(segment >> 32) };
+	boost::random::seed_seq seq( key, key + (segment ? 9 : 7) );
+	engine.seed( seq );
+}
+
 #endif /* DRAM_COMMON_HH_ */
@@ -23,4 +23,20 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #define MO_DIMM 0
 #define MO_3D 1
 
+// Failure-time histogram output formats
+#define OF_CSV    0
+#define OF_BINARY 1
+
+// Confidence interval methods for the early-stopping mode
+#define CI_WILSON          0
+#define CI_CLOPPER_PEARSON 1
+
+// Rates the early-stopping mode waits for (bit mask)
+#define CI_RATE_UNCORR 1
+#define CI_RATE_UNDET  2
+
+// Binary histogram header: 8-byte magic (7 characters + NUL) then little-endian uint64 words
+#define OF_BINARY_MAGIC   "FSWEEKS"
+#define OF_BINARY_VERSION 1
+
 #endif /* FAULTSIM_HH_ */
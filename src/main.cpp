@@ -14,6 +14,7 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #include <iostream> 
 #include <string> 
 #include <cstring>
+#include <sstream>
 
 #include "faultsim.hh"
 #include "ConfigParser.hh"
@@ -29,10 +30,10 @@ THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
 #include "Simulation.hh"
 #include "EventSimulation.hh"
 #include "Settings.hh"
+#include "ModuleBuilder.hh"
+#include "Profile.hh"
 
 void printBanner( void );
-GroupDomain* genModuleDIMM( void );
-GroupDomain* genModule3D( void );
 
 namespace {
 const size_t ERROR_IN_COMMAND_LINE = 1;
@@ -49,11 +50,16 @@ void printBanner( void )
 	cout << "# --------------------------------------------------------------------------------\n\n";
 }
 
-struct Settings settings;
+extern struct Settings settings;
 
 int main(int argc, char** argv) {
 
     std::string chain="NULL";
+    std::string outformat_opt, repairmodes_opt, statsfile_opt, progressfile_opt, profile_opt;
+    uint64_t seed_opt = 0, shard_opt = 0, checkpoint_opt = 0, progress_opt = 0;
+    double ci_target_opt = 0, is_boost_opt = 1;
+    bool presample_opt = false, coalesce_opt = false, skip_ahead_opt = false;
+    bool has_seed_opt = false, has_shard_opt = false, has_checkpoint_opt = false, has_ci_target_opt = false, has_is_boost_opt = false, has_presample_opt = false, has_coalesce_opt = false, has_skip_ahead_opt = false, has_repairmodes_opt = false, has_statsfile_opt = false, has_progress_opt = false, has_progressfile_opt = false, has_profile_opt = false, resume = false;
     printBanner();
 
 	try {
@@ -66,7 +72,22 @@ int main(int argc, char** argv) {
 
 		desc.add_options()("help", "Print help messages")
 										  ("outfile", po::value<std::string>(&settings.output_file)->required(), "Output file name")
-                                          ("configfile",po::value<std::string>(&chain),"Indicate .ini configuration file to use");
+                                          ("configfile",po::value<std::string>(&chain),"Indicate .ini configuration file to use")
+                                          ("seed",po::value<uint64_t>(&seed_opt),"Base random seed, overrides [Sim] seed (0 = time of day)")
+                                          ("shard",po::value<uint64_t>(&shard_opt),"Shard index mixed into the seed, overrides [Sim] shard")
+                                          ("outformat",po::value<std::string>(&outformat_opt),"Histogram output format: csv or bin, overrides [Sim] output_format")
+                                          ("statsfile",po::value<std::string>(&statsfile_opt),"Write the end-of-run statistics with exact counts as NDJSON (one record per domain) to this file, overrides [Sim] stats_file")
+                                          ("progress",po::value<uint64_t>(&progress_opt),"Report trials done, trials/s, ETA and failure counts every this many seconds instead of per-trial characters, overrides [Sim] progress_s (0 = off)")
+                                          ("progressfile",po::value<std::string>(&progressfile_opt),"Write the progress reports as a JSON status file (replaced on each report) instead of stderr, overrides [Sim] progress_file")
+                                          ("profile",po::value<std::string>(&profile_opt),"Time the phases of the trial loop and count intersection tests, generated faults and live fault ranges, and write them as JSON to this file, overrides [Sim] profile_file")
+                                          ("checkpoint",po::value<uint64_t>(&checkpoint_opt),"Seconds between checkpoints to <outfile>.ckpt, overrides [Sim] checkpoint_s (0 = off)")
+                                          ("resume","Continue from <outfile>.ckpt if it exists")
+                                          ("citarget",po::value<double>(&ci_target_opt),"Stop early once the CI relative half-width of the tracked rates ([Sim] ci_rates, default rate_uncorr) is below this, overrides [Sim] ci_target (0 = run n_sims)")
+                                          ("isboost",po::value<double>(&is_boost_opt),"Importance sampling: multiply fault arrival rates by this and reweight trials (event mode only), overrides [Sim] is_boost")
+                                          ("presample",po::value<bool>(&presample_opt),"Draw each trial's fault count first and account 0/1-fault trials without the event loop (event mode only), overrides [Sim] presample")
+                                          ("coalesce",po::value<bool>(&coalesce_opt),"Drop fault ranges covered by a permanent range of the same chip as they arrive (ChipKill/SECDED/BCH/RAID modules), overrides [Sim] coalesce_ranges")
+                                          ("skipahead",po::value<bool>(&skip_ahead_opt),"Draw the interval of each fault process's next fault and skip the intervals without faults (interval mode only), overrides [Sim] skip_ahead")
+                                          ("repairmodes",po::value<std::string>(&repairmodes_opt),"Comma-separated DIMM repairmodes to evaluate on the same fault traces, e.g. 0,3,1 (event mode only), overrides [ECC] compare_repairmodes");
 
 		po::variables_map vm;
 		try {
@@ -81,6 +102,20 @@ int main(int argc, char** argv) {
 
 			po::notify(vm); // throws on error, so do after help in case
 			// there are any problems
+			has_seed_opt = vm.count("seed");
+			has_shard_opt = vm.count("shard");
+			has_checkpoint_opt = vm.count("checkpoint");
+			resume = vm.count("resume");
+			has_ci_target_opt = vm.count("citarget");
+			has_is_boost_opt = vm.count("isboost");
+			has_presample_opt = vm.count("presample");
+			has_coalesce_opt = vm.count("coalesce");
+			has_skip_ahead_opt = vm.count("skipahead");
+			has_repairmodes_opt = vm.count("repairmodes");
+			has_statsfile_opt = vm.count("statsfile");
+			has_progress_opt = vm.count("progress");
+			has_progressfile_opt = vm.count("progressfile");
+			has_profile_opt = vm.count("profile");
 		} catch (po::error& e) {
 			std::cerr << "ERROR: " << e.what() << std::endl << std::endl;
 			std::cerr << desc << std::endl;
@@ -103,38 +138,50 @@ int main(int argc, char** argv) {
 	parser(config_opt);
     delete [] config_opt;
 
-    // Build the physical memory organization and attach ECC scheme /////
-    GroupDomain *module = NULL;
+    // command line seeding options take precedence over the config file
+    if( has_seed_opt ) settings.seed = seed_opt;
+    if( has_shard_opt ) settings.shard = shard_opt;
+    if( has_checkpoint_opt ) settings.checkpoint_s = checkpoint_opt;
+    if( has_ci_target_opt ) settings.ci_target = ci_target_opt;
+    if( has_is_boost_opt ) settings.is_boost = is_boost_opt;
+    if( has_presample_opt ) settings.presample = presample_opt;
+    if( has_coalesce_opt ) settings.coalesce_ranges = coalesce_opt;
+    if( has_skip_ahead_opt ) settings.skip_ahead = skip_ahead_opt;
+    if( has_repairmodes_opt ) settings.compare_repairmodes = repairmodes_opt;
+    if( has_statsfile_opt ) settings.stats_file = statsfile_opt;
+    if( has_progress_opt ) settings.progress_s = progress_opt;
+    if( has_progressfile_opt ) settings.progress_file = progressfile_opt;
+    if( has_profile_opt ) settings.profile_file = profile_opt;
+    vector<int> repairmodes;
+    std::string error = parseRepairmodes( repairmodes );
+    if( error.empty() ) error = checkSettings( repairmodes );
+    if( !error.empty() ) {
+    	cout << "ERROR: " << error << "\n";
+    	exit(0);
+    }
+    if( outformat_opt == "csv" ) {
+    	settings.output_format = OF_CSV;
+    } else if( outformat_opt == "bin" ) {
+    	settings.output_format = OF_BINARY;
+    } else if( !outformat_opt.empty() ) {
+    	cout << "ERROR: Invalid outformat option (must be csv or bin)\n";
+    	exit(0);
+    }
 
-    if( settings.organization == MO_DIMM ) {
-    	module = genModuleDIMM();
-    } else if( settings.organization == MO_3D ) {
-    	module = genModule3D();
+    // Build the physical memory organization and attach ECC scheme /////
+    list<GroupDomain*> modules = genModules( repairmodes );
+
+    // Derive every domain's random streams from (seed, shard, domain index) for reproducible runs
+    if( settings.seed != 0 ) {
+    	cout << "The random seed is: " << settings.seed << " shard: " << settings.shard << endl;
+    	for( list<GroupDomain*>::iterator it = modules.begin(); it != modules.end(); it++ ) {
+    		(*it)->seed( settings.seed, settings.shard, 0 );
+    	}
     }
 
     // Configure simulator ///////////////////////////////////////////////
-    Simulation *sim_temp;
-
-    // Simulator settings are as follows: 
-    // a. The setting.interval_s (in seconds) indicates the granularity of inserting faults 
-    // (not used in Event Based Simulator). 
-    // b. The setting.scrub_s (in seconds) indicates the granularity of scrubbing transient faults.
-    // c. The setting.fit_factor indicates the multiplicative factor for fit_rates. 
-    // d. The setting.debug will enable debug messages
-    // e. The setting.continue_running will enable uses to continue running even if an uncorrectable error occurs 
-    // (until an undetectable error occurs.
-    // f. The settings.output_bucket_s wil bucket system failure times
-    // NOTE: The test_mode setting allows the user to inject specific faults at very FIT rates. This enables the user to test their
-    // ECC technique and also stress corner cases for fault specific ECC.
-    // NOTE: The test_mode setting is currently not implemented in the Event Based Simulator
-
-    if( settings.sim_mode == 1 ) {
-    	sim_temp = (new Simulation( settings.interval_s, settings.scrub_s, settings.fit_factor, settings.test_mode,
-    			                    settings.debug,settings.continue_running, settings.output_bucket_s ));
-    } else if( settings.sim_mode == 2 ) {
-    	sim_temp = (new EventSimulation( settings.interval_s, settings.scrub_s, settings.fit_factor, settings.test_mode,
-    								settings.debug,settings.continue_running, settings.output_bucket_s ));
-    } else {
+    Simulation *sim_temp = genSimulation();
+    if( sim_temp == NULL ) {
     	cout << "ERROR: Invalid sim_mode option (must be 1 (interval-based) or 2 (event-driven))\n";
     	exit(0);
     }
@@ -142,163 +189,39 @@ int main(int argc, char** argv) {
     Simulation &sim = *sim_temp;
 
     // Run simulator //////////////////////////////////////////////////
-    sim.addDomain( module );    // register the top-level memory object with the simulation engine
+    // register the top-level memory objects with the simulation engine
+    for( list<GroupDomain*>::iterator it = modules.begin(); it != modules.end(); it++ ) {
+    	sim.addDomain( (*it) );
+    }
     sim.init( settings.max_s );	// one-time set-up that does FIT rate scaling based on interval
-    sim.simulate( settings.max_s, settings.n_sims, settings.verbose, settings.output_file);
-    sim.printStats();
-
-	return SUCCESS;
-
-}
-/*
- * Simulate a DIMM module
- */
-
-GroupDomain* genModuleDIMM( void )
-{
-	GroupDomain *dimm0;
-
-	// Create a DIMM or a CUBE
-	// settings.data_block_bits is the number of bits per transaction when you create a DIMM
-
-	dimm0 = new GroupDomain_dimm( "MODULE0", settings.chips_per_rank, settings.banks, settings.data_block_bits );
-
-	for( uint32_t i = 0; i < settings.chips_per_rank; i++ ) {
-		char buf[20];
-		sprintf( buf, "MODULE0.DRAM%d", i );
-		DRAMDomain *dram0 = new DRAMDomain( buf, settings.chip_bus_bits, settings.ranks, settings.banks, settings.rows, settings.cols, settings.chips_per_rank );
-
-		if( settings.faultmode == FM_UNIFORM_BIT ) {
-			if( settings.enable_transient ) dram0->setFIT( DRAM_1BIT, 1, 33.05 );
-			if( settings.enable_permanent ) dram0->setFIT( DRAM_1BIT, 0, 33.05 );
-		} else if( settings.faultmode == FM_JAGUAR ) {
-			if( settings.enable_transient ) {
-				dram0->setFIT( DRAM_1BIT, 1, 50.28 );
-				dram0->setFIT( DRAM_1WORD, 1, 0.0 );
-				dram0->setFIT( DRAM_1COL, 1, 17.4715 );
-				dram0->setFIT( DRAM_1ROW, 1, 1.83706 );
-				dram0->setFIT( DRAM_1BANK, 1, 19.5283 );
-				dram0->setFIT( DRAM_NBANK, 1, 0.1816 );
-				dram0->setFIT( DRAM_NRANK, 1, 0.19514 );
-			}
-
-			if( settings.enable_permanent ) {
-				dram0->setFIT( DRAM_1BIT, 0, 76.68 );
-				dram0->setFIT( DRAM_1WORD, 0, 0.0 );
-				dram0->setFIT( DRAM_1COL, 0, 5.81738 );
-				dram0->setFIT( DRAM_1ROW, 0, 14.3127 );
-				dram0->setFIT( DRAM_1BANK, 0, 7.92444 );
-				dram0->setFIT( DRAM_NBANK, 0, 0.365924 );
-				dram0->setFIT( DRAM_NRANK, 0, 0.989311 );
-			}
-		} else {
-			assert(0);
-		}
-
-		dimm0->addDomain( dram0, i );
-	}
-
-	//Add the 2D Repair Schemes
-	if( settings.repairmode == 0 ) {
-		// do nothing (no ECC)
-	} else if( settings.repairmode == 1 ) {
-		ChipKillRepair *ck0 = new ChipKillRepair( string("CK1"), 1, 2 );
-		dimm0->addRepair( ck0 );
-	} else if( settings.repairmode == 2 ) {
-		ChipKillRepair *ck0 = new ChipKillRepair( string("CK2"), 2, 4 );
-		dimm0->addRepair( ck0 );
-	} else if( settings.repairmode == 3 ) {
-		BCHRepair *bch0 = new BCHRepair( string("SECDED"), 1, 2, 4 );
-		dimm0->addRepair( bch0 );
-	} else if( settings.repairmode == 4 ) {
-		BCHRepair *bch1 = new BCHRepair( string("3EC4ED"), 3, 4, 4 );
-		dimm0->addRepair( bch1 ); //Repair from Fault Domain
-	} else if( settings.repairmode == 5 ) {
-		BCHRepair *bch2 = new BCHRepair( string("6EC7ED"), 6, 7, 4 );
-		dimm0->addRepair( bch2 );
-	} else {
-		assert(0);
-	}
-
-	return dimm0;
-}
-
-GroupDomain *genModule3D( void )
-{
-	GroupDomain *stack0;
-
-	// Create a stack or a CUBE
-	// settings.data_block_bits is the number of bits per transaction when you create a Cube
-	         
-	stack0 = new GroupDomain_cube( "MODULE0",1,settings.chips_per_rank,settings.banks,settings.data_block_bits,settings.cube_addr_dec_depth, settings.cube_ecc_tsv, settings.cube_redun_tsv, settings.enable_tsv);
-
-	//Set FIT rates for TSVs, these are set at the GroupDomain level as these are common to the entire cube
-	stack0->setFIT_TSV( 1, settings.tsv_fit );
-	stack0->setFIT_TSV( 0, settings.tsv_fit );
-
-	// Set FIT rates for different granularity for all devices in the module and add devices into the module
-	double DRAM_nrank_fit_trans = 0;
-	double DRAM_nrank_fit_perm = 0;
-
-	// Rank FIT rates cannot be directly translated to 3D stack
-	DRAM_nrank_fit_trans = 0.0;
-	DRAM_nrank_fit_perm = 0.0;
-
-	for( uint32_t i = 0; i < settings.chips_per_rank; i++ ) {
-		char buf[20];
-		sprintf( buf, "MODULE0.DRAM%d", i );
-		DRAMDomain *dram0 = new DRAMDomain( buf, settings.chip_bus_bits, settings.ranks, settings.banks, settings.rows, settings.cols, settings.chips_per_rank );
-
-		if( settings.faultmode == FM_UNIFORM_BIT ) {
-			// use a default FIT rate equal to probability of any Jaguar fault
-			if( settings.enable_transient ) dram0->setFIT( DRAM_1BIT, 1, 33.05 );
-			if( settings.enable_permanent ) dram0->setFIT( DRAM_1BIT, 0, 33.05 );
-		} else if( settings.faultmode == FM_JAGUAR ) {
-			if( settings.enable_transient ) {
-				dram0->setFIT( DRAM_1BIT, 1, 14.2 );
-				dram0->setFIT( DRAM_1WORD, 1, 1.4 );
-				dram0->setFIT( DRAM_1COL, 1, 1.4 );
-				dram0->setFIT( DRAM_1ROW, 1, 0.2 );
-				dram0->setFIT( DRAM_1BANK, 1, 0.8 );
-				dram0->setFIT( DRAM_NBANK, 1, 0.3 );
-				dram0->setFIT( DRAM_NRANK, 1, DRAM_nrank_fit_trans );
-			}
 
-			if( settings.enable_permanent ) {
-				dram0->setFIT( DRAM_1BIT, 0, 18.6 );
-				dram0->setFIT( DRAM_1WORD, 0, 0.3 );
-				dram0->setFIT( DRAM_1COL, 0, 5.6 );
-				dram0->setFIT( DRAM_1ROW, 0, 8.2 );
-				dram0->setFIT( DRAM_1BANK, 0, 10.0 );
-				dram0->setFIT( DRAM_NBANK, 0, 1.4 );
-				dram0->setFIT( DRAM_NRANK, 0, DRAM_nrank_fit_perm );
-			}
-		} else {
-			assert(0);
-		}
+    // Checkpoints go next to the output file; a resumed run continues with a fresh seed segment
+    std::string checkpoint_file = settings.output_file + ".ckpt";
+    sim.setCheckpoint( checkpoint_file, settings.checkpoint_s );
+    sim.setProgress( settings.progress_s, settings.progress_file );
+    sim.setImportanceBoost( settings.is_boost );
+    sim.setPresample( settings.presample );
+    sim.setCoalesceRanges( settings.coalesce_ranges );
+    sim.setSkipAhead( settings.skip_ahead );
+    sim.setConvergenceTarget( settings.ci_target, settings.ci_confidence, settings.ci_method, settings.ci_rates, settings.ci_batch );
+    if( resume ) {
+    	uint64_t segment = sim.loadCheckpoint( settings.max_s, settings.n_sims );
+    	if( segment != 0 ) {
+    		cout << "Resuming from checkpoint " << checkpoint_file << " segment: " << segment << endl;
+    		for( list<GroupDomain*>::iterator it = modules.begin(); settings.seed != 0 && it != modules.end(); it++ ) {
+    			(*it)->seed( settings.seed, settings.shard, segment );
+    		}
+    	}
+    }
+    profileReset( !settings.profile_file.empty() );
+    sim.simulate( settings.max_s, settings.n_sims, settings.verbose, settings.output_file, settings.output_format );
+    sim.printStats();
+    if( !settings.stats_file.empty() ) sim.writeStats( settings.stats_file );
+    if( profile.enabled ) writeProfile( settings.profile_file, chain, settings.sim_mode );
 
-		stack0->addDomain( dram0, i );
-	}
+    // the run is complete, so a later --resume must not pick up its last checkpoint
+    if( settings.checkpoint_s || resume ) remove( checkpoint_file.c_str() );
 
-	if( settings.repairmode == 1 ) {
-		ChipKillRepair_cube *ck0 = new ChipKillRepair_cube( string("CK1"), 1, 2, stack0);
-		stack0->addRepair( ck0 );
-	} else if( settings.repairmode == 2 ) {
-		CubeRAIDRepair *ck1 = new CubeRAIDRepair( string("RAID"), 1, 2, settings.data_block_bits );
-		stack0->addRepair( ck1 ); //settings.data_block_bits used as RAID is computed over 512 bits (in our design)
-	} else if( settings.repairmode == 3 ) {
-		BCHRepair_cube *bch0 = new BCHRepair_cube( string("SECDED"), 1, 2, settings.data_block_bits );
-		stack0->addRepair( bch0 ); //settings.data_block_bits used as SECDED/3EC4ED/6EC7ED is computed over 512 bits (in our design)
-	} else if( settings.repairmode == 4 ) {
-		BCHRepair_cube *bch1 = new BCHRepair_cube( string("3EC4ED"), 3, 4, settings.data_block_bits );
-		stack0->addRepair( bch1 ); //Repair from Fault Domain
-	} else if( settings.repairmode == 5 ) {
-		BCHRepair_cube *bch2 = new BCHRepair_cube( string("6EC7ED"), 6, 7, settings.data_block_bits );
-		stack0->addRepair( bch2 );
-	}
-	else if( settings.repairmode == 6 ) {
-		assert(0);
-	}
+	return SUCCESS;
 
-	return stack0;
 }
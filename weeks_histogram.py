@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+FaultSim 고장 시각(WEEKS) 히스토그램 로더
+--outformat bin (또는 [Sim] output_format = 1) 으로 저장한 바이너리 히스토그램을
+numpy.memmap 으로 복사 없이 읽고, 누적/확률 열은 벡터 연산으로 한 번에 계산합니다.
+
+예: python3 weeks_histogram.py results/dimm_secded_8gb_results.bin --csv out.csv
+"""
+
+import sys
+import argparse
+import numpy as np
+
+# Simulation::writeHistogramBinary 의 파일 형식 (faultsim.hh 의 OF_BINARY_MAGIC / OF_BINARY_VERSION)
+HIST_MAGIC = b'FSWEEKS\0'
+HIST_VERSION = 1
+HEADER_DTYPE = np.dtype([('magic', 'S8'), ('version', '<u8'), ('n_bins', '<u8'), ('n_sims', '<u8'),
+                         ('bucket_s', '<u8'), ('max_s', '<u8'), ('n_columns', '<u8')])
+COUNT_COLUMNS = ('FAULT', 'UNCORRECTABLE', 'UNDETECTABLE')
+
+# 텍스트 출력(Simulation::writeHistogramCSV)과 같은 열 이름/순서
+CSV_COLUMNS = ['WEEKS', 'FAULT', 'FAULT-CUMU', 'P(FAULT)', 'P(FAULT-CUMU)',
+               'UNCORRECTABLE', 'UNCORRECTABLE-CUMU', 'P(UNCORRECTABLE)', 'P(UNCORRECTABLE-CUMU)',
+               'UNDETERCTABLE', 'UNDETECTABLE-CUMU', 'P(UNDETECTABLE)', 'P(UNDETECTABLE-CUMU)']
+
+WEEK_S = 7 * 24 * 3600
+# 텍스트 출력의 WEEKS 열은 구간 길이와 상관없이 jj*12 (Simulation::writeHistogramCSV)
+WEEKS_LABEL_STEP = 12
+
+def is_binary_histogram(hist_path):
+    """
+    파일 앞 8바이트로 바이너리 히스토그램인지 확인
+    """
+    with open(hist_path, 'rb') as f:
+        return f.read(len(HIST_MAGIC)) == HIST_MAGIC
+
+def read_histogram(hist_path):
+    """
+    바이너리 히스토그램 읽기
+    반환값: (헤더 딕셔너리, (3, n_bins) uint64 memmap — FAULT/UNCORRECTABLE/UNDETECTABLE 구간별 개수)
+    """
+    raw = np.fromfile(hist_path, dtype=HEADER_DTYPE, count=1)
+    if len(raw) != 1 or raw['magic'][0] != HIST_MAGIC.rstrip(b'\0'):
+        raise ValueError(f"not a FaultSim binary histogram: {hist_path}")
+
+    header = {name: int(raw[name][0]) for name in HEADER_DTYPE.names if name != 'magic'}
+    if header['version'] != HIST_VERSION:
+        raise ValueError(f"unsupported histogram version {header['version']} in {hist_path}")
+
+    counts = np.memmap(hist_path, dtype='<u8', mode='r', offset=HEADER_DTYPE.itemsize,
+                       shape=(header['n_columns'], header['n_bins']))
+    return header, counts
+
+def write_histogram(hist_path, counts, n_sims, bucket_s, max_s):
+    """
+    구간별 개수 배열을 Simulation::writeHistogramBinary 와 같은 형식으로 저장 (샤드 병합용)
+    """
+    counts = np.asarray(counts, dtype='<u8')
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header['magic'] = HIST_MAGIC
+    header['version'] = HIST_VERSION
+    header['n_bins'] = counts.shape[1]
+    header['n_sims'] = n_sims
+    header['bucket_s'] = bucket_s
+    header['max_s'] = max_s
+    header['n_columns'] = counts.shape[0]
+
+    with open(hist_path, 'wb') as f:
+        header.tofile(f)
+        counts.tofile(f)
+
+def histogram_columns(header, counts):
+    """
+    구간별 개수에서 텍스트 출력과 같은 13개 열을 계산
+    누적 확률은 C++ 와 같은 순서로 구간 확률을 차례로 더한 값 (np.cumsum)
+    WEEKS 열도 텍스트 출력과 같은 구간 번호 * 12 (실제 구간 길이는 header['bucket_s'])
+    반환값: 열 이름 -> numpy 배열 딕셔너리 (pandas.DataFrame 에 그대로 넘길 수 있음)
+    """
+    n_sims = header['n_sims']
+    weeks = np.arange(header['n_bins'], dtype=np.uint64) * WEEKS_LABEL_STEP
+    cumulative = np.cumsum(counts, axis=1, dtype=np.uint64)
+    probability = counts / float(n_sims) if n_sims else np.zeros(counts.shape)
+    probability_cumulative = np.cumsum(probability, axis=1)
+
+    columns = {'WEEKS': weeks}
+    for idx, name in enumerate(CSV_COLUMNS[1::4]):
+        columns[name] = counts[idx]
+        columns[CSV_COLUMNS[2 + 4 * idx]] = cumulative[idx]
+        columns[CSV_COLUMNS[3 + 4 * idx]] = probability[idx]
+        columns[CSV_COLUMNS[4 + 4 * idx]] = probability_cumulative[idx]
+    return columns
+
+def load_histogram(hist_path):
+    """
+    바이너리 히스토그램을 텍스트 출력과 같은 열을 가진 DataFrame 으로 읽기
+    """
+    import pandas as pd
+    header, counts = read_histogram(hist_path)
+    return pd.DataFrame(histogram_columns(header, counts), columns=CSV_COLUMNS)
+
+def write_histogram_csv(hist_path, csv_path):
+    """
+    바이너리 히스토그램을 기존 텍스트 형식(CSV)으로 변환
+    """
+    header, counts = read_histogram(hist_path)
+    write_columns_csv(csv_path, header, histogram_columns(header, counts))
+
+def write_columns_csv(csv_path, header, columns):
+    """
+    histogram_columns 결과를 Simulation::writeHistogramCSV 와 같은 형식으로 저장
+    """
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write(",".join(CSV_COLUMNS) + "\n")
+        for idx in range(header['n_bins']):
+            f.write(",".join(f"{columns[name][idx]:.6f}" if name.startswith('P(') else str(columns[name][idx])
+                             for name in CSV_COLUMNS) + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or convert a FaultSim binary failure-time histogram")
+    parser.add_argument('histogram', help="binary histogram written with --outformat bin")
+    parser.add_argument('--csv', default=None, help="also write the histogram in the text CSV format")
+    args = parser.parse_args()
+
+    header, counts = read_histogram(args.histogram)
+    totals = counts.sum(axis=1)
+    print(f"{args.histogram}: {header['n_bins']} buckets of {header['bucket_s']} s, n_sims {header['n_sims']}")
+    for name, total in zip(COUNT_COLUMNS, totals):
+        rate = total / header['n_sims'] if header['n_sims'] else 0
+        print(f"  {name:<14} {int(total):>10} ({rate:.6e})")
+
+    if args.csv:
+        write_histogram_csv(args.histogram, args.csv)
+        print(f"CSV 파일로 저장했습니다: {args.csv}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())